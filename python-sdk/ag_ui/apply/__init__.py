@@ -0,0 +1,8 @@
+"""
+This module contains the EventApplier and MessagesEmitter classes.
+"""
+
+from ag_ui.apply.apply import EventApplier, apply_events
+from ag_ui.apply.messages import MessagesEmitter
+
+__all__ = ["EventApplier", "apply_events", "MessagesEmitter"]
@@ -0,0 +1,182 @@
+"""
+This module contains the EventApplier class, which folds events into the
+messages and state of a thread.
+
+It follows `defaultApplyEvents` in `@ag-ui/client`, but updates the messages
+and state in place, so the cost of an event depends on the size of the event
+rather than the size of the conversation: text and argument deltas are
+buffered and joined when the messages are read, and state deltas are applied
+to the state document with `ag_ui.patch`.
+"""
+
+from copy import deepcopy
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, List, Optional
+
+from pydantic_core import from_json
+
+from ag_ui.core.events import BaseEvent, EventType
+from ag_ui.core.types import AssistantMessage, FunctionCall, Message, State, ToolCall, ToolMessage
+from ag_ui.patch import apply_patch
+
+
+class EventApplier:
+    """
+    Maintains the messages and state of a thread from its events.
+
+    ```python
+    applier = EventApplier(messages=input_data.messages, state=input_data.state)
+    async for event in run_agent(input_data):
+        applier.apply(event)
+    print(applier.messages, applier.state)
+    ```
+
+    The applier takes ownership of the messages list and state document it is
+    given and updates them in place. Snapshots in events are copied, so events
+    are never modified.
+    """
+    def __init__(self, messages: Optional[List[Message]] = None, state: State = None):
+        self._messages: List[Message] = messages if messages is not None else []
+        self.state: State = state
+        self.predict_state: Optional[List[Dict[str, str]]] = None
+        # deltas appended to the `attribute` of `target` but not joined yet
+        self._target: Any = None
+        self._attribute = ""
+        self._parts: List[str] = []
+        self._handlers: Dict[EventType, Callable[[BaseEvent], None]] = {
+            EventType.TEXT_MESSAGE_START: self._text_message_start,
+            EventType.TEXT_MESSAGE_CONTENT: self._text_message_content,
+            EventType.TOOL_CALL_START: self._tool_call_start,
+            EventType.TOOL_CALL_ARGS: self._tool_call_args,
+            EventType.TOOL_CALL_RESULT: self._tool_call_result,
+            EventType.STATE_SNAPSHOT: self._state_snapshot,
+            EventType.STATE_DELTA: self._state_delta,
+            EventType.MESSAGES_SNAPSHOT: self._messages_snapshot,
+            EventType.CUSTOM: self._custom,
+            EventType.STEP_FINISHED: self._step_finished,
+            EventType.TEXT_MESSAGE_CHUNK: self._chunk,
+            EventType.TOOL_CALL_CHUNK: self._chunk,
+        }
+
+    @property
+    def messages(self) -> List[Message]:
+        """
+        The messages of the thread.
+        """
+        self._flush()
+        return self._messages
+
+    def apply(self, event: BaseEvent) -> None:
+        """
+        Applies an event to the messages and state.
+
+        Raises `ValueError` for chunk events, which must be expanded first, and
+        `JsonPatchError` for state deltas that cannot be applied. A failed
+        state delta leaves the state unchanged.
+        """
+        handler = self._handlers.get(event.type)
+        if handler is not None:
+            handler(event)
+
+    def _flush(self) -> None:
+        if len(self._parts) > 1:
+            value = "".join(self._parts)
+            setattr(self._target, self._attribute, value)
+            self._parts = [value]
+
+    def _append(self, target: Any, attribute: str, delta: str) -> None:
+        if target is not self._target or attribute != self._attribute:
+            self._flush()
+            self._target = target
+            self._attribute = attribute
+            self._parts = [getattr(target, attribute) or ""]
+        self._parts.append(delta)
+
+    def _text_message_start(self, event: BaseEvent) -> None:
+        self._messages.append(AssistantMessage.trusted(id=event.message_id, content=""))
+
+    def _text_message_content(self, event: BaseEvent) -> None:
+        self._append(self._messages[-1], "content", event.delta)
+
+    def _tool_call_start(self, event: BaseEvent) -> None:
+        parent_message_id = event.parent_message_id
+        messages = self._messages
+        if parent_message_id and messages and messages[-1].id == parent_message_id:
+            message = messages[-1]
+        else:
+            message = AssistantMessage.trusted(id=parent_message_id or event.tool_call_id, tool_calls=[])
+            messages.append(message)
+        if message.tool_calls is None:
+            message.tool_calls = []
+        message.tool_calls.append(ToolCall.trusted(
+            id=event.tool_call_id,
+            function=FunctionCall.trusted(name=event.tool_call_name, arguments=""),
+        ))
+
+    def _tool_call_args(self, event: BaseEvent) -> None:
+        function = self._messages[-1].tool_calls[-1].function
+        self._append(function, "arguments", event.delta)
+        if self.predict_state:
+            self._predict_state(function)
+
+    def _predict_state(self, function: FunctionCall) -> None:
+        config = next((item for item in self.predict_state if item.get("tool") == function.name), None)
+        if config is None:
+            return
+        self._flush()
+        try:
+            arguments = from_json(function.arguments, allow_partial="trailing-strings")
+        except ValueError:
+            return
+        tool_argument = config.get("tool_argument")
+        if isinstance(arguments, dict) and tool_argument and tool_argument in arguments:
+            arguments = arguments[tool_argument]
+        if not isinstance(self.state, dict):
+            self.state = {}
+        self.state[config["state_key"]] = arguments
+
+    def _tool_call_result(self, event: BaseEvent) -> None:
+        self._messages.append(ToolMessage.trusted(
+            id=event.message_id,
+            content=event.content,
+            tool_call_id=event.tool_call_id,
+        ))
+
+    def _state_snapshot(self, event: BaseEvent) -> None:
+        self.state = deepcopy(event.snapshot)
+
+    def _state_delta(self, event: BaseEvent) -> None:
+        self.state = apply_patch(self.state, event.delta)
+
+    def _messages_snapshot(self, event: BaseEvent) -> None:
+        self._flush()
+        self._target = None
+        self._parts = []
+        self._messages = [message.model_copy(deep=True) for message in event.messages]
+
+    def _custom(self, event: BaseEvent) -> None:
+        if event.name == "PredictState":
+            self.predict_state = event.value
+
+    def _step_finished(self, event: BaseEvent) -> None:  # pylint: disable=unused-argument
+        self.predict_state = None
+
+    def _chunk(self, event: BaseEvent) -> None:
+        raise ValueError(f"{event.type.value} must be transformed before being applied, see ag_ui.chunks")
+
+
+async def apply_events(events: AsyncIterable[BaseEvent], applier: EventApplier) -> AsyncIterator[BaseEvent]:
+    """
+    Passes events through, applying each to `applier` before it is yielded.
+
+    ```python
+    applier = EventApplier(messages=input_data.messages, state=input_data.state)
+    async for event in apply_events(run_agent(input_data), applier):
+        yield encoder.encode(event)
+    cache[input_data.thread_id] = (applier.messages, applier.state)
+    ```
+    """
+    apply = applier.apply
+    async for event in events:
+        apply(event)
+        yield event
+
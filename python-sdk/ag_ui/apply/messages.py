@@ -0,0 +1,173 @@
+"""
+This module contains the MessagesEmitter class, which sends the messages of a
+run as the events that append them, instead of a `MESSAGES_SNAPSHOT` of the
+whole conversation.
+
+Integrations that keep the conversation in their own state tend to send a
+snapshot of it after every step, which makes the bytes sent per run grow with
+the square of the conversation's length. The emitter remembers the messages
+the client has. Messages appended since are sent as text message, tool call
+and tool call result events, skipping those the client already received while
+they were streamed. A snapshot is only sent for the first update, and when the
+messages cannot be reached by appending: an earlier message changed or was
+removed, or a user, system or developer message was added.
+"""
+
+from typing import Dict, List, Optional, Set
+
+from ag_ui.core.events import (
+    BaseEvent,
+    EventType,
+    MessagesSnapshotEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    ToolCallResultEvent,
+    ToolCallStartEvent,
+)
+from ag_ui.core.types import Message
+
+
+class MessagesEmitter:
+    """
+    Sends the messages of a run as appended messages rather than snapshots.
+
+    ```python
+    emitter = MessagesEmitter()
+    async for event in run_agent(input_data):
+        for item in emitter.emit(event):
+            yield encoder.encode(item)
+    ```
+
+    Use one emitter per run. If the client's messages are known, pass them as
+    `messages` so that the first update can append to them as well.
+    """
+    def __init__(self, messages: Optional[List[Message]] = None):
+        self._messages: Optional[List[Message]] = None if messages is None else list(messages)
+        # ids of the messages and tool calls the client received as events
+        self._streamed_ids: Set[str] = set()
+        # text streamed per message id, until a message of the same content is appended
+        self._streamed_text: Dict[str, List[str]] = {}
+        self._text_message_id: Optional[str] = None
+
+    @property
+    def messages(self) -> Optional[List[Message]]:
+        """
+        The messages of the last update, which the client has, or None if the
+        client has not been sent any.
+        """
+        return self._messages
+
+    def reset(self) -> None:
+        """
+        Forgets the client's messages, so the next update is sent as a
+        snapshot.
+        """
+        self._messages = None
+
+    def update(self, messages: List[Message]) -> List[BaseEvent]:
+        """
+        Returns the events that bring the client to `messages`: the events of
+        the appended messages, or a `MessagesSnapshotEvent`.
+        """
+        return self._update(messages, None)
+
+    def emit(self, event: BaseEvent) -> List[BaseEvent]:
+        """
+        Passes an event through, replacing a `MESSAGES_SNAPSHOT` with the
+        events chosen by `update`. Text message and tool call events are
+        recorded, so the messages they stream are not sent again.
+        """
+        if event.type == EventType.MESSAGES_SNAPSHOT:
+            return self._update(event.messages, event)
+        self._observe(event)
+        return [event]
+
+    def _observe(self, event: BaseEvent) -> None:
+        event_type = event.type
+        if event_type in (EventType.TEXT_MESSAGE_START, EventType.TEXT_MESSAGE_CHUNK):
+            # chunks without a message id continue the previous message
+            if event.message_id is not None:
+                self._text_message_id = event.message_id
+                self._streamed_ids.add(event.message_id)
+                self._streamed_text.setdefault(event.message_id, [])
+            if event_type == EventType.TEXT_MESSAGE_CHUNK and event.delta and self._text_message_id is not None:
+                self._streamed_text[self._text_message_id].append(event.delta)
+        elif event_type == EventType.TEXT_MESSAGE_CONTENT:
+            self._streamed_text.setdefault(event.message_id, []).append(event.delta)
+        elif event_type in (EventType.TOOL_CALL_START, EventType.TOOL_CALL_CHUNK):
+            if event.tool_call_id is not None:
+                self._streamed_ids.add(event.tool_call_id)
+        elif event_type == EventType.TOOL_CALL_RESULT:
+            self._streamed_ids.add(event.message_id)
+
+    def _update(self, messages: List[Message], snapshot: Optional[BaseEvent]) -> List[BaseEvent]:
+        previous = self._messages
+        self._messages = list(messages)
+        if previous is None or len(messages) < len(previous) or any(
+            message is not known and message != known for message, known in zip(messages, previous)
+        ):
+            return [self._snapshot(snapshot)]
+        events: List[BaseEvent] = []
+        for message in messages[len(previous):]:
+            message_events = self._append(message)
+            if message_events is None:
+                return [self._snapshot(snapshot)]
+            events.extend(message_events)
+        return events
+
+    def _snapshot(self, snapshot: Optional[BaseEvent]) -> BaseEvent:
+        # the snapshot replaces whatever the client streamed
+        self._streamed_text.clear()
+        if snapshot is not None:
+            return snapshot
+        return MessagesSnapshotEvent.trusted(messages=self._messages)
+
+    def _append(self, message: Message) -> Optional[List[BaseEvent]]:
+        """
+        Returns the events that append a message, or None if it cannot be
+        appended with events.
+        """
+        if message.role == "tool":
+            if message.id in self._streamed_ids:
+                return []
+            return [ToolCallResultEvent.trusted(
+                message_id=message.id,
+                tool_call_id=message.tool_call_id,
+                content=message.content,
+                role="tool",
+            )]
+        if message.role != "assistant":
+            return None
+        events: List[BaseEvent] = []
+        if message.content and not self._streamed(message):
+            events.append(TextMessageStartEvent.trusted(message_id=message.id))
+            events.append(TextMessageContentEvent.trusted(message_id=message.id, delta=message.content))
+            events.append(TextMessageEndEvent.trusted(message_id=message.id))
+        for tool_call in message.tool_calls or []:
+            if tool_call.id in self._streamed_ids:
+                continue
+            events.append(ToolCallStartEvent.trusted(
+                tool_call_id=tool_call.id,
+                tool_call_name=tool_call.function.name,
+                parent_message_id=message.id,
+            ))
+            if tool_call.function.arguments:
+                events.append(ToolCallArgsEvent.trusted(tool_call_id=tool_call.id, delta=tool_call.function.arguments))
+            events.append(ToolCallEndEvent.trusted(tool_call_id=tool_call.id))
+        return events
+
+    def _streamed(self, message: Message) -> bool:
+        """
+        Returns True if the text of a message was streamed to the client,
+        under its id or under the id of the stream it was assembled from.
+        """
+        if self._streamed_text.pop(message.id, None) is not None:
+            return True
+        for message_id, parts in self._streamed_text.items():
+            if "".join(parts) == message.content:
+                del self._streamed_text[message_id]
+                return True
+        return False
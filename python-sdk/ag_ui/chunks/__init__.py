@@ -0,0 +1,7 @@
+"""
+This module contains the chunk transformer.
+"""
+
+from ag_ui.chunks.transform import ChunkTransformer, transform_chunks
+
+__all__ = ["ChunkTransformer", "transform_chunks"]
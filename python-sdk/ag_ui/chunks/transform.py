@@ -0,0 +1,136 @@
+"""
+This module contains the ChunkTransformer class, which expands chunk events
+into start, content and end events.
+
+`TEXT_MESSAGE_CHUNK` and `TOOL_CALL_CHUNK` events let a producer stream a
+message or tool call without sending its start and end. The transformer
+expands them like `transformChunks` in `@ag-ui/client`, so that consumers
+without that client receive the canonical events. It streams: the only state
+is the message or tool call that is currently open.
+"""
+
+from typing import AsyncIterable, AsyncIterator, List, Optional
+
+from ag_ui.core.events import (
+    BaseEvent,
+    EventType,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+)
+
+
+class ChunkTransformer:
+    """
+    Expands the chunk events of a single run.
+
+    ```python
+    transformer = ChunkTransformer()
+    for event in events:
+        for expanded in transformer.transform(event):
+            send(expanded)
+    for expanded in transformer.close():
+        send(expanded)
+    ```
+
+    A text message or tool call opened by chunks stays open until a chunk with
+    another id, or any other event except `RAW`, arrives. The expanded events
+    are built with the trusted constructors, since their fields come from
+    events that were already validated.
+    """
+    def __init__(self):
+        self.message_id: Optional[str] = None
+        self.tool_call_id: Optional[str] = None
+
+    def transform(self, event: BaseEvent) -> List[BaseEvent]:
+        """
+        Returns the events to send in place of an event.
+        """
+        event_type = event.type
+        if event_type == EventType.TEXT_MESSAGE_CHUNK:
+            return self._text_message_chunk(event)
+        if event_type == EventType.TOOL_CALL_CHUNK:
+            return self._tool_call_chunk(event)
+        if event_type == EventType.RAW or (self.message_id is None and self.tool_call_id is None):
+            return [event]
+        return [self._close_pending(), event]
+
+    def close(self) -> List[BaseEvent]:
+        """
+        Ends the open text message or tool call, if any, at the end of the stream.
+        """
+        if self.message_id is None and self.tool_call_id is None:
+            return []
+        return [self._close_pending()]
+
+    def _close_pending(self) -> BaseEvent:
+        if self.message_id is not None:
+            event = TextMessageEndEvent.trusted(message_id=self.message_id)
+            self.message_id = None
+            return event
+        event = ToolCallEndEvent.trusted(tool_call_id=self.tool_call_id)
+        self.tool_call_id = None
+        return event
+
+    def _text_message_chunk(self, event: BaseEvent) -> List[BaseEvent]:
+        message_id = self.message_id
+        delta = event.delta
+        if message_id is not None and (event.message_id is None or event.message_id == message_id):
+            # a continuation of the open message, the common case
+            if not delta:
+                return []
+            return [TextMessageContentEvent.trusted(message_id=message_id, delta=delta)]
+
+        if event.message_id is None:
+            raise ValueError("First TEXT_MESSAGE_CHUNK must have a messageId")
+        result = self.close()
+        message_id = self.message_id = event.message_id
+        result.append(TextMessageStartEvent.trusted(message_id=message_id, role="assistant"))
+        # empty deltas are dropped, since content events must not be empty
+        if delta:
+            result.append(TextMessageContentEvent.trusted(message_id=message_id, delta=delta))
+        return result
+
+    def _tool_call_chunk(self, event: BaseEvent) -> List[BaseEvent]:
+        tool_call_id = self.tool_call_id
+        delta = event.delta
+        if tool_call_id is not None and (event.tool_call_id is None or event.tool_call_id == tool_call_id):
+            if delta is None:
+                return []
+            return [ToolCallArgsEvent.trusted(tool_call_id=tool_call_id, delta=delta)]
+
+        if event.tool_call_id is None:
+            raise ValueError("First TOOL_CALL_CHUNK must have a toolCallId")
+        if event.tool_call_name is None:
+            raise ValueError("First TOOL_CALL_CHUNK must have a toolCallName")
+        result = self.close()
+        tool_call_id = self.tool_call_id = event.tool_call_id
+        result.append(ToolCallStartEvent.trusted(
+            tool_call_id=tool_call_id,
+            tool_call_name=event.tool_call_name,
+            parent_message_id=event.parent_message_id,
+        ))
+        if delta is not None:
+            result.append(ToolCallArgsEvent.trusted(tool_call_id=tool_call_id, delta=delta))
+        return result
+
+
+async def transform_chunks(events: AsyncIterable[BaseEvent]) -> AsyncIterator[BaseEvent]:
+    """
+    Expands the chunk events of an async iterable of events.
+
+    ```python
+    async for event in transform_chunks(run_crew(input_data)):
+        yield encoder.encode(event)
+    ```
+    """
+    transformer = ChunkTransformer()
+    transform = transformer.transform
+    async for event in events:
+        for expanded in transform(event):
+            yield expanded
+    for expanded in transformer.close():
+        yield expanded
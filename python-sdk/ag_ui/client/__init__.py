@@ -0,0 +1,8 @@
+"""
+This module contains clients for running remote AG-UI agents.
+"""
+
+from ag_ui.client.pool import ConnectionPool
+from ag_ui.client.http_agent import HttpAgent
+
+__all__ = ["ConnectionPool", "HttpAgent"]
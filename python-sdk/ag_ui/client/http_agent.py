@@ -0,0 +1,95 @@
+"""
+This module contains the HttpAgent class, which runs a remote AG-UI agent over
+HTTP.
+"""
+
+import json
+from typing import AsyncIterator, Dict, Optional
+
+from ag_ui.core.events import BaseEvent
+from ag_ui.core.types import RunAgentInput
+from ag_ui.decoder import EventDecoder
+from ag_ui.client.pool import ConnectionPool
+
+
+class HttpAgent:
+    """
+    Runs an agent served over HTTP, such as an endpoint that streams its events
+    with the EventEncoder.
+
+    ```python
+    async with ConnectionPool(max_connections_per_host=10) as pool:
+        agent = HttpAgent("http://localhost:8000/agent", pool=pool)
+        async for event in agent.run(input_data):
+            print(event.type)
+    ```
+
+    Agents that share a pool share its keep-alive connections and per-host
+    limits. An agent created without a pool owns one and closes it in `aclose`.
+    """
+    def __init__(
+            self,
+            url: str,
+            headers: Optional[Dict[str, str]] = None,
+            pool: Optional[ConnectionPool] = None,
+        ):
+        self.url = url
+        self.headers = dict(headers or {})
+        self._owns_pool = pool is None
+        self.pool = pool if pool is not None else ConnectionPool()
+
+    def request_headers(self, input_data: RunAgentInput) -> Dict[str, str]:  # pylint: disable=unused-argument
+        """
+        Returns the headers of the request for a run.
+        Override this to customize the request.
+        """
+        return {
+            **self.headers,
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream",
+        }
+
+    def request_body(self, input_data: RunAgentInput) -> bytes:
+        """
+        Returns the JSON body of the request for a run.
+        """
+        data = input_data.model_dump(mode="json", by_alias=True, exclude_none=True)
+        # state and forwardedProps are required, even when they are null
+        data.setdefault("state", None)
+        data.setdefault("forwardedProps", None)
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    async def run(self, input_data: RunAgentInput) -> AsyncIterator[BaseEvent]:
+        """
+        Runs the agent and yields its events as they arrive.
+
+        Raises `httpx.HTTPStatusError` if the agent responds with an error
+        status. Closing the iterator early closes the connection, which aborts
+        the run on the server.
+        """
+        async with self.pool.stream(
+            "POST",
+            self.url,
+            content=self.request_body(input_data),
+            headers=self.request_headers(input_data),
+        ) as response:
+            if response.is_error:
+                await response.aread()
+                response.raise_for_status()
+
+            decoder = EventDecoder(response.headers.get("content-type"))
+            async for event in decoder.decode_stream(response.aiter_bytes()):
+                yield event
+
+    async def aclose(self) -> None:
+        """
+        Closes the connection pool if the agent created it.
+        """
+        if self._owns_pool:
+            await self.pool.aclose()
+
+    async def __aenter__(self) -> "HttpAgent":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
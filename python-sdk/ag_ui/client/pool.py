@@ -0,0 +1,83 @@
+"""
+This module contains the ConnectionPool class, which shares keep-alive HTTP
+connections between agents.
+
+The pool is built on `httpx`, which is installed with the `client` extra:
+
+    pip install "ag-ui-protocol[client]"
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class ConnectionPool:
+    """
+    A pool of keep-alive HTTP connections that limits the number of concurrent
+    requests to each host.
+
+    Agents that share a pool reuse its connections, so consecutive runs against
+    the same host skip the TCP and TLS handshakes.
+    """
+    def __init__(
+            self,
+            max_connections_per_host: int = 10,
+            max_keepalive_connections: int = 20,
+            keepalive_expiry: float = 30.0,
+            connect_timeout: float = 10.0,
+            transport: Any = None,
+        ):
+        if httpx is None:
+            raise ImportError("ConnectionPool requires httpx. Install it with `pip install 'ag-ui-protocol[client]'`.")
+        if max_connections_per_host < 1:
+            raise ValueError("max_connections_per_host must be at least 1")
+        self.max_connections_per_host = max_connections_per_host
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=None,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            # runs stream for as long as the agent works, so only connecting is bounded
+            timeout=httpx.Timeout(None, connect=connect_timeout),
+            transport=transport,
+        )
+        self._semaphores: Dict[Tuple[str, str, Optional[int]], asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs) -> AsyncIterator["httpx.Response"]:
+        """
+        Sends a request and yields the streaming response. Waits while the host
+        already has `max_connections_per_host` requests in flight.
+        """
+        request_url = httpx.URL(url)
+        # http://host/ and http://host:80/ are the same host
+        port = request_url.port or _DEFAULT_PORTS.get(request_url.scheme)
+        key = (request_url.scheme, request_url.host, port)
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            semaphore = self._semaphores[key] = asyncio.Semaphore(self.max_connections_per_host)
+
+        async with semaphore:
+            async with self.client.stream(method, request_url, **kwargs) as response:
+                yield response
+
+    async def aclose(self) -> None:
+        """
+        Closes all connections in the pool.
+        """
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "ConnectionPool":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
@@ -49,6 +49,10 @@ from ag_ui.core.types import (
     State
 )
 
+from ag_ui.core.lazy import LazyRunAgentInput
+from ag_ui.core.store import MessageStore
+from ag_ui.core.trusted import set_trusted_validation
+
 __all__ = [
     # Events
     "EventType",
@@ -92,5 +96,8 @@ __all__ = [
     "Context",
     "Tool",
     "RunAgentInput",
-    "State"
+    "LazyRunAgentInput",
+    "MessageStore",
+    "State",
+    "set_trusted_validation"
 ]
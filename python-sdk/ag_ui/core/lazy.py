@@ -0,0 +1,143 @@
+"""
+This module contains the LazyRunAgentInput class, which validates the parts of
+a `RunAgentInput` when they are first used.
+
+Validating a `RunAgentInput` validates every message of the thread, every tool
+schema and the state before the agent can start, which delays the first event
+of long threads. `LazyRunAgentInput` only validates the envelope up front: the
+ids, and that the request has the fields of a `RunAgentInput` and no others.
+`messages`, `tools`, `context`, `state` and `forwarded_props` are validated on
+first access, or in a background thread with `validate_async` while the agent
+starts its LLM call.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Union
+
+from pydantic import ConfigDict, TypeAdapter
+from pydantic_core import from_json
+
+from ag_ui.core.types import ConfiguredBaseModel, Context, Message, RunAgentInput, Tool
+
+# the fields validated on first access, with their adapters
+_ADAPTERS: Dict[str, TypeAdapter] = {
+    name: TypeAdapter(field.annotation)
+    for name, field in RunAgentInput.model_fields.items()
+    if name not in ("thread_id", "run_id")
+}
+
+
+class _Envelope(ConfiguredBaseModel):
+    """
+    The fields of a `RunAgentInput`, with the lazily validated ones unchecked.
+    """
+    model_config = ConfigDict(title="RunAgentInput")
+
+    thread_id: str
+    run_id: str
+    state: Any
+    messages: List[Any]
+    tools: List[Any]
+    context: List[Any]
+    forwarded_props: Any
+
+
+class LazyRunAgentInput:
+    """
+    Input for running an agent, validated field by field on first access.
+
+    ```python
+    input_data = LazyRunAgentInput.from_json(await request.body())
+    validation = asyncio.create_task(input_data.validate_async())
+
+    # the first event does not wait for the messages to be validated
+    yield encoder.encode(RunStartedEvent(
+        type=EventType.RUN_STARTED,
+        thread_id=input_data.thread_id,
+        run_id=input_data.run_id,
+    ))
+    input_data = await validation
+    ```
+
+    Accessing a field that is invalid raises the `ValidationError` that
+    validating the `RunAgentInput` would have raised for it, with locations
+    relative to the field.
+    """
+    __slots__ = ("thread_id", "run_id", "_raw", "_values")
+
+    def __init__(self, envelope: _Envelope):
+        self.thread_id: str = envelope.thread_id
+        self.run_id: str = envelope.run_id
+        self._raw: Dict[str, Any] = {name: getattr(envelope, name) for name in _ADAPTERS}
+        self._values: Dict[str, Any] = {}
+
+    @classmethod
+    def from_json(cls, data: Union[str, bytes]) -> "LazyRunAgentInput":
+        """
+        Creates the input from a JSON request body, validating the envelope.
+        """
+        # parsing first is faster than validating the envelope from JSON,
+        # which builds the unchecked fields through their Any validators
+        try:
+            parsed = from_json(data)
+        except ValueError:
+            # raises the ValidationError of the invalid JSON
+            return cls(_Envelope.model_validate_json(data))
+        return cls(_Envelope.model_validate(parsed))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LazyRunAgentInput":
+        """
+        Creates the input from a parsed request body, validating the envelope.
+        """
+        return cls(_Envelope.model_validate(data))
+
+    def _get(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            value = self._values[name] = _ADAPTERS[name].validate_python(self._raw[name])
+            return value
+
+    @property
+    def state(self) -> Any:
+        """The state of the thread."""
+        return self._get("state")
+
+    @property
+    def messages(self) -> List[Message]:
+        """The messages of the thread, validated on first access."""
+        return self._get("messages")
+
+    @property
+    def tools(self) -> List[Tool]:
+        """The tools available to the agent, validated on first access."""
+        return self._get("tools")
+
+    @property
+    def context(self) -> List[Context]:
+        """The context of the run, validated on first access."""
+        return self._get("context")
+
+    @property
+    def forwarded_props(self) -> Any:
+        """The forwarded properties of the run."""
+        return self._get("forwarded_props")
+
+    def validate(self) -> RunAgentInput:
+        """
+        Validates the fields that were not accessed yet and returns the
+        validated `RunAgentInput`.
+        """
+        return RunAgentInput.trusted(
+            thread_id=self.thread_id,
+            run_id=self.run_id,
+            **{name: self._get(name) for name in _ADAPTERS},
+        )
+
+    async def validate_async(self) -> RunAgentInput:
+        """
+        Runs `validate` in a thread, so that validation overlaps with the
+        agent's I/O.
+        """
+        return await asyncio.to_thread(self.validate)
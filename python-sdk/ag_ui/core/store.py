@@ -0,0 +1,169 @@
+"""
+This module contains the MessageStore class, a compact in-memory representation
+of the message history of a thread.
+
+Each pydantic message carries an instance `__dict__` and a fields-set `set`,
+which cost several times more memory than the strings of a short message.
+Servers that keep many threads in memory can store their histories in a
+`MessageStore` instead, which keeps the messages in columns: a list of ids, an
+array of role codes and a list of contents. Names, tool call ids and tool
+calls, which few messages have, are kept in a sparse table, with tool calls
+as tuples. Names of messages and tools are interned, since they repeat across
+messages and threads.
+
+Messages are converted from and to the `Message` types when they are added
+and read, so the store is meant to be used at the boundaries: filled from
+`RunAgentInput.messages` or a `MESSAGES_SNAPSHOT`, and read when a run starts.
+"""
+
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union, overload
+
+from ag_ui.core.types import (
+    AssistantMessage,
+    DeveloperMessage,
+    FunctionCall,
+    Message,
+    SystemMessage,
+    ToolCall,
+    ToolMessage,
+    UserMessage,
+)
+
+_ROLES = ("developer", "system", "assistant", "user", "tool")
+_CODES = {role: code for code, role in enumerate(_ROLES)}
+_ASSISTANT = _CODES["assistant"]
+_TOOL = _CODES["tool"]
+_CLASSES = (DeveloperMessage, SystemMessage, AssistantMessage, UserMessage, ToolMessage)
+
+# (id, function name, arguments) of a tool call
+_ToolCallTuple = Tuple[str, str, str]
+# (name, tool_call_id, tool_calls) of a message that has any of them
+_Extra = Tuple[Optional[str], Optional[str], Optional[Tuple[_ToolCallTuple, ...]]]
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return None if value is None else sys.intern(value)
+
+
+class MessageStore:
+    """
+    The messages of a thread, stored in columns.
+
+    ```python
+    threads[input_data.thread_id] = MessageStore(input_data.messages)
+    ...
+    messages = threads[thread_id].to_messages()
+    ```
+
+    The store behaves like a list of messages that can be appended to.
+    Reading a message creates a new `Message` instance each time, so changes
+    to it are not stored.
+    """
+    __slots__ = ("_ids", "_roles", "_contents", "_extras")
+
+    def __init__(self, messages: Iterable[Message] = ()):
+        self._ids: List[str] = []
+        self._roles = array("B")
+        self._contents: List[Optional[str]] = []
+        self._extras: Dict[int, _Extra] = {}
+        self.extend(messages)
+
+    def append(self, message: Message) -> None:
+        """
+        Appends a message.
+        """
+        code = _CODES[message.role]
+        name = getattr(message, "name", None)
+        tool_call_id = message.tool_call_id if code == _TOOL else None
+        tool_calls = None
+        if code == _ASSISTANT and message.tool_calls is not None:
+            tool_calls = tuple(
+                (tool_call.id, sys.intern(tool_call.function.name), tool_call.function.arguments)
+                for tool_call in message.tool_calls
+            )
+        if name is not None or tool_call_id is not None or tool_calls is not None:
+            self._extras[len(self._ids)] = (_intern(name), tool_call_id, tool_calls)
+        self._ids.append(message.id)
+        self._roles.append(code)
+        self._contents.append(message.content)
+
+    def extend(self, messages: Iterable[Message]) -> None:
+        """
+        Appends messages.
+        """
+        for message in messages:
+            self.append(message)
+
+    def clear(self) -> None:
+        """
+        Removes all messages.
+        """
+        self._ids.clear()
+        del self._roles[:]
+        self._contents.clear()
+        self._extras.clear()
+
+    def role(self, index: int) -> str:
+        """
+        Returns the role of a message without creating it.
+        """
+        return _ROLES[self._roles[index]]
+
+    def message_id(self, index: int) -> str:
+        """
+        Returns the id of a message without creating it.
+        """
+        return self._ids[index]
+
+    def to_messages(self) -> List[Message]:
+        """
+        Returns the messages as `Message` instances.
+        """
+        return [self._message(index) for index in range(len(self._ids))]
+
+    def _message(self, index: int) -> Message:
+        code = self._roles[index]
+        fields = {"id": self._ids[index]}
+        content = self._contents[index]
+        if content is not None:
+            fields["content"] = content
+        extra = self._extras.get(index)
+        if extra is not None:
+            name, tool_call_id, tool_calls = extra
+            if name is not None:
+                fields["name"] = name
+            if tool_call_id is not None:
+                fields["tool_call_id"] = tool_call_id
+            if tool_calls is not None:
+                fields["tool_calls"] = [
+                    ToolCall.trusted(id=call_id, function=FunctionCall.trusted(name=function_name, arguments=arguments))
+                    for call_id, function_name, arguments in tool_calls
+                ]
+        return _CLASSES[code].trusted(**fields)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[Message]:
+        for index in range(len(self._ids)):
+            yield self._message(index)
+
+    @overload
+    def __getitem__(self, index: int) -> Message: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Message]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Message, List[Message]]:
+        if isinstance(index, slice):
+            return [self._message(i) for i in range(*index.indices(len(self._ids)))]
+        if index < 0:
+            index += len(self._ids)
+        if not 0 <= index < len(self._ids):
+            raise IndexError("MessageStore index out of range")
+        return self._message(index)
+
+    def __repr__(self) -> str:
+        return f"MessageStore({len(self._ids)} messages)"
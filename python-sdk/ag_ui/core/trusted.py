@@ -0,0 +1,149 @@
+"""
+This module contains the trusted construction path for models.
+
+Calling a model class validates every field. Producers that build events from
+values they already control, such as a token stream from an LLM client, can use
+`Model.trusted(...)` instead, which assigns the fields directly. A constructor
+is generated once per class from its pydantic fields. Single-valued `Literal`
+fields, such as the `type` of an event, are filled in when omitted.
+
+Set the environment variable `AG_UI_VALIDATE_TRUSTED=1`, or call
+`set_trusted_validation(True)`, to validate trusted constructions while
+debugging.
+"""
+
+import os
+from copy import deepcopy
+from functools import partial
+from weakref import WeakSet
+from typing import Any, Callable, Dict, Literal, Optional, get_args, get_origin
+
+from pydantic import BaseModel
+
+Constructor = Callable[..., BaseModel]
+
+_VALIDATE = os.environ.get("AG_UI_VALIDATE_TRUSTED", "").lower() in ("1", "true", "yes")
+
+# classes with a trusted constructor installed, to reinstall it when validation is toggled
+_CLASSES: "WeakSet[type]" = WeakSet()
+_CONSTANTS: Dict[type, Dict[str, Any]] = {}
+
+_MISSING = object()
+
+
+def set_trusted_validation(enabled: bool) -> None:
+    """
+    Turns validation of trusted constructions on or off.
+    """
+    global _VALIDATE  # pylint: disable=global-statement
+    _VALIDATE = enabled
+    for cls in list(_CLASSES):
+        install_trusted_constructor(cls)
+
+
+def install_trusted_constructor(cls) -> None:
+    """
+    Installs `cls.trusted`. The constructor is generated on first use and then
+    replaces the installed function, so later calls go to it directly.
+    """
+    def construct_first(**data: Any) -> BaseModel:
+        constructor = None if _VALIDATE else _build_constructor(cls)
+        if constructor is None:
+            constructor = partial(_construct_validated, cls)
+        type.__setattr__(cls, "trusted", staticmethod(constructor))
+        return constructor(**data)
+
+    _CLASSES.add(cls)
+    type.__setattr__(cls, "trusted", staticmethod(construct_first))
+
+
+def _construct_validated(cls, **data: Any) -> BaseModel:
+    """
+    Creates an instance through validation, filling in single-valued Literal fields.
+    """
+    return cls(**{**_literal_constants(cls), **data})
+
+
+def _literal_constants(cls) -> Dict[str, Any]:
+    """
+    Returns the values of the required single-valued Literal fields of a class.
+    """
+    constants = _CONSTANTS.get(cls)
+    if constants is None:
+        constants = _CONSTANTS[cls] = {}
+        for name, field in cls.model_fields.items():
+            if field.is_required() and get_origin(field.annotation) is Literal:
+                values = get_args(field.annotation)
+                if len(values) == 1:
+                    constants[name] = values[0]
+    return constants
+
+
+def _build_constructor(cls) -> Optional[Constructor]:
+    """
+    Builds the trusted constructor of a class, or returns None if instances
+    must be created through validation.
+    """
+    if (
+        cls.model_config.get("extra") == "allow"
+        or cls.__private_attributes__
+        or cls.__init__ is not BaseModel.__init__
+    ):
+        return None
+
+    constants = _literal_constants(cls)
+    # the fields are parameters of the constructor, so every other name in it
+    # has a prefix that pydantic does not allow for field names
+    namespace: Dict[str, Any] = {
+        "__agui_cls": cls,
+        "__agui_new": object.__new__,
+        "__agui_set_attribute": object.__setattr__,
+        "__agui_missing": _MISSING,
+    }
+    parameters = []
+    lines = []
+    fields_set = []
+    values = []
+    for name, field in cls.model_fields.items():
+        values.append(f"{name!r}: {name}")
+        if name in constants:
+            namespace[f"__agui_constant_{name}"] = constants[name]
+            parameters.append(f"{name}=__agui_constant_{name}")
+            fields_set.append(repr(name))
+        elif field.is_required():
+            parameters.append(name)
+            fields_set.append(repr(name))
+        else:
+            parameters.append(f"{name}=__agui_missing")
+            if field.default_factory is not None:
+                namespace[f"__agui_factory_{name}"] = field.default_factory
+                default = f"__agui_factory_{name}()"
+            elif isinstance(field.default, (list, dict, set)):
+                # like pydantic, give every instance its own copy of a mutable default
+                namespace[f"__agui_default_{name}"] = field.default
+                namespace["__agui_deepcopy"] = deepcopy
+                default = f"__agui_deepcopy(__agui_default_{name})"
+            else:
+                namespace[f"__agui_default_{name}"] = field.default
+                default = f"__agui_default_{name}"
+            lines += [
+                f"    if {name} is __agui_missing:",
+                f"        {name} = {default}",
+                "    else:",
+                f"        __agui_fields_set.add({name!r})",
+            ]
+
+    # keyword-only parameters reject unknown and missing fields like a regular call
+    source = "\n".join([
+        f"def construct(*, {', '.join(parameters)}):",
+        f"    __agui_fields_set = {{{', '.join(fields_set)}}}" if fields_set else "    __agui_fields_set = set()",
+        *lines,
+        "    __agui_instance = __agui_new(__agui_cls)",
+        f"    __agui_set_attribute(__agui_instance, '__dict__', {{{', '.join(values)}}})",
+        "    __agui_set_attribute(__agui_instance, '__pydantic_fields_set__', __agui_fields_set)",
+        "    __agui_set_attribute(__agui_instance, '__pydantic_extra__', None)",
+        "    __agui_set_attribute(__agui_instance, '__pydantic_private__', None)",
+        "    return __agui_instance",
+    ])
+    exec(source, namespace)  # pylint: disable=exec-used
+    return namespace["construct"]
@@ -6,6 +6,8 @@ from typing import Any, List, Literal, Optional, Union, Annotated
 from pydantic import BaseModel, Field, ConfigDict
 from pydantic.alias_generators import to_camel
 
+from .trusted import install_trusted_constructor
+
 class ConfiguredBaseModel(BaseModel):
     """
     A configurable base model.
@@ -16,6 +18,24 @@ class ConfiguredBaseModel(BaseModel):
         populate_by_name=True,
     )
 
+    @staticmethod
+    def trusted(**data: Any) -> "ConfiguredBaseModel":
+        """
+        Creates an instance from field values without validating them.
+
+        Meant for producers that build models from values they control, e.g.
+        `TextMessageContentEvent.trusted(message_id=message_id, delta=token)`.
+        The event `type` may be omitted. Field names are not aliased and
+        `model_post_init` checks are skipped. Each subclass gets its own
+        constructor, see `ag_ui.core.trusted`.
+        """
+        raise TypeError("ConfiguredBaseModel cannot be constructed directly")
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        install_trusted_constructor(cls)
+
 
 class FunctionCall(ConfiguredBaseModel):
     """
@@ -0,0 +1,8 @@
+"""
+This module contains the EventDecoder class and the event parsing functions.
+"""
+
+from ag_ui.decoder.decoder import EventDecoder, decode_stream
+from ag_ui.decoder.parse import EVENT_ADAPTER, parse_event, parse_many
+
+__all__ = ["EventDecoder", "decode_stream", "EVENT_ADAPTER", "parse_event", "parse_many"]
@@ -0,0 +1,156 @@
+"""
+This module contains the EventDecoder class, which parses AG-UI streams.
+
+The decoder is fed raw byte chunks as they arrive from the transport and
+returns the events that are complete. Frames are located by scanning the chunk
+in place, without decoding it to text or splitting it into lines, and protobuf
+frames are decoded through a memoryview. Only the incomplete tail of a chunk is
+kept in a buffer until the rest of the frame arrives.
+"""
+
+import struct
+from typing import AsyncIterable, AsyncIterator, List
+
+from ag_ui.core.events import BaseEvent
+from ag_ui.decoder.parse import parse_event
+from ag_ui.proto import AGUI_MEDIA_TYPE, decode as decode_proto
+
+_FRAME_HEADER = struct.Struct(">I")
+
+
+class EventDecoder:
+    """
+    Decodes Agent User Interaction events from a byte stream.
+    """
+    def __init__(self, content_type: str = None):
+        media_type = content_type.split(";", 1)[0].strip().lower() if content_type else ""
+        self.is_protobuf = media_type == AGUI_MEDIA_TYPE
+        self._buffer = bytearray()
+        # where to resume searching for the end of an SSE event in the buffer
+        self._scan = 0
+
+    def feed(self, chunk: bytes) -> List[BaseEvent]:
+        """
+        Feeds a chunk of the stream to the decoder and returns the events
+        completed by it. Frames may be split across chunks at any byte.
+        """
+        if not chunk:
+            return []
+        if self._buffer:
+            self._buffer += chunk
+            data = self._buffer
+        else:
+            data = chunk
+
+        if self.is_protobuf:
+            decoded, consumed = self._decode_protobuf(data)
+        else:
+            decoded, consumed = self._decode_sse(data)
+
+        if data is self._buffer:
+            del self._buffer[:consumed]
+        elif consumed < len(data):
+            self._buffer += memoryview(data)[consumed:]
+        self._scan = max(len(self._buffer) - 1, 0)
+        return decoded
+
+    def close(self) -> List[BaseEvent]:
+        """
+        Signals the end of the stream and returns any remaining events.
+
+        A trailing SSE event without the final blank line is parsed like the
+        browser EventSource does. A truncated protobuf frame raises ValueError.
+        """
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        self._scan = 0
+        if not data:
+            return []
+        if self.is_protobuf:
+            raise ValueError("Stream ended in the middle of a protobuf frame")
+        decoded: List[BaseEvent] = []
+        self._decode_sse_event(data, 0, len(data), decoded)
+        return decoded
+
+    async def decode_stream(self, chunks: AsyncIterable[bytes]) -> AsyncIterator[BaseEvent]:
+        """
+        Decodes an async iterable of byte chunks, such as `response.aiter_bytes()`.
+        """
+        async for chunk in chunks:
+            for event in self.feed(chunk):
+                yield event
+        for event in self.close():
+            yield event
+
+    def _decode_protobuf(self, data: bytes):
+        """
+        Decodes all complete length-prefixed frames and returns them along with
+        the number of bytes consumed.
+        """
+        decoded = []
+        pos = 0
+        end = len(data)
+        with memoryview(data) as view:
+            while end - pos >= 4:
+                (length,) = _FRAME_HEADER.unpack_from(data, pos)
+                frame_end = pos + 4 + length
+                if frame_end > end:
+                    break
+                decoded.append(decode_proto(view[pos + 4:frame_end]))
+                pos = frame_end
+        return decoded, pos
+
+    def _decode_sse(self, data: bytes):
+        """
+        Decodes all complete SSE events and returns them along with the number
+        of bytes consumed.
+        """
+        decoded: List[BaseEvent] = []
+        pos = 0
+        scan = self._scan if data is self._buffer else 0
+        while True:
+            end = data.find(b"\n\n", scan)
+            if end < 0:
+                break
+            self._decode_sse_event(data, pos, end, decoded)
+            pos = scan = end + 2
+        return decoded, pos
+
+    def _decode_sse_event(self, data: bytes, start: int, end: int, decoded: List[BaseEvent]) -> None:
+        """
+        Parses the `data:` lines of the SSE event in `data[start:end]`. Other
+        fields and comments are ignored, and multiple data lines are joined
+        with newlines.
+        """
+        payload = None
+        while start < end:
+            line_end = data.find(b"\n", start, end)
+            if line_end < 0:
+                line_end = end
+            if data.startswith(b"data:", start, line_end):
+                value_start = start + 5
+                if data.startswith(b" ", value_start, line_end):
+                    value_start += 1
+                if payload is None:
+                    payload = data[value_start:line_end]
+                else:
+                    payload = b"\n".join((payload, data[value_start:line_end]))
+            start = line_end + 1
+
+        if payload is not None:
+            decoded.append(parse_event(payload))
+
+
+async def decode_stream(chunks: AsyncIterable[bytes], content_type: str = None) -> AsyncIterator[BaseEvent]:
+    """
+    Decodes a stream of byte chunks into events.
+
+    ```python
+    async with client.stream("POST", url, json=body) as response:
+        content_type = response.headers.get("content-type")
+        async for event in decode_stream(response.aiter_bytes(), content_type):
+            ...
+    ```
+    """
+    async for event in EventDecoder(content_type).decode_stream(chunks):
+        yield event
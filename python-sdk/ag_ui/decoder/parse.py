@@ -0,0 +1,59 @@
+"""
+This module contains the functions that parse JSON-encoded events.
+
+The `Event` union is compiled into a single `TypeAdapter` when the module is
+imported. It validates events straight from JSON bytes and picks the event
+class from the `type` field inside pydantic-core, without building a dict
+first. `parse_many` validates a batch of events, such as the lines of an event
+log, with a single call.
+"""
+
+from typing import Iterable, List, Union
+
+from pydantic import TypeAdapter, ValidationError
+
+from ag_ui.core.events import BaseEvent, Event
+
+JsonData = Union[str, bytes, bytearray]
+
+EVENT_ADAPTER: TypeAdapter = TypeAdapter(Event)
+_EVENTS_ADAPTER: TypeAdapter = TypeAdapter(List[Event])
+
+
+def parse_event(data: JsonData) -> BaseEvent:
+    """
+    Parses a JSON-encoded event, such as the data of an SSE event.
+
+    Raises `ValidationError`, a subclass of `ValueError`, if the data is not
+    valid JSON or not a valid event.
+    """
+    return EVENT_ADAPTER.validate_json(data)
+
+
+def parse_many(lines: Iterable[JsonData]) -> List[BaseEvent]:
+    """
+    Parses JSON-encoded events, one per line, skipping blank lines.
+
+    ```python
+    with open("events.jsonl", "rb") as log:
+        events = parse_many(log)
+    ```
+
+    The lines are joined into a JSON array and validated in one call. If that
+    fails, they are parsed one by one, so the error raised is the one of the
+    first invalid line.
+    """
+    lines = [line for line in lines if line and not line.isspace()]
+    if not lines:
+        return []
+    try:
+        if isinstance(lines[0], str):
+            events = _EVENTS_ADAPTER.validate_json("[" + ",".join(lines) + "]")
+        else:
+            events = _EVENTS_ADAPTER.validate_json(b"[" + b",".join(lines) + b"]")
+    except (ValidationError, TypeError):
+        events = None
+    # a line that is not a single JSON value can change the number of elements
+    if events is None or len(events) != len(lines):
+        events = [parse_event(line) for line in lines]
+    return events
@@ -3,5 +3,12 @@ This module contains the EventEncoder class.
 """
 
 from ag_ui.encoder.encoder import EventEncoder, AGUI_MEDIA_TYPE
+from ag_ui.encoder.batch import drain_queue, batch_events
+from ag_ui.encoder.coalesce import coalesce_deltas
+from ag_ui.encoder.compression import StreamCompressor, negotiate_encoding
+from ag_ui.encoder.metrics import EncoderMetrics, StreamMetrics, metrics_app
 
-__all__ = ["EventEncoder", "AGUI_MEDIA_TYPE"]
+__all__ = [
+    "EventEncoder", "AGUI_MEDIA_TYPE", "drain_queue", "batch_events", "coalesce_deltas",
+    "StreamCompressor", "negotiate_encoding", "EncoderMetrics", "StreamMetrics", "metrics_app",
+]
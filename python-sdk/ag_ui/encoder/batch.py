@@ -0,0 +1,92 @@
+"""
+This module contains helpers for sending events in batches.
+
+Each chunk yielded to a `StreamingResponse` costs an ASGI send and usually a
+syscall. Events that are produced back to back can be collected and encoded
+with `EventEncoder.encode_many` so they go out in a single write.
+"""
+
+import asyncio
+from typing import Any, AsyncIterable, AsyncIterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class _Failure:
+    """
+    Carries an exception raised by the producer over to the consumer.
+    """
+    def __init__(self, exception: BaseException):
+        self.exception = exception
+
+
+async def drain_queue(queue: asyncio.Queue, max_items: Optional[int] = None) -> List[Any]:
+    """
+    Waits for the next item in a queue, then takes every item that is already
+    queued, up to `max_items`.
+    """
+    items = [await queue.get()]
+    while max_items is None or len(items) < max_items:
+        try:
+            items.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+    return items
+
+
+async def batch_events(
+        events: AsyncIterable[T],
+        max_pending: int = 1024,
+    ) -> AsyncIterator[List[T]]:
+    """
+    Runs a producer ahead of the consumer and yields lists of the events that
+    were ready at the same time. At most `max_pending` events are buffered.
+    When the consumer stops early, the producer is cancelled and closed before
+    the batches are.
+
+    ```python
+    async for events in batch_events(send_events()):
+        yield encoder.encode_many(events)
+    ```
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+
+    async def produce():
+        try:
+            async for event in events:
+                await queue.put(event)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            await queue.put(_Failure(e))
+        else:
+            await queue.put(_DONE)
+        finally:
+            # a producer waiting for room in the queue is not inside the
+            # iteration, so it is closed here when the consumer stops early
+            aclose = getattr(events, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    task = asyncio.create_task(produce())
+    try:
+        while True:
+            batch = []
+            for item in await drain_queue(queue, max_items=max_pending):
+                if item is _DONE:
+                    if batch:
+                        yield batch
+                    return
+                if isinstance(item, _Failure):
+                    if batch:
+                        yield batch
+                    raise item.exception
+                batch.append(item)
+            yield batch
+    finally:
+        task.cancel()
+        # the producer's cleanup runs before the consumer goes on
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
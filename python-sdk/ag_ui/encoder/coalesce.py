@@ -0,0 +1,131 @@
+"""
+This module contains a streaming stage that merges small text and tool call
+argument deltas.
+
+LLM streams usually produce one delta per token. Placed between a producer and
+the EventEncoder, `coalesce_deltas` merges consecutive deltas for the same
+message or tool call into a single event, bounded by a time window and a byte
+budget.
+"""
+
+import asyncio
+from typing import AsyncIterable, AsyncIterator, Hashable, List, Optional, Tuple
+
+from ag_ui.core.events import EventType, BaseEvent
+
+# Marks a chunk without ids, which continues the previous chunk
+_CONTINUE = object()
+
+
+def _delta_key(event: BaseEvent) -> Optional[Tuple[EventType, Hashable]]:
+    """
+    Returns the key of the stream a delta belongs to, or None if the event
+    cannot be merged.
+    """
+    if event.raw_event is not None:
+        return None
+    event_type = event.type
+    if event_type == EventType.TEXT_MESSAGE_CONTENT:
+        return event_type, event.message_id
+    if event_type == EventType.TOOL_CALL_ARGS:
+        return event_type, event.tool_call_id
+    if event_type == EventType.TEXT_MESSAGE_CHUNK and event.delta:
+        if event.message_id is None and event.role is None:
+            return event_type, _CONTINUE
+        return event_type, event.message_id
+    if event_type == EventType.TOOL_CALL_CHUNK and event.delta:
+        if event.tool_call_id is None and event.tool_call_name is None and event.parent_message_id is None:
+            return event_type, _CONTINUE
+        return event_type, event.tool_call_id
+    return None
+
+
+async def coalesce_deltas(
+        events: AsyncIterable[BaseEvent],
+        window: float = 0.05,
+        max_bytes: int = 4096,
+    ) -> AsyncIterator[BaseEvent]:
+    """
+    Merges consecutive TEXT_MESSAGE_CONTENT, TEXT_MESSAGE_CHUNK, TOOL_CALL_ARGS
+    and TOOL_CALL_CHUNK deltas that belong to the same message or tool call.
+
+    A delta that arrives after a quiet period of `window` seconds is sent right
+    away. Deltas arriving within `window` seconds of the last one sent are held
+    and merged, and go out when the window ends or when the merged delta would
+    exceed `max_bytes`. Any other event, such as TEXT_MESSAGE_END or
+    RUN_FINISHED, flushes the held delta first, so the order of events is kept.
+
+    ```python
+    async for event in coalesce_deltas(send_events(), window=0.05):
+        yield encoder.encode(event)
+    ```
+    """
+    loop = asyncio.get_running_loop()
+    iterator = events.__aiter__()
+    next_event: Optional[asyncio.Future] = None
+
+    pending: Optional[BaseEvent] = None
+    pending_key: Optional[Tuple[EventType, Hashable]] = None
+    deltas: List[str] = []
+    size = 0
+    last_sent = float("-inf")
+
+    def flush() -> BaseEvent:
+        nonlocal pending, pending_key, deltas, size, last_sent
+        event = pending
+        if len(deltas) > 1:
+            event = event.model_copy(update={"delta": "".join(deltas)})
+        pending, pending_key, deltas, size = None, None, [], 0
+        last_sent = loop.time()
+        return event
+
+    try:
+        while True:
+            if next_event is None:
+                next_event = asyncio.ensure_future(iterator.__anext__())
+
+            if pending is not None:
+                timeout = last_sent + window - loop.time()
+                done, _ = await asyncio.wait({next_event}, timeout=max(timeout, 0))
+                if not done:
+                    yield flush()
+                    continue
+
+            try:
+                event = await next_event
+            except StopAsyncIteration:
+                break
+            except Exception:
+                if pending is not None:
+                    yield flush()
+                raise
+            finally:
+                next_event = None
+
+            key = _delta_key(event)
+            if key is None:
+                if pending is not None:
+                    yield flush()
+                yield event
+                continue
+
+            delta_size = len(event.delta.encode("utf-8"))
+            if pending is not None:
+                continues = key == pending_key or (key[0] == pending_key[0] and key[1] is _CONTINUE)
+                if continues and size + delta_size <= max_bytes:
+                    deltas.append(event.delta)
+                    size += delta_size
+                    continue
+                yield flush()
+
+            if loop.time() - last_sent >= window:
+                last_sent = loop.time()
+                yield event
+            else:
+                pending, pending_key, deltas, size = event, key, [event.delta], delta_size
+
+        if pending is not None:
+            yield flush()
+    finally:
+        if next_event is not None:
+            next_event.cancel()
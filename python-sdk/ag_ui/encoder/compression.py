@@ -0,0 +1,117 @@
+"""
+This module contains incremental compressors for event streams.
+
+Generic compression middleware buffers the response body, which holds back
+events until the buffer fills. A `StreamCompressor` keeps one compression
+context for the whole stream and sync-flushes after every write, so each batch
+of events reaches the client as soon as it is encoded while later frames still
+benefit from the keys and ids seen in earlier ones.
+
+gzip and deflate use `zlib`. zstd is offered if `zstandard` is installed.
+"""
+
+import zlib
+from typing import List, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+GZIP = "gzip"
+DEFLATE = "deflate"
+ZSTD = "zstd"
+
+# Preferred first when the client accepts several encodings equally
+_SERVER_PREFERENCE = (ZSTD, GZIP, DEFLATE)
+
+
+def supported_encodings() -> List[str]:
+    """
+    Returns the content encodings that can be produced, in order of preference.
+    """
+    return [encoding for encoding in _SERVER_PREFERENCE if encoding != ZSTD or zstandard is not None]
+
+
+def _parse_accept_encoding(accept_encoding: str) -> dict:
+    """
+    Parses an Accept-Encoding header into a dict of lowercase codings to q-values.
+    """
+    qualities = {}
+    for part in accept_encoding.split(","):
+        params = part.split(";")
+        coding = params[0].strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params[1:]:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value.strip())
+                except ValueError:
+                    q = 0.0
+        qualities[coding] = q
+    return qualities
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Returns the content encoding to use for an Accept-Encoding header, or None
+    if the response should not be compressed.
+
+    The coding with the highest q-value wins. Ties are broken by server
+    preference: zstd, then gzip, then deflate.
+    """
+    if not accept_encoding:
+        return None
+    qualities = _parse_accept_encoding(accept_encoding)
+    wildcard = qualities.get("*", 0.0)
+
+    best, best_q = None, 0.0
+    for encoding in supported_encodings():
+        q = qualities.get(encoding, wildcard)
+        if encoding == GZIP and GZIP not in qualities:
+            q = qualities.get("x-gzip", q)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class StreamCompressor:
+    """
+    Compresses a stream incrementally, flushing after every write so the
+    client can decompress everything it has received so far.
+    """
+    def __init__(self, encoding: str):
+        if encoding == GZIP:
+            self._compressor = zlib.compressobj(wbits=31)
+        elif encoding == DEFLATE:
+            self._compressor = zlib.compressobj(wbits=15)
+        elif encoding == ZSTD and zstandard is not None:
+            self._compressor = zstandard.ZstdCompressor().compressobj()
+        else:
+            raise ValueError(f"Unsupported content encoding: {encoding}")
+        self.encoding = encoding
+        self._sync_flush = zstandard.COMPRESSOBJ_FLUSH_BLOCK if encoding == ZSTD else zlib.Z_SYNC_FLUSH
+        self.finished = False
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        Compresses data and flushes it, returning bytes that can be written
+        to the transport as is.
+        """
+        if self.finished:
+            raise ValueError("Stream is already finished")
+        compressor = self._compressor
+        return compressor.compress(data) + compressor.flush(self._sync_flush)
+
+    def finish(self) -> bytes:
+        """
+        Ends the compressed stream and returns its trailer. Further calls
+        return empty bytes.
+        """
+        if self.finished:
+            return b""
+        self.finished = True
+        return self._compressor.flush()
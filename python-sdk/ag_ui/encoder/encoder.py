@@ -2,31 +2,180 @@
 This module contains the EventEncoder class
 """
 
+import struct
+from time import perf_counter
+from typing import Iterable, Optional, Union
+
 from ag_ui.core.events import BaseEvent
+from ag_ui.proto import AGUI_MEDIA_TYPE, encode as encode_proto
+from ag_ui.encoder.media_type import preferred_media_types
+from ag_ui.encoder.serializer import serialize, serialize_bytes
+from ag_ui.encoder.compression import StreamCompressor, negotiate_encoding
+from ag_ui.encoder.metrics import EncoderMetrics, StreamMetrics
 
-AGUI_MEDIA_TYPE = "application/vnd.ag-ui.event+proto"
+SSE_MEDIA_TYPE = "text/event-stream"
 
 class EventEncoder:
     """
     Encodes Agent User Interaction events.
     """
-    def __init__(self, accept: str = None):
-        pass
+    def __init__(
+            self,
+            accept: str = None,
+            accept_encoding: str = None,
+            metrics: Optional[EncoderMetrics] = None,
+        ):
+        self.accepts_protobuf = accept is not None and self._is_protobuf_accepted(accept)
+        content_encoding = negotiate_encoding(accept_encoding)
+        self.compressor: Optional[StreamCompressor] = (
+            StreamCompressor(content_encoding) if content_encoding is not None else None
+        )
+        self._metrics = metrics
+        self._finished = False
+        self.stream_metrics: Optional[StreamMetrics] = None
+        # frames are timed only when there is a metrics sink
+        self._frame = self._encode_frame
+        if metrics is not None:
+            self.stream_metrics = metrics.start_stream()
+            self._frame = self._encode_measured_frame
 
     def get_content_type(self) -> str:
         """
         Returns the content type of the encoder.
         """
-        return "text/event-stream"
+        if self.accepts_protobuf:
+            return AGUI_MEDIA_TYPE
+        return SSE_MEDIA_TYPE
 
-    def encode(self, event: BaseEvent) -> str:
+    def get_content_encoding(self) -> Optional[str]:
+        """
+        Returns the content encoding of the encoder, or None if the output
+        is not compressed.
+        """
+        if self.compressor is not None:
+            return self.compressor.encoding
+        return None
+
+    def encode(self, event: BaseEvent) -> Union[str, bytes]:
         """
         Encodes an event.
+
+        Returns a length-prefixed protobuf frame if the client accepts protobuf,
+        and an SSE string otherwise. Compressed output is always bytes.
         """
+        if self.compressor is not None or self.stream_metrics is not None:
+            encoded = self.encode_bytes(event)
+            return encoded if self.compressor is not None or self.accepts_protobuf else encoded.decode("utf-8")
+        if self.accepts_protobuf:
+            return self._encode_protobuf(event)
         return self._encode_sse(event)
 
+    def encode_bytes(self, event: BaseEvent) -> bytes:
+        """
+        Encodes an event into bytes that can be written to the transport as is.
+        """
+        data = self._frame(event)
+        if self.compressor is not None:
+            data = self.compressor.compress(data)
+        if self.stream_metrics is not None:
+            self.stream_metrics.record_sent(len(data))
+        return data
+
+    def encode_many(self, events: Iterable[BaseEvent]) -> bytes:
+        """
+        Encodes a sequence of events into one contiguous payload, so they can be
+        sent in a single write. Compressed output is flushed once per call.
+        """
+        frame = self._frame
+        data = b"".join([frame(event) for event in events])
+        if self.compressor is not None and data:
+            data = self.compressor.compress(data)
+        if self.stream_metrics is not None:
+            self.stream_metrics.record_sent(len(data))
+        return data
+
+    def encode_into(self, buffer: bytearray, event: BaseEvent) -> int:
+        """
+        Appends an encoded event to a buffer and returns the number of bytes written.
+
+        Encoding several events into the same buffer lets them be sent in a
+        single write without joining strings:
+
+            buffer = bytearray()
+            for event in events:
+                encoder.encode_into(buffer, event)
+            with memoryview(buffer) as view:
+                transport.write(view)
+            buffer.clear()
+
+        Compressed output is flushed after every event, so prefer `encode_many`
+        when compressing.
+        """
+        start = len(buffer)
+        if self.compressor is not None or self.stream_metrics is not None:
+            buffer += self.encode_bytes(event)
+        elif self.accepts_protobuf:
+            message = encode_proto(event)
+            buffer += struct.pack(">I", len(message))
+            buffer += message
+        else:
+            buffer += b"data: "
+            buffer += serialize_bytes(event)
+            buffer += b"\n\n"
+        return len(buffer) - start
+
+    def finish(self) -> bytes:
+        """
+        Returns the bytes that end the compressed stream. They must be sent
+        after the last event. Returns empty bytes if the output is not compressed.
+
+        With a metrics sink, this also records the size of the finished stream.
+        Calling it again returns empty bytes and records nothing.
+        """
+        if self._finished:
+            return b""
+        self._finished = True
+        trailer = self.compressor.finish() if self.compressor is not None else b""
+        if self._metrics is not None:
+            self.stream_metrics.record_sent(len(trailer))
+            self._metrics.finish_stream(self.stream_metrics)
+        return trailer
+
+    def _encode_frame(self, event: BaseEvent) -> bytes:
+        """
+        Encodes an event into an uncompressed SSE or protobuf frame.
+        """
+        if self.accepts_protobuf:
+            return self._encode_protobuf(event)
+        return b"".join((b"data: ", serialize_bytes(event), b"\n\n"))
+
+    def _encode_measured_frame(self, event: BaseEvent) -> bytes:
+        """
+        Encodes a frame and records its event type, size and encode time.
+        """
+        start = perf_counter()
+        data = self._encode_frame(event)
+        self.stream_metrics.record(event.type, len(data), perf_counter() - start)
+        return data
+
     def _encode_sse(self, event: BaseEvent) -> str:
         """
         Encodes an event into an SSE string.
         """
-        return f"data: {event.model_dump_json(by_alias=True, exclude_none=True)}\n\n"
+        return f"data: {serialize(event)}\n\n"
+
+    def _encode_protobuf(self, event: BaseEvent) -> bytes:
+        """
+        Encodes an event into a protobuf message prefixed with its length
+        as a 4-byte big-endian uint32.
+        """
+        message = encode_proto(event)
+        return struct.pack(">I", len(message)) + message
+
+    def _is_protobuf_accepted(self, accept: str) -> bool:
+        """
+        Returns True if the Accept header prefers protobuf over SSE.
+        SSE is used when both are equally acceptable (e.g. `*/*`).
+        """
+        preferred = preferred_media_types(accept, [SSE_MEDIA_TYPE, AGUI_MEDIA_TYPE])
+        return len(preferred) > 0 and preferred[0] == AGUI_MEDIA_TYPE
@@ -0,0 +1,126 @@
+"""
+This module contains Accept header negotiation for the EventEncoder.
+
+Modified from https://github.com/jshttp/negotiator/blob/master/lib/mediaType.js
+(MIT Licensed), mirroring `typescript-sdk/packages/encoder/src/media-type.ts`.
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+
+
+class _MediaType(NamedTuple):
+    type: str
+    subtype: str
+    params: Dict[str, str]
+    q: float
+    i: int
+
+
+class _Priority(NamedTuple):
+    o: int
+    q: float
+    s: int
+    i: int
+
+
+def preferred_media_types(accept: Optional[str], provided: List[str]) -> List[str]:
+    """
+    Returns the provided media types that are acceptable, most preferred first.
+    """
+    # RFC 2616 sec 14.2: no header = */*
+    accepts = _parse_accept("*/*" if accept is None else accept)
+    priorities = [_get_priority(media_type, accepts, index) for index, media_type in enumerate(provided)]
+    ordered = sorted(
+        (priority for priority in priorities if priority.q > 0),
+        key=lambda p: (-p.q, -p.s, p.o, p.i),
+    )
+    return [provided[priority.i] for priority in ordered]
+
+
+def _parse_accept(accept: str) -> List[_MediaType]:
+    result = []
+    for index, part in enumerate(_split_quoted(accept, ",")):
+        media_type = _parse_media_type(part.strip(), index)
+        if media_type is not None:
+            result.append(media_type)
+    return result
+
+
+def _parse_media_type(value: str, index: int) -> Optional[_MediaType]:
+    parts = _split_quoted(value, ";")
+    full_type = parts[0].strip()
+    if full_type.count("/") != 1 or any(c.isspace() for c in full_type):
+        return None
+    media_type, subtype = full_type.split("/")
+    if not media_type or not subtype:
+        return None
+
+    params: Dict[str, str] = {}
+    q = 1.0
+    for param in parts[1:]:
+        key, _, val = param.strip().partition("=")
+        key = key.strip().lower()
+        val = val.strip()
+        if len(val) >= 2 and val[0] == '"' and val[-1] == '"':
+            val = val[1:-1]
+        if key == "q":
+            try:
+                q = float(val)
+            except ValueError:
+                q = 0.0
+            break
+        params[key] = val
+
+    return _MediaType(media_type, subtype, params, q, index)
+
+
+def _get_priority(media_type: str, accepted: List[_MediaType], index: int) -> _Priority:
+    priority = _Priority(o=-1, q=0, s=0, i=index)
+    provided = _parse_media_type(media_type, 0)
+    if provided is None:
+        return priority
+    for spec in accepted:
+        specificity = _specify(provided, spec)
+        if specificity is None:
+            continue
+        if (priority.s - specificity or priority.q - spec.q or priority.o - spec.i) < 0:
+            priority = _Priority(o=spec.i, q=spec.q, s=specificity, i=index)
+    return priority
+
+
+def _specify(provided: _MediaType, spec: _MediaType) -> Optional[int]:
+    specificity = 0
+    if spec.type.lower() == provided.type.lower():
+        specificity |= 4
+    elif spec.type != "*":
+        return None
+
+    if spec.subtype.lower() == provided.subtype.lower():
+        specificity |= 2
+    elif spec.subtype != "*":
+        return None
+
+    if spec.params:
+        if all(
+            value == "*" or value.lower() == provided.params.get(key, "").lower()
+            for key, value in spec.params.items()
+        ):
+            specificity |= 1
+        else:
+            return None
+
+    return specificity
+
+
+def _split_quoted(value: str, separator: str) -> List[str]:
+    """
+    Splits on a separator, ignoring separators inside quoted strings.
+    """
+    parts = value.split(separator)
+    result = [parts[0]]
+    for part in parts[1:]:
+        if result[-1].count('"') % 2 == 0:
+            result.append(part)
+        else:
+            result[-1] += separator + part
+    return result
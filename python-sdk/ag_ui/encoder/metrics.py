@@ -0,0 +1,246 @@
+"""
+This module contains metrics for the EventEncoder.
+
+An `EncoderMetrics` sink passed to encoders counts the events of each type, the
+bytes they encode to, the bytes written after compression and the time spent
+encoding. Each encoder records into a `StreamMetrics` of its own, so both a
+single stream and the whole process can be inspected. Encoders without a sink
+skip all of this.
+
+`metrics_app` serves the totals in the Prometheus text format and can be
+mounted on any ASGI app:
+
+    app.mount("/metrics", metrics_app(metrics))
+"""
+
+import weakref
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence
+from weakref import WeakKeyDictionary, WeakSet
+
+from ag_ui.core.events import EventType
+
+# encode times in seconds, from a single token delta to a large snapshot
+DEFAULT_BUCKETS = (
+    0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005,
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.01,
+)
+
+
+class StreamMetrics:
+    """
+    Metrics of a single stream.
+
+    `types` maps each event type to `[events, bytes, seconds]`, and `latency`
+    holds the number of events whose encode time fell into each bucket of
+    `buckets`, with a last count for the times above every bucket.
+    """
+    __slots__ = ("types", "latency", "buckets", "_sent", "__weakref__")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.types: Dict[EventType, List[float]] = {}
+        self.buckets = tuple(buckets)
+        self.latency = [0] * (len(self.buckets) + 1)
+        self._sent = [0]
+
+    def record(self, event_type: EventType, size: int, seconds: float) -> None:
+        """
+        Records an event that was encoded into `size` bytes in `seconds`.
+        """
+        entry = self.types.get(event_type)
+        if entry is None:
+            entry = self.types[event_type] = [0, 0, 0.0]
+        entry[0] += 1
+        entry[1] += size
+        entry[2] += seconds
+        self.latency[bisect_left(self.buckets, seconds)] += 1
+
+    def record_sent(self, size: int) -> None:
+        """
+        Records bytes handed to the transport, after compression.
+        """
+        self._sent[0] += size
+
+    @property
+    def sent_bytes(self) -> int:
+        """
+        The number of bytes handed to the transport.
+        """
+        return self._sent[0]
+
+    @property
+    def total_events(self) -> int:
+        """
+        The number of events encoded.
+        """
+        return sum(entry[0] for entry in self.types.values())
+
+    @property
+    def total_bytes(self) -> int:
+        """
+        The number of bytes encoded, before compression.
+        """
+        return sum(entry[1] for entry in self.types.values())
+
+    def latency_quantile(self, q: float) -> float:
+        """
+        Returns an upper bound of the q-quantile of the encode time, or
+        infinity if it lies above the last bucket.
+        """
+        rank = q * sum(self.latency)
+        seen = 0
+        for bound, count in zip(self.buckets, self.latency):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class EncoderMetrics:
+    """
+    Metrics shared by encoders, e.g. all encoders of a server process.
+
+    ```python
+    metrics = EncoderMetrics()
+    encoder = EventEncoder(accept=accept_header, metrics=metrics)
+    ```
+
+    Encoders record into their own `StreamMetrics`, which are added to the
+    totals when the encoder's `finish()` is called or the encoder is garbage
+    collected. Reading the totals includes the streams still running.
+    """
+    # bytes per stream, from a short answer to a long run with snapshots
+    STREAM_BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.streams = 0
+        self._finished = StreamMetrics(self.buckets)
+        self._running: "WeakSet[StreamMetrics]" = WeakSet()
+        self._finalizers: "WeakKeyDictionary[StreamMetrics, weakref.finalize]" = WeakKeyDictionary()
+        self.stream_bytes = [0] * (len(self.STREAM_BYTES_BUCKETS) + 1)
+
+    def start_stream(self) -> StreamMetrics:
+        """
+        Returns the metrics of a new stream.
+        """
+        stream = StreamMetrics(self.buckets)
+        self.streams += 1
+        self._running.add(stream)
+        # a stream whose encoder is dropped without finish() is finished then
+        self._finalizers[stream] = weakref.finalize(
+            stream, self._finish, stream.types, stream.latency, stream._sent  # pylint: disable=protected-access
+        )
+        return stream
+
+    def finish_stream(self, stream: StreamMetrics) -> None:
+        """
+        Adds a finished stream to the totals and records its size.
+        """
+        finalizer = self._finalizers.pop(stream, None)
+        if finalizer is not None:
+            self._running.discard(stream)
+            finalizer()
+
+    def totals(self) -> StreamMetrics:
+        """
+        Returns the totals of all streams, including the running ones.
+        """
+        totals = StreamMetrics(self.buckets)
+        for stream in [self._finished, *self._running]:
+            _add(totals, stream.types, stream.latency, stream._sent)  # pylint: disable=protected-access
+        return totals
+
+    def _finish(self, types, latency, sent) -> None:
+        _add(self._finished, types, latency, sent)
+        self.stream_bytes[bisect_left(self.STREAM_BYTES_BUCKETS, sent[0])] += 1
+
+    def render_prometheus(self, prefix: str = "ag_ui_encoder") -> str:
+        """
+        Returns the metrics in the Prometheus text exposition format.
+        """
+        totals = self.totals()
+        types = sorted(totals.types.items())
+        lines = [
+            f"# HELP {prefix}_events_total Events encoded, by event type.",
+            f"# TYPE {prefix}_events_total counter",
+        ]
+        lines += [f'{prefix}_events_total{{type="{t.value}"}} {entry[0]}' for t, entry in types]
+        lines += [
+            f"# HELP {prefix}_event_bytes_total Bytes encoded before compression, by event type.",
+            f"# TYPE {prefix}_event_bytes_total counter",
+        ]
+        lines += [f'{prefix}_event_bytes_total{{type="{t.value}"}} {entry[1]}' for t, entry in types]
+        lines += [
+            f"# HELP {prefix}_encode_seconds_total Time spent encoding, by event type.",
+            f"# TYPE {prefix}_encode_seconds_total counter",
+        ]
+        lines += [f'{prefix}_encode_seconds_total{{type="{t.value}"}} {entry[2]!r}' for t, entry in types]
+        lines += [
+            f"# HELP {prefix}_sent_bytes_total Bytes written to the transport after compression.",
+            f"# TYPE {prefix}_sent_bytes_total counter",
+            f"{prefix}_sent_bytes_total {totals.sent_bytes}",
+            f"# HELP {prefix}_streams_total Streams started.",
+            f"# TYPE {prefix}_streams_total counter",
+            f"{prefix}_streams_total {self.streams}",
+        ]
+        lines += _render_histogram(
+            f"{prefix}_encode_seconds", "Time to encode a single event.",
+            totals.buckets, totals.latency, sum(entry[2] for _, entry in types),
+        )
+        lines += _render_histogram(
+            f"{prefix}_stream_bytes", "Bytes written per stream.",
+            self.STREAM_BYTES_BUCKETS, self.stream_bytes, None,
+        )
+        return "\n".join(lines) + "\n"
+
+
+def _add(totals: StreamMetrics, types, latency, sent) -> None:
+    for event_type, entry in types.items():
+        total = totals.types.get(event_type)
+        if total is None:
+            total = totals.types[event_type] = [0, 0, 0.0]
+        total[0] += entry[0]
+        total[1] += entry[1]
+        total[2] += entry[2]
+    for i, count in enumerate(latency):
+        totals.latency[i] += count
+    totals.record_sent(sent[0])
+
+
+def _render_histogram(name: str, description: str, bounds, counts, total: Optional[float]):
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+    cumulative = 0
+    for bound, count in zip(bounds, counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{le="{bound!r}"}} {cumulative}')
+    cumulative += counts[-1]
+    lines.append(f'{name}_bucket{{le="+Inf"}} {cumulative}')
+    if total is not None:
+        lines.append(f"{name}_sum {total!r}")
+    lines.append(f"{name}_count {cumulative}")
+    return lines
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def metrics_app(metrics: EncoderMetrics, prefix: str = "ag_ui_encoder"):
+    """
+    Returns an ASGI app that serves the metrics in the Prometheus text format.
+    """
+    async def app(scope, receive, send):  # pylint: disable=unused-argument
+        if scope["type"] != "http":
+            return
+        body = metrics.render_prometheus(prefix).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", PROMETHEUS_CONTENT_TYPE.encode("latin-1")),
+                (b"content-length", str(len(body)).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    return app
@@ -0,0 +1,179 @@
+"""
+This module contains fast JSON serializers for events.
+
+A serializer is built once per event class from its pydantic fields. It writes
+the same JSON as `event.model_dump_json(by_alias=True, exclude_none=True)`
+without walking the pydantic model on every call. Events the fast path cannot
+reproduce exactly fall back to pydantic.
+
+If `orjson` is installed, it is used for free-form values such as state
+snapshots and JSON patches.
+"""
+
+import re
+from enum import Enum
+from json import dumps
+from json.encoder import encode_basestring
+from typing import Any, Callable, Dict, Literal, Union, get_args, get_origin
+
+from ag_ui.core.events import BaseEvent
+
+try:
+    import orjson
+    _ORJSON_OPTIONS = (
+        orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_SUBCLASS
+    )
+except ImportError:  # pragma: no cover
+    orjson = None
+
+Serializer = Callable[[BaseEvent], str]
+
+# Field kinds
+_STR = 0    # str, str enums and string literals
+_INT = 1    # int
+_JSON = 2   # anything else
+
+# orjson writes positive exponents as `1e16`, pydantic as `1e+16`
+_ORJSON_EXPONENT = re.compile(rb"\de\d")
+
+_SERIALIZERS: Dict[type, Serializer] = {}
+_ENUM_STRINGS: Dict[Enum, str] = {}
+
+
+class _Unsupported(Exception):
+    """
+    Raised when the fast path cannot reproduce pydantic's output for a value.
+    """
+
+
+def serialize(event: BaseEvent) -> str:
+    """
+    Serializes an event to JSON, with camelCase keys and without None values.
+    """
+    serializer = _SERIALIZERS.get(type(event))
+    if serializer is None:
+        serializer = get_serializer(type(event))
+    return serializer(event)
+
+
+def serialize_bytes(event: BaseEvent) -> bytes:
+    """
+    Serializes an event to UTF-8 encoded JSON.
+    """
+    serializer = _SERIALIZERS.get(type(event))
+    if serializer is None:
+        serializer = get_serializer(type(event))
+    if serializer is _serialize_with_pydantic:
+        # pydantic produces bytes natively, skip the round trip through str
+        return event.__pydantic_serializer__.to_json(event, by_alias=True, exclude_none=True)
+    return serializer(event).encode("utf-8")
+
+
+def get_serializer(event_class: type) -> Serializer:
+    """
+    Returns the serializer for an event class, building it on first use.
+    """
+    serializer = _SERIALIZERS.get(event_class)
+    if serializer is None:
+        serializer = _SERIALIZERS[event_class] = _build_serializer(event_class)
+    return serializer
+
+
+def _serialize_with_pydantic(event: BaseEvent) -> str:
+    return event.model_dump_json(by_alias=True, exclude_none=True)
+
+
+def _build_serializer(event_class: type) -> Serializer:
+    decorators = event_class.__pydantic_decorators__
+    if (
+        decorators.field_serializers
+        or decorators.model_serializers
+        or event_class.model_computed_fields
+        or event_class.model_config.get("ser_json_inf_nan", "null") != "null"
+    ):
+        return _serialize_with_pydantic
+
+    plan = []
+    for name, field in event_class.model_fields.items():
+        if field.exclude:
+            continue
+        prefix = dumps(field.serialization_alias or field.alias or name) + ":"
+        kind = _field_kind(field.annotation)
+        # single-valued literals such as `type` are written as a precomputed constant
+        constant = encoded_constant = None
+        if kind == _STR and get_origin(field.annotation) is Literal and len(get_args(field.annotation)) == 1:
+            constant = get_args(field.annotation)[0]
+            encoded_constant = prefix + _encode_enum(constant)
+        plan.append((name, prefix, kind, constant, encoded_constant))
+    allows_extra = event_class.model_config.get("extra") == "allow"
+
+    def serializer(event: BaseEvent) -> str:
+        if allows_extra and event.__pydantic_extra__:
+            return _serialize_with_pydantic(event)
+        values = event.__dict__
+        parts = []
+        try:
+            for name, prefix, kind, constant, encoded_constant in plan:
+                value = values[name]
+                if value is None:
+                    continue
+                if value is constant:
+                    parts.append(encoded_constant)
+                elif kind == _STR:
+                    if type(value) is str:
+                        parts.append(prefix + encode_basestring(value))
+                    else:
+                        parts.append(prefix + _encode_enum(value))
+                elif kind == _INT:
+                    if type(value) is not int:
+                        raise _Unsupported()
+                    parts.append(prefix + str(value))
+                else:
+                    parts.append(prefix + _encode_json(value))
+        except _Unsupported:
+            return _serialize_with_pydantic(event)
+        return "{" + ",".join(parts) + "}"
+
+    return serializer
+
+
+def _field_kind(annotation: Any) -> int:
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) != 1:
+            return _JSON
+        annotation = args[0]
+    if annotation is str:
+        return _STR
+    if annotation is int:
+        return _INT
+    if isinstance(annotation, type) and issubclass(annotation, str):
+        return _STR
+    if get_origin(annotation) is Literal and all(isinstance(arg, str) for arg in get_args(annotation)):
+        return _STR
+    return _JSON
+
+
+def _encode_enum(value: Any) -> str:
+    if type(value) is str:
+        return encode_basestring(value)
+    encoded = _ENUM_STRINGS.get(value) if isinstance(value, Enum) else None
+    if encoded is None:
+        if not isinstance(value, Enum) or type(value.value) is not str:
+            raise _Unsupported()
+        encoded = _ENUM_STRINGS[value] = encode_basestring(value.value)
+    return encoded
+
+
+def _encode_json(value: Any) -> str:
+    if orjson is None:
+        raise _Unsupported()
+    try:
+        encoded = orjson.dumps(value, option=_ORJSON_OPTIONS)
+    except TypeError as exc:
+        raise _Unsupported() from exc
+    if _ORJSON_EXPONENT.search(encoded):
+        raise _Unsupported()
+    return encoded.decode("utf-8")
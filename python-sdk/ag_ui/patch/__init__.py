@@ -0,0 +1,34 @@
+"""
+This module contains the JSON Patch engine, the state tracker and the state
+emitter.
+"""
+
+from ag_ui.patch.patch import (
+    PATCH_OPERATIONS,
+    JsonPatchError,
+    apply_patch,
+    compact_patch,
+    format_pointer,
+    make_patch,
+    parse_pointer,
+    validate_patch,
+)
+from ag_ui.patch.emitter import StateEmitter, emit_state
+from ag_ui.patch.tracking import StateTracker, TrackedDict, TrackedList, TrackedModel
+
+__all__ = [
+    "PATCH_OPERATIONS",
+    "JsonPatchError",
+    "apply_patch",
+    "compact_patch",
+    "format_pointer",
+    "make_patch",
+    "parse_pointer",
+    "validate_patch",
+    "StateTracker",
+    "TrackedDict",
+    "TrackedList",
+    "TrackedModel",
+    "StateEmitter",
+    "emit_state",
+]
@@ -0,0 +1,132 @@
+"""
+This module contains the StateEmitter class, which sends the state of a run
+as a snapshot or a delta, whichever is smaller.
+
+Producers tend to send a `STATE_SNAPSHOT` whenever the state changes, which
+repeats the whole state for a small change. The emitter remembers the state
+the client last saw and turns each snapshot into a `STATE_DELTA` against it,
+unless the delta would be larger. Snapshots of a state the client already has
+are dropped, and a snapshot is sent every `snapshot_interval` deltas so a
+client that went out of sync recovers.
+"""
+
+from typing import Any, AsyncIterable, AsyncIterator, Optional
+
+from pydantic_core import from_json, to_json
+
+from ag_ui.core.events import BaseEvent, EventType, StateDeltaEvent, StateSnapshotEvent
+from ag_ui.core.types import State
+from ag_ui.patch.patch import JsonPatchError, apply_patch, make_patch
+
+_UNKNOWN = object()
+
+
+class StateEmitter:
+    """
+    Chooses between a snapshot and a delta for each state update of a run.
+
+    ```python
+    emitter = StateEmitter()
+    for step in steps:
+        step.status = "completed"
+        event = emitter.update(state)
+        if event is not None:
+            yield encoder.encode(event)
+    ```
+
+    Use one emitter per run, since it tracks what the client of the run has
+    seen. If the client sent its current state, pass it as `state` so that the
+    first update can be a delta as well.
+    """
+    def __init__(self, state: Any = _UNKNOWN, snapshot_interval: int = 50):
+        self.snapshot_interval = snapshot_interval
+        self._encoded: Optional[bytes] = None if state is _UNKNOWN else to_json(state, by_alias=True)
+        self._client_state: Any = _UNKNOWN if state is _UNKNOWN else from_json(self._encoded)
+        self._deltas = 0
+
+    @property
+    def client_state(self) -> State:
+        """
+        The state the client last saw, or None if it has not seen one.
+        """
+        return None if self._client_state is _UNKNOWN else self._client_state
+
+    def reset(self) -> None:
+        """
+        Forgets the state the client last saw, so the next update is sent as
+        a snapshot.
+        """
+        self._client_state = _UNKNOWN
+        self._encoded = None
+        self._deltas = 0
+
+    def update(self, state: Any) -> Optional[BaseEvent]:
+        """
+        Returns the event that brings the client to `state`: a `StateDeltaEvent`
+        if it is smaller than the snapshot, a `StateSnapshotEvent` otherwise,
+        or None if the client already has the state.
+        """
+        return self._update(state, None)
+
+    def emit(self, event: BaseEvent) -> Optional[BaseEvent]:
+        """
+        Passes an event through, replacing a `STATE_SNAPSHOT` with the event
+        chosen by `update`. Returns None if the event should be dropped.
+
+        A `STATE_DELTA` is passed through unchanged and applied to the state
+        the client last saw. If it cannot be applied, the next update is sent
+        as a snapshot.
+        """
+        if event.type == EventType.STATE_SNAPSHOT:
+            return self._update(event.snapshot, event)
+        if event.type == EventType.STATE_DELTA and self._client_state is not _UNKNOWN:
+            try:
+                self._client_state = apply_patch(self._client_state, event.delta)
+                self._encoded = None
+                self._deltas += 1
+            except JsonPatchError:
+                self.reset()
+        return event
+
+    def _update(self, state: Any, snapshot: Optional[BaseEvent]) -> Optional[BaseEvent]:
+        encoded = to_json(state, by_alias=True)
+        if encoded == self._encoded:
+            return None
+        self._encoded = encoded
+        # the client sees the state as JSON, so the copy is taken from it
+        document = from_json(encoded)
+        previous = self._client_state
+        self._client_state = document
+        if previous is not _UNKNOWN and self._deltas < self.snapshot_interval:
+            delta = make_patch(previous, document)
+            if not delta:
+                return None
+            if len(to_json(delta)) < len(encoded):
+                self._deltas += 1
+                return StateDeltaEvent.trusted(delta=delta)
+        elif previous is not _UNKNOWN and previous == document:
+            # due for a snapshot, but the client is in sync with the state
+            return None
+        self._deltas = 0
+        return snapshot if snapshot is not None else StateSnapshotEvent.trusted(snapshot=state)
+
+
+async def emit_state(
+    events: AsyncIterable[BaseEvent],
+    emitter: Optional[StateEmitter] = None,
+) -> AsyncIterator[BaseEvent]:
+    """
+    Passes events through `emitter`, which replaces state snapshots with
+    smaller deltas and drops redundant ones. A new emitter is used if none is
+    given.
+
+    ```python
+    async for event in emit_state(run_agent(input_data)):
+        yield encoder.encode(event)
+    ```
+    """
+    emit = (emitter if emitter is not None else StateEmitter()).emit
+    async for event in events:
+        event = emit(event)
+        if event is not None:
+            yield event
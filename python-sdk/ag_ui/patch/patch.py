@@ -0,0 +1,434 @@
+"""
+This module contains the JSON Patch (RFC 6902) engine used for state deltas.
+
+`apply_patch` applies a patch to a document in place. JSON Pointers are parsed
+once and cached, since a stream of deltas tends to touch the same paths over
+and over, and only the parts of the document named by the patch are visited.
+`make_patch` computes the patch between two documents, and `compact_patch`
+merges a sequence of patches into a shorter equivalent one, e.g. to send the
+changes of several ticks as a single `STATE_DELTA`.
+
+Operations are validated against the `JsonPatchOperationType` set of the
+protocol, so every patch these functions accept can also be encoded as
+protobuf.
+"""
+
+from copy import deepcopy
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+Pointer = Tuple[str, ...]
+
+# the JsonPatchOperationType enum of patch.proto
+PATCH_OPERATIONS = frozenset(("add", "remove", "replace", "move", "copy", "test"))
+
+_SCALARS = (str, int, float, bool, type(None))
+_LEAVES = frozenset(_SCALARS)
+
+
+class JsonPatchError(ValueError):
+    """
+    Raised when a patch is invalid or cannot be applied to a document.
+    """
+
+
+@lru_cache(maxsize=4096)
+def parse_pointer(pointer: str) -> Pointer:
+    """
+    Parses a JSON Pointer (RFC 6901) into its reference tokens.
+    """
+    if pointer == "":
+        return ()
+    if not isinstance(pointer, str) or pointer[0] != "/":
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    if "~" not in pointer:
+        return tuple(pointer[1:].split("/"))
+    return tuple(token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/"))
+
+
+def format_pointer(tokens: Sequence[str]) -> str:
+    """
+    Formats reference tokens as a JSON Pointer.
+    """
+    return "".join("/" + str(token).replace("~", "~0").replace("/", "~1") for token in tokens)
+
+
+def _compile(operation: Any) -> Tuple[str, Pointer, Optional[Pointer], Any]:
+    """
+    Validates an operation and returns it as (op, path, from, value).
+    """
+    try:
+        op = operation["op"]
+        path = operation["path"]
+    except (KeyError, TypeError):
+        raise JsonPatchError(f"Invalid JSON Patch operation: {operation!r}") from None
+    if op not in PATCH_OPERATIONS:
+        raise JsonPatchError(f"Invalid JSON Patch operation: {op!r}")
+    if not isinstance(path, str):
+        raise JsonPatchError(f"Invalid JSON pointer: {path!r}")
+    source = None
+    value = None
+    if op in ("move", "copy"):
+        if not isinstance(operation.get("from"), str):
+            raise JsonPatchError(f"'{op}' operation requires 'from': {operation!r}")
+        source = parse_pointer(operation["from"])
+    elif op != "remove":
+        if "value" not in operation:
+            raise JsonPatchError(f"'{op}' operation requires 'value': {operation!r}")
+        value = operation["value"]
+    return op, parse_pointer(path), source, value
+
+
+def validate_patch(patch: Iterable[Any]) -> None:
+    """
+    Checks that every operation of a patch is well-formed and is one of the
+    protocol's JsonPatchOperationType values.
+    """
+    for operation in patch:
+        _compile(operation)
+
+
+def _index(container: list, token: str, allow_end: bool) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (token[0] == "0" and len(token) > 1):
+        raise JsonPatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f"Array index out of range: {index}")
+    return index
+
+
+def _resolve(document: Any, tokens: Pointer) -> Any:
+    for token in tokens:
+        if isinstance(document, dict):
+            try:
+                document = document[token]
+            except KeyError:
+                raise JsonPatchError(f"Path not found: {format_pointer(tokens)!r}") from None
+        elif isinstance(document, list):
+            document = document[_index(document, token, False)]
+        else:
+            raise JsonPatchError(f"Path not found: {format_pointer(tokens)!r}")
+    return document
+
+
+def _json_type(value: Any) -> type:
+    # bool is a subclass of int, but true and 1 are different JSON values
+    for kind in (bool, int, float, str, dict, list):
+        if isinstance(value, kind):
+            return kind
+    return type(value)
+
+
+def _equal(a: Any, b: Any) -> bool:
+    """
+    Compares two JSON values as the `test` operation does: values of
+    different JSON types are never equal.
+    """
+    kind = _json_type(a)
+    if kind is not _json_type(b):
+        return False
+    if kind is dict:
+        return a.keys() == b.keys() and all(_equal(item, b[key]) for key, item in a.items())
+    if kind is list:
+        return len(a) == len(b) and all(_equal(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def _copy(value: Any) -> Any:
+    return value if isinstance(value, _SCALARS) else deepcopy(value)
+
+
+# undo log entries: (action, container, key, value)
+_SET = 0
+_DELETE = 1
+_INSERT = 2
+_POP = 3
+
+
+def apply_patch(document: Any, patch: Iterable[Any]) -> Any:
+    """
+    Applies a patch to a document in place and returns the document, which is
+    a new object only if the patch replaced the root.
+
+    The patch is atomic: if an operation fails, the operations before it are
+    undone and JsonPatchError is raised. Added values are copied, so the
+    document never shares objects with the patch.
+    """
+    root = document
+    undo: List[Tuple[int, Any, Any, Any]] = []
+    try:
+        for operation in patch:
+            op, tokens, source, value = _compile(operation)
+            if op == "replace" or op == "add":
+                value = _copy(value)
+            elif op == "remove":
+                _remove(root, tokens, undo)
+                continue
+            elif op == "move":
+                if tokens == source:
+                    # a move onto itself changes nothing, but its location must exist
+                    _resolve(root, source)
+                    continue
+                if tokens[:len(source)] == source:
+                    raise JsonPatchError(f"Cannot move {operation['from']!r} into itself")
+                if not source:
+                    raise JsonPatchError("Cannot move the root of the document")
+                value = _remove(root, source, undo)
+                op = "add"
+            elif op == "copy":
+                value = _copy(_resolve(root, source))
+                op = "add"
+            else:
+                if not _equal(_resolve(root, tokens), value):
+                    raise JsonPatchError(f"Test failed at {operation['path']!r}")
+                continue
+
+            if not tokens:
+                root = value
+                continue
+            parent = _resolve(root, tokens[:-1])
+            key = tokens[-1]
+            if isinstance(parent, dict):
+                if op == "replace":
+                    if key not in parent:
+                        raise JsonPatchError(f"Path not found: {operation['path']!r}")
+                    undo.append((_SET, parent, key, parent[key]))
+                elif key in parent:
+                    undo.append((_SET, parent, key, parent[key]))
+                else:
+                    undo.append((_DELETE, parent, key, None))
+                parent[key] = value
+            elif isinstance(parent, list):
+                if op == "replace":
+                    index = _index(parent, key, False)
+                    undo.append((_SET, parent, index, parent[index]))
+                    parent[index] = value
+                else:
+                    index = _index(parent, key, True)
+                    parent.insert(index, value)
+                    undo.append((_POP, parent, index, None))
+            else:
+                raise JsonPatchError(f"Path not found: {operation['path']!r}")
+    except JsonPatchError:
+        _undo(undo)
+        raise
+    return root
+
+
+def _remove(root: Any, tokens: Pointer, undo: List[Tuple[int, Any, Any, Any]]) -> Any:
+    if not tokens:
+        raise JsonPatchError("Cannot remove the root of the document")
+    parent = _resolve(root, tokens[:-1])
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise JsonPatchError(f"Path not found: {format_pointer(tokens)!r}")
+        value = parent.pop(key)
+        undo.append((_SET, parent, key, value))
+        return value
+    if isinstance(parent, list):
+        index = _index(parent, key, False)
+        value = parent.pop(index)
+        undo.append((_INSERT, parent, index, value))
+        return value
+    raise JsonPatchError(f"Path not found: {format_pointer(tokens)!r}")
+
+
+def _undo(undo: List[Tuple[int, Any, Any, Any]]) -> None:
+    for action, container, key, value in reversed(undo):
+        if action == _SET:
+            container[key] = value
+        elif action == _DELETE:
+            del container[key]
+        elif action == _INSERT:
+            container.insert(key, value)
+        else:
+            container.pop(key)
+
+
+def make_patch(source: Any, target: Any) -> List[Dict[str, Any]]:
+    """
+    Returns a patch that turns `source` into `target`.
+
+    Objects are compared key by key and arrays index by index, with elements
+    added or removed at the end. Neither document is modified, and the values
+    in the patch are copies.
+    """
+    patch: List[Dict[str, Any]] = []
+    _diff(source, target, [], patch)
+    return patch
+
+
+def _diff(source: Any, target: Any, path: List[str], patch: List[Dict[str, Any]]) -> None:
+    if source is target:
+        return
+    if isinstance(source, dict) and isinstance(target, dict):
+        for key in source:
+            if key not in target:
+                patch.append({"op": "remove", "path": format_pointer(path + [key])})
+        for key, value in target.items():
+            if key not in source:
+                patch.append({"op": "add", "path": format_pointer(path + [key]), "value": _copy(value)})
+            elif not _same(source[key], value):
+                _diff(source[key], value, path + [key], patch)
+    elif isinstance(source, list) and isinstance(target, list):
+        common = min(len(source), len(target))
+        for index in range(common):
+            if not _same(source[index], target[index]):
+                _diff(source[index], target[index], path + [str(index)], patch)
+        # remove from the end, so the indices of the remaining elements hold
+        for index in range(len(source) - 1, common - 1, -1):
+            patch.append({"op": "remove", "path": format_pointer(path + [str(index)])})
+        for index in range(common, len(target)):
+            patch.append({"op": "add", "path": format_pointer(path + ["-"]), "value": _copy(target[index])})
+    elif type(source) is not type(target) or source != target:
+        patch.append({"op": "replace", "path": format_pointer(path), "value": _copy(target)})
+
+
+def _same(source: Any, target: Any) -> bool:
+    """
+    Returns True if two values are known to be equal without diffing them:
+    the same object, or equal scalars of the same type.
+    """
+    # most values of a state are strings and numbers, compared here without
+    # a call to _diff and without building their path
+    return source is target or (type(source) is type(target) and type(source) in _LEAVES and source == target)
+
+
+class _Node:
+    """
+    A node of the path trie used by compact_patch.
+    """
+    __slots__ = ("entries", "children")
+
+    def __init__(self):
+        self.entries: List[int] = []
+        self.children: Dict[str, "_Node"] = {}
+
+
+def compact_patch(*patches: Iterable[Any]) -> List[Dict[str, Any]]:
+    """
+    Merges patches into a single patch with the same effect, dropping
+    operations that later ones overwrite.
+
+    ```python
+    delta = compact_patch(*pending_patches)
+    yield StateDeltaEvent(type=EventType.STATE_DELTA, delta=delta)
+    ```
+
+    An operation is dropped when a later `add`, `replace` or `remove` targets
+    its path or one of its ancestors, and operations below a path that was
+    added or replaced earlier are folded into the added value. Operations that
+    may shift array elements (`add` and `remove` at an array index), `move`,
+    `copy` and `test` are kept in place, and nothing is merged across them in
+    the part of the document they touch. The input patches are not modified.
+    """
+    result: List[Optional[Dict[str, Any]]] = []
+    # indices of the operations in result whose value is a private copy
+    owned = set()
+    # the operations that may still be merged, by path
+    trie = _Node()
+    for patch in patches:
+        for operation in patch:
+            op, tokens, source, _ = _compile(operation)
+            folded = _fold(result, owned, trie, op, tokens, operation)
+            if folded:
+                continue
+            shifts = op in ("add", "remove") and tokens and (tokens[-1].isdigit() or tokens[-1] == "-")
+            if folded is None or shifts or op in ("move", "copy", "test"):
+                _detach(trie, _region(op, tokens))
+                if source is not None:
+                    _detach(trie, _region(op, source))
+                result.append(operation)
+                continue
+
+            node = trie
+            for token in tokens:
+                node = node.children.setdefault(token, _Node())
+            kept = []
+            for index in node.entries:
+                if op == "remove" and result[index]["op"] == "add":
+                    # the path may not have existed before the add
+                    kept.append(index)
+                    continue
+                if op == "replace" and result[index]["op"] == "add":
+                    operation = {"op": "add", "path": operation["path"], "value": operation["value"]}
+                result[index] = None
+            _drop(result, node.children)
+            node.children = {}
+            node.entries = kept + [len(result)]
+            result.append(operation)
+    return [operation for operation in result if operation is not None]
+
+
+def _fold(
+        result: List[Optional[Dict[str, Any]]],
+        owned: set,
+        trie: _Node,
+        op: str,
+        tokens: Pointer,
+        operation: Mapping[str, Any],
+    ) -> Optional[bool]:
+    """
+    Applies an operation to the value of an earlier add or replace of one of
+    its ancestors. Returns whether it was folded, or None if there is such an
+    ancestor but the operation cannot be folded into it.
+    """
+    node = trie
+    for depth, token in enumerate(tokens):
+        if node.entries:
+            index = node.entries[-1]
+            earlier = result[index]
+            if earlier["op"] not in ("add", "replace") or op in ("move", "copy"):
+                return None
+            if index not in owned:
+                earlier = result[index] = {**earlier, "value": deepcopy(earlier["value"])}
+                owned.add(index)
+            try:
+                earlier["value"] = apply_patch(earlier["value"], [{**operation, "path": format_pointer(tokens[depth:])}])
+            except JsonPatchError:
+                return None
+            return True
+        node = node.children.get(token)
+        if node is None:
+            return False
+    return False
+
+
+def _region(op: str, tokens: Pointer) -> Pointer:
+    """
+    Returns the path below which an operation that is not merged may affect
+    the document or depend on it.
+    """
+    if op != "test" and tokens and (tokens[-1].isdigit() or tokens[-1] == "-"):
+        # the elements after an array index shift
+        return tokens[:-1]
+    return tokens
+
+
+def _detach(trie: _Node, region: Pointer) -> None:
+    """
+    Forgets the operations at and below `region` and at its ancestors, so that
+    later operations are neither merged with them nor folded into them.
+    """
+    node = trie
+    for token in region:
+        node.entries = []
+        child = node.children.get(token)
+        if child is None:
+            return
+        parent, node = node, child
+    if region:
+        del parent.children[region[-1]]
+    else:
+        trie.entries = []
+        trie.children = {}
+
+
+def _drop(result: List[Optional[Dict[str, Any]]], children: Dict[str, _Node]) -> None:
+    for child in children.values():
+        for index in child.entries:
+            result[index] = None
+        _drop(result, child.children)
@@ -0,0 +1,325 @@
+"""
+This module contains the StateTracker class, which records the changes made to
+a state document as JSON Patch operations.
+
+Producing a `STATE_DELTA` with `make_patch` takes a copy of the state before
+each update and a diff after it, both proportional to the size of the state.
+The tracker hands out proxies of the state instead. Each change made through a
+proxy is applied to the state and recorded as an operation, so the cost of an
+update is proportional to the size of the change.
+
+Dicts, lists and pydantic models are tracked. Values read from a proxy are
+proxies themselves if they are containers, so nested changes are recorded
+with their full path. Assigning a proxy stores a copy of its container, since
+a JSON document cannot share a value between two paths.
+"""
+
+from collections.abc import MutableMapping, MutableSequence
+from copy import deepcopy
+from typing import Any, Dict, Iterator, List, Optional
+
+from pydantic import BaseModel
+
+from ag_ui.core.events import StateDeltaEvent, StateSnapshotEvent
+from ag_ui.patch.patch import compact_patch, format_pointer
+
+
+class StateTracker:
+    """
+    Records the changes made to a state document through its proxy.
+
+    ```python
+    tracker = StateTracker({"steps": [{"status": "pending"} for _ in range(10)]})
+    yield tracker.snapshot_event()
+
+    for step in tracker.state["steps"]:
+        step["status"] = "completed"
+        yield tracker.delta_event()
+    ```
+
+    Changes made to the document directly, bypassing the proxies, are not
+    recorded; send a snapshot after them.
+    """
+    def __init__(self, document: Any):
+        self.document = document
+        self._operations: List[Dict[str, Any]] = []
+
+    @property
+    def state(self) -> Any:
+        """
+        A proxy of the document that records the changes made through it.
+        """
+        return _wrap(self.document, self, None, None)
+
+    @property
+    def pending(self) -> bool:
+        """
+        Whether changes were recorded since the last delta or snapshot.
+        """
+        return bool(self._operations)
+
+    def patch(self) -> List[Dict[str, Any]]:
+        """
+        Returns the changes recorded since the last call as a compacted patch,
+        and forgets them.
+        """
+        operations, self._operations = self._operations, []
+        return compact_patch(operations)
+
+    def delta_event(self) -> Optional[StateDeltaEvent]:
+        """
+        Returns the changes recorded since the last delta or snapshot as a
+        `StateDeltaEvent`, or None if nothing changed.
+        """
+        delta = self.patch()
+        if not delta:
+            return None
+        return StateDeltaEvent.trusted(delta=delta)
+
+    def snapshot(self) -> Any:
+        """
+        Returns a JSON-compatible copy of the document and forgets the recorded
+        changes, which the snapshot includes.
+        """
+        self._operations = []
+        return _to_json(self.document)
+
+    def snapshot_event(self) -> StateSnapshotEvent:
+        """
+        Returns the document as a `StateSnapshotEvent` and forgets the recorded
+        changes, which the snapshot includes.
+        """
+        return StateSnapshotEvent.trusted(snapshot=self.snapshot())
+
+    def _record(self, proxy: "_Tracked", op: str, key: Any, value: Any = None) -> None:
+        tokens = proxy._tokens()  # pylint: disable=protected-access
+        if tokens is None:
+            # the container is no longer part of the document
+            return
+        if key is not None:
+            tokens.append(key)
+        operation = {"op": op, "path": format_pointer(tokens)}
+        if op != "remove":
+            operation["value"] = _to_json(value)
+        self._operations.append(operation)
+
+
+def _to_json(value: Any) -> Any:
+    """
+    Returns a JSON-compatible copy of a value.
+    """
+    if isinstance(value, dict):
+        return {key: _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, _Tracked):
+        return _to_json(value._data)  # pylint: disable=protected-access
+    return value
+
+
+def _unwrap(value: Any) -> Any:
+    # a container of the document is copied, so that it is not shared by two paths
+    return deepcopy(value._data) if isinstance(value, _Tracked) else value  # pylint: disable=protected-access
+
+
+def _wrap(value: Any, tracker: StateTracker, parent: Optional["_Tracked"], key: Any) -> Any:
+    if isinstance(value, dict):
+        return TrackedDict(value, tracker, parent, key)
+    if isinstance(value, list):
+        return TrackedList(value, tracker, parent, key)
+    if isinstance(value, BaseModel):
+        return TrackedModel(value, tracker, parent, key)
+    return value
+
+
+class _Tracked:
+    """
+    A proxy of a container in a tracked document.
+    """
+    __slots__ = ("_data", "_tracker", "_parent", "_key")
+
+    def __init__(self, data: Any, tracker: StateTracker, parent: Optional["_Tracked"], key: Any):
+        object.__setattr__(self, "_data", data)
+        object.__setattr__(self, "_tracker", tracker)
+        object.__setattr__(self, "_parent", parent)
+        object.__setattr__(self, "_key", key)
+
+    def _tokens(self) -> Optional[List[str]]:
+        """
+        Returns the path of the container in the document, or None if it was
+        removed from the document.
+        """
+        if self._parent is None:
+            return [] if self._data is self._tracker.document else None
+        tokens = self._parent._tokens()
+        if tokens is None:
+            return None
+        container = self._parent._data
+        key = self._key
+        if isinstance(container, list):
+            if not (key < len(container) and container[key] is self._data):
+                # elements were inserted or removed before this one
+                key = next((i for i, item in enumerate(container) if item is self._data), None)
+                if key is None:
+                    return None
+                object.__setattr__(self, "_key", key)
+            tokens.append(str(key))
+        elif isinstance(container, dict):
+            if container.get(key) is not self._data:
+                return None
+            tokens.append(key)
+        else:
+            if getattr(container, key, None) is not self._data:
+                return None
+            tokens.append(key)
+        return tokens
+
+    def __eq__(self, other: Any) -> bool:
+        return self._data == (other._data if isinstance(other, _Tracked) else other)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._data!r})"
+
+    __hash__ = None
+
+
+class TrackedDict(_Tracked, MutableMapping):
+    """
+    A proxy of a dict in a tracked document.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        return _wrap(self._data[key], self._tracker, self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        value = _unwrap(value)
+        op = "replace" if key in self._data else "add"
+        self._data[key] = value
+        self._tracker._record(self, op, key, value)  # pylint: disable=protected-access
+
+    def __delitem__(self, key: str) -> None:
+        del self._data[key]
+        self._tracker._record(self, "remove", key)  # pylint: disable=protected-access
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self._data:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key not in self._data and default:
+            return default[0]
+        value = self._data[key]
+        del self[key]
+        return value
+
+
+class TrackedList(_Tracked, MutableSequence):
+    """
+    A proxy of a list in a tracked document.
+    """
+    __slots__ = ()
+
+    def _index(self, index: int) -> int:
+        length = len(self._data)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("list index out of range")
+        return index
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._data)))]
+        index = self._index(index)
+        return _wrap(self._data[index], self._tracker, self, index)
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        if isinstance(index, slice):
+            # replaced as a whole, since a slice may change the length
+            self._data[index] = [_unwrap(item) for item in value]
+            self._replace_all()
+            return
+        index = self._index(index)
+        value = _unwrap(value)
+        self._data[index] = value
+        self._tracker._record(self, "replace", str(index), value)  # pylint: disable=protected-access
+
+    def __delitem__(self, index: Any) -> None:
+        if isinstance(index, slice):
+            del self._data[index]
+            self._replace_all()
+            return
+        index = self._index(index)
+        del self._data[index]
+        self._tracker._record(self, "remove", str(index))  # pylint: disable=protected-access
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(len(self._data)):
+            yield self[index]
+
+    def insert(self, index: int, value: Any) -> None:
+        length = len(self._data)
+        if index < 0:
+            index = max(0, index + length)
+        index = min(index, length)
+        value = _unwrap(value)
+        self._data.insert(index, value)
+        self._tracker._record(self, "add", "-" if index == length else str(index), value)  # pylint: disable=protected-access
+
+    def append(self, value: Any) -> None:
+        self.insert(len(self._data), value)
+
+    def sort(self, **kwargs: Any) -> None:
+        """
+        Sorts the list in place, recorded as a replacement of the whole list.
+        """
+        self._data.sort(**kwargs)
+        self._replace_all()
+
+    def reverse(self) -> None:
+        self._data.reverse()
+        self._replace_all()
+
+    def pop(self, index: int = -1) -> Any:
+        index = self._index(index)
+        value = self._data[index]
+        del self[index]
+        return value
+
+    def _replace_all(self) -> None:
+        self._tracker._record(self, "replace", None, self._data)  # pylint: disable=protected-access
+
+
+class TrackedModel(_Tracked):
+    """
+    A proxy of a pydantic model in a tracked document. Fields are read and
+    assigned as attributes.
+    """
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        return _wrap(getattr(self._data, name), self._tracker, self, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._data, name, _unwrap(value))
+        # read back the value, which validate_assignment may have converted
+        self._tracker._record(self, "replace", name, getattr(self._data, name))  # pylint: disable=protected-access
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Cannot delete field {name!r} of a model")
@@ -0,0 +1,461 @@
+"""
+This module contains the protocol buffer encoding of events.
+
+The wire format matches `typescript-sdk/packages/proto/src/proto/events.proto`.
+Messages are written directly with the protobuf wire format, so no generated
+code or protobuf runtime is needed.
+"""
+
+import struct
+from typing import Any, Dict, List, Mapping, Tuple
+
+from ag_ui.core.events import (
+    EventType,
+    BaseEvent,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageChunkEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    ToolCallChunkEvent,
+    StateSnapshotEvent,
+    StateDeltaEvent,
+    MessagesSnapshotEvent,
+    RawEvent,
+    CustomEvent,
+    RunStartedEvent,
+    RunFinishedEvent,
+    RunErrorEvent,
+    StepStartedEvent,
+    StepFinishedEvent,
+)
+
+AGUI_MEDIA_TYPE = "application/vnd.ag-ui.event+proto"
+
+# Wire types
+_VARINT = 0
+_FIXED64 = 1
+_LENGTH_DELIMITED = 2
+_FIXED32 = 5
+
+# Field kinds
+_STRING = "string"                    # proto3 string, omitted when empty
+_OPTIONAL_STRING = "optional_string"  # optional string, written whenever set
+_VALUE = "value"                      # google.protobuf.Value
+_MESSAGES = "messages"                # repeated Message
+_PATCH = "patch"                      # repeated JsonPatchOperation
+
+# EventType enum in events.proto
+_EVENT_TYPE_NUMBERS: Dict[EventType, int] = {
+    EventType.TEXT_MESSAGE_START: 0,
+    EventType.TEXT_MESSAGE_CONTENT: 1,
+    EventType.TEXT_MESSAGE_END: 2,
+    EventType.TOOL_CALL_START: 3,
+    EventType.TOOL_CALL_ARGS: 4,
+    EventType.TOOL_CALL_END: 5,
+    EventType.STATE_SNAPSHOT: 6,
+    EventType.STATE_DELTA: 7,
+    EventType.MESSAGES_SNAPSHOT: 8,
+    EventType.RAW: 9,
+    EventType.CUSTOM: 10,
+    EventType.RUN_STARTED: 11,
+    EventType.RUN_FINISHED: 12,
+    EventType.RUN_ERROR: 13,
+    EventType.STEP_STARTED: 14,
+    EventType.STEP_FINISHED: 15,
+}
+
+# JsonPatchOperationType enum in patch.proto
+_PATCH_OP_NUMBERS: Dict[str, int] = {
+    "add": 0,
+    "remove": 1,
+    "replace": 2,
+    "move": 3,
+    "copy": 4,
+    "test": 5,
+}
+_PATCH_OP_NAMES = {number: name for name, number in _PATCH_OP_NUMBERS.items()}
+
+# Event oneof: event type -> (oneof field number, event class, fields)
+# Each field is (camelCase key, field number, kind). Field 1 is always base_event.
+_EVENT_SCHEMAS: Dict[EventType, Tuple[int, type, Tuple[Tuple[str, int, str], ...]]] = {
+    EventType.TEXT_MESSAGE_START: (1, TextMessageStartEvent, (
+        ("messageId", 2, _STRING),
+        ("role", 3, _OPTIONAL_STRING),
+    )),
+    EventType.TEXT_MESSAGE_CONTENT: (2, TextMessageContentEvent, (
+        ("messageId", 2, _STRING),
+        ("delta", 3, _STRING),
+    )),
+    EventType.TEXT_MESSAGE_END: (3, TextMessageEndEvent, (
+        ("messageId", 2, _STRING),
+    )),
+    EventType.TOOL_CALL_START: (4, ToolCallStartEvent, (
+        ("toolCallId", 2, _STRING),
+        ("toolCallName", 3, _STRING),
+        ("parentMessageId", 4, _OPTIONAL_STRING),
+    )),
+    EventType.TOOL_CALL_ARGS: (5, ToolCallArgsEvent, (
+        ("toolCallId", 2, _STRING),
+        ("delta", 3, _STRING),
+    )),
+    EventType.TOOL_CALL_END: (6, ToolCallEndEvent, (
+        ("toolCallId", 2, _STRING),
+    )),
+    EventType.STATE_SNAPSHOT: (7, StateSnapshotEvent, (
+        ("snapshot", 2, _VALUE),
+    )),
+    EventType.STATE_DELTA: (8, StateDeltaEvent, (
+        ("delta", 2, _PATCH),
+    )),
+    EventType.MESSAGES_SNAPSHOT: (9, MessagesSnapshotEvent, (
+        ("messages", 2, _MESSAGES),
+    )),
+    EventType.RAW: (10, RawEvent, (
+        ("event", 2, _VALUE),
+        ("source", 3, _OPTIONAL_STRING),
+    )),
+    EventType.CUSTOM: (11, CustomEvent, (
+        ("name", 2, _STRING),
+        ("value", 3, _VALUE),
+    )),
+    EventType.RUN_STARTED: (12, RunStartedEvent, (
+        ("threadId", 2, _STRING),
+        ("runId", 3, _STRING),
+    )),
+    EventType.RUN_FINISHED: (13, RunFinishedEvent, (
+        ("threadId", 2, _STRING),
+        ("runId", 3, _STRING),
+    )),
+    EventType.RUN_ERROR: (14, RunErrorEvent, (
+        ("code", 2, _OPTIONAL_STRING),
+        ("message", 3, _STRING),
+    )),
+    EventType.STEP_STARTED: (15, StepStartedEvent, (
+        ("stepName", 2, _STRING),
+    )),
+    EventType.STEP_FINISHED: (16, StepFinishedEvent, (
+        ("stepName", 2, _STRING),
+    )),
+    EventType.TEXT_MESSAGE_CHUNK: (17, TextMessageChunkEvent, (
+        ("messageId", 2, _OPTIONAL_STRING),
+        ("role", 3, _OPTIONAL_STRING),
+        ("delta", 4, _OPTIONAL_STRING),
+    )),
+    EventType.TOOL_CALL_CHUNK: (18, ToolCallChunkEvent, (
+        ("toolCallId", 2, _OPTIONAL_STRING),
+        ("toolCallName", 3, _OPTIONAL_STRING),
+        ("parentMessageId", 4, _OPTIONAL_STRING),
+        ("delta", 5, _OPTIONAL_STRING),
+    )),
+}
+_ONEOF_TYPES = {schema[0]: event_type for event_type, schema in _EVENT_SCHEMAS.items()}
+
+# Message and ToolCall in types.proto
+_MESSAGE_FIELDS = (
+    ("id", 1, _STRING),
+    ("role", 2, _STRING),
+    ("content", 3, _OPTIONAL_STRING),
+    ("name", 4, _OPTIONAL_STRING),
+)
+
+
+def encode(event: BaseEvent) -> bytes:
+    """
+    Encodes an event into a protocol buffer `Event` message.
+    """
+    schema = _EVENT_SCHEMAS.get(event.type)
+    if schema is None:
+        raise ValueError(f"Event type {event.type.value} cannot be encoded as protobuf")
+    oneof_field, _, fields = schema
+    data = event.model_dump(mode="json", by_alias=True, exclude_none=True)
+
+    body = bytearray()
+    _write_message(body, 1, _encode_base_event(event.type, data))
+    for key, number, kind in fields:
+        if key in data:
+            _write_field(body, number, kind, data[key])
+        elif kind == _VALUE:
+            # exclude_none drops a null value, but Value fields are required
+            _write_field(body, number, kind, None)
+
+    out = bytearray()
+    _write_message(out, oneof_field, body)
+    return bytes(out)
+
+
+def decode(data: bytes) -> BaseEvent:
+    """
+    Decodes a protocol buffer `Event` message into an event.
+    """
+    for number, wire_type, value in _iter_fields(memoryview(data)):
+        if wire_type == _LENGTH_DELIMITED and number in _ONEOF_TYPES:
+            return _decode_event(_ONEOF_TYPES[number], value)
+    raise ValueError("Invalid event")
+
+
+def _encode_base_event(event_type: EventType, data: Dict[str, Any]) -> bytearray:
+    out = bytearray()
+    # event types without an enum value (the chunk events) are identified by the oneof field
+    type_number = _EVENT_TYPE_NUMBERS.get(event_type, 0)
+    if type_number != 0:
+        _write_tag(out, 1, _VARINT)
+        _write_varint(out, type_number)
+    if "timestamp" in data:
+        _write_tag(out, 2, _VARINT)
+        _write_varint(out, data["timestamp"])
+    if "rawEvent" in data:
+        _write_message(out, 3, _encode_value(data["rawEvent"]))
+    return out
+
+
+def _write_field(out: bytearray, number: int, kind: str, value: Any) -> None:
+    if kind == _STRING:
+        if value != "":
+            _write_string(out, number, value)
+    elif kind == _OPTIONAL_STRING:
+        _write_string(out, number, value)
+    elif kind == _VALUE:
+        _write_message(out, number, _encode_value(value))
+    elif kind == _MESSAGES:
+        for message in value:
+            _write_message(out, number, _encode_message(message))
+    elif kind == _PATCH:
+        for operation in value:
+            _write_message(out, number, _encode_patch_operation(operation))
+
+
+def _encode_message(message: Mapping[str, Any]) -> bytearray:
+    out = bytearray()
+    for key, number, kind in _MESSAGE_FIELDS:
+        if key in message:
+            _write_field(out, number, kind, message[key])
+    for tool_call in message.get("toolCalls") or ():
+        call = bytearray()
+        _write_field(call, 1, _STRING, tool_call["id"])
+        _write_field(call, 2, _STRING, tool_call["type"])
+        function = bytearray()
+        _write_field(function, 1, _STRING, tool_call["function"]["name"])
+        _write_field(function, 2, _STRING, tool_call["function"]["arguments"])
+        _write_message(call, 3, function)
+        _write_message(out, 5, call)
+    if "toolCallId" in message:
+        _write_string(out, 6, message["toolCallId"])
+    return out
+
+
+def _encode_patch_operation(operation: Mapping[str, Any]) -> bytearray:
+    out = bytearray()
+    op = _PATCH_OP_NUMBERS.get(operation["op"])
+    if op is None:
+        raise ValueError(f"Invalid JSON Patch operation: {operation['op']}")
+    if op != 0:
+        _write_tag(out, 1, _VARINT)
+        _write_varint(out, op)
+    _write_field(out, 2, _STRING, operation["path"])
+    if "from" in operation:
+        _write_string(out, 3, operation["from"])
+    if "value" in operation:
+        _write_message(out, 4, _encode_value(operation["value"]))
+    return out
+
+
+def _encode_value(value: Any) -> bytearray:
+    """
+    Encodes a JSON value into a `google.protobuf.Value` message.
+    """
+    out = bytearray()
+    if value is None:
+        _write_tag(out, 1, _VARINT)
+        out.append(0)
+    elif isinstance(value, bool):
+        _write_tag(out, 4, _VARINT)
+        out.append(1 if value else 0)
+    elif isinstance(value, (int, float)):
+        _write_tag(out, 2, _FIXED64)
+        out += struct.pack("<d", value)
+    elif isinstance(value, str):
+        _write_string(out, 3, value)
+    elif isinstance(value, Mapping):
+        struct_value = bytearray()
+        for key, item in value.items():
+            entry = bytearray()
+            _write_field(entry, 1, _STRING, key)
+            _write_message(entry, 2, _encode_value(item))
+            _write_message(struct_value, 1, entry)
+        _write_message(out, 5, struct_value)
+    elif isinstance(value, (list, tuple)):
+        list_value = bytearray()
+        for item in value:
+            _write_message(list_value, 1, _encode_value(item))
+        _write_message(out, 6, list_value)
+    else:
+        raise TypeError(f"Value of type {type(value).__name__} is not JSON serializable")
+    return out
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    value &= 0xFFFFFFFFFFFFFFFF  # negative int64 values use two's complement
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_tag(out: bytearray, number: int, wire_type: int) -> None:
+    _write_varint(out, (number << 3) | wire_type)
+
+
+def _write_string(out: bytearray, number: int, value: str) -> None:
+    _write_message(out, number, value.encode("utf-8"))
+
+
+def _write_message(out: bytearray, number: int, body: bytes) -> None:
+    _write_tag(out, number, _LENGTH_DELIMITED)
+    _write_varint(out, len(body))
+    out += body
+
+
+def _read_varint(data: memoryview, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated varint")
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _iter_fields(data: memoryview):
+    pos = 0
+    end = len(data)
+    while pos < end:
+        tag, pos = _read_varint(data, pos)
+        number, wire_type = tag >> 3, tag & 0x07
+        if wire_type == _VARINT:
+            value, pos = _read_varint(data, pos)
+        elif wire_type == _FIXED64:
+            value, pos = data[pos:pos + 8], pos + 8
+        elif wire_type == _LENGTH_DELIMITED:
+            length, pos = _read_varint(data, pos)
+            value, pos = data[pos:pos + length], pos + length
+        elif wire_type == _FIXED32:
+            value, pos = data[pos:pos + 4], pos + 4
+        else:
+            raise ValueError(f"Unsupported wire type {wire_type}")
+        if pos > end:
+            raise ValueError("Truncated message")
+        yield number, wire_type, value
+
+
+def _decode_event(event_type: EventType, body: memoryview) -> BaseEvent:
+    _, event_class, fields = _EVENT_SCHEMAS[event_type]
+    kinds = {number: (key, kind) for key, number, kind in fields}
+    data: Dict[str, Any] = {"type": event_type}
+    for key, _, kind in fields:
+        if kind == _STRING:
+            data[key] = ""
+        elif kind in (_MESSAGES, _PATCH):
+            data[key] = []
+
+    for number, _, value in _iter_fields(body):
+        if number == 1:
+            for base_number, _, base_value in _iter_fields(value):
+                if base_number == 2:
+                    data["timestamp"] = base_value - (1 << 64) if base_value >> 63 else base_value
+                elif base_number == 3:
+                    data["rawEvent"] = _decode_value(base_value)
+        elif number in kinds:
+            key, kind = kinds[number]
+            if kind in (_STRING, _OPTIONAL_STRING):
+                data[key] = str(value, "utf-8")
+            elif kind == _VALUE:
+                data[key] = _decode_value(value)
+            elif kind == _MESSAGES:
+                data[key].append(_decode_message(value))
+            elif kind == _PATCH:
+                data[key].append(_decode_patch_operation(value))
+
+    return event_class.model_validate(data)
+
+
+def _decode_message(body: memoryview) -> Dict[str, Any]:
+    message: Dict[str, Any] = {"id": "", "role": ""}
+    tool_calls: List[Dict[str, Any]] = []
+    for number, _, value in _iter_fields(body):
+        if number == 5:
+            call: Dict[str, Any] = {"id": "", "type": "", "function": {"name": "", "arguments": ""}}
+            for call_number, _, call_value in _iter_fields(value):
+                if call_number == 1:
+                    call["id"] = str(call_value, "utf-8")
+                elif call_number == 2:
+                    call["type"] = str(call_value, "utf-8")
+                elif call_number == 3:
+                    for function_number, _, function_value in _iter_fields(call_value):
+                        if function_number == 1:
+                            call["function"]["name"] = str(function_value, "utf-8")
+                        elif function_number == 2:
+                            call["function"]["arguments"] = str(function_value, "utf-8")
+            tool_calls.append(call)
+        elif number == 6:
+            message["toolCallId"] = str(value, "utf-8")
+        else:
+            for key, field_number, _ in _MESSAGE_FIELDS:
+                if field_number == number:
+                    message[key] = str(value, "utf-8")
+    # tool calls are optional, so an empty repeated field means no tool calls
+    if tool_calls:
+        message["toolCalls"] = tool_calls
+    return message
+
+
+def _decode_patch_operation(body: memoryview) -> Dict[str, Any]:
+    operation: Dict[str, Any] = {"op": "add", "path": ""}
+    for number, _, value in _iter_fields(body):
+        if number == 1:
+            operation["op"] = _PATCH_OP_NAMES[value]
+        elif number == 2:
+            operation["path"] = str(value, "utf-8")
+        elif number == 3:
+            operation["from"] = str(value, "utf-8")
+        elif number == 4:
+            operation["value"] = _decode_value(value)
+    return operation
+
+
+def _decode_value(body: memoryview) -> Any:
+    """
+    Decodes a `google.protobuf.Value` message into a JSON value.
+    """
+    result: Any = None
+    for number, _, value in _iter_fields(body):
+        if number == 1:
+            result = None
+        elif number == 2:
+            result = struct.unpack("<d", value)[0]
+            # JSON does not distinguish integers from floats, keep integers as int
+            if result.is_integer() and abs(result) <= 2 ** 53:
+                result = int(result)
+        elif number == 3:
+            result = str(value, "utf-8")
+        elif number == 4:
+            result = bool(value)
+        elif number == 5:
+            result = {}
+            for _, _, entry in _iter_fields(value):
+                key, item = "", None
+                for entry_number, _, entry_value in _iter_fields(entry):
+                    if entry_number == 1:
+                        key = str(entry_value, "utf-8")
+                    elif entry_number == 2:
+                        item = _decode_value(entry_value)
+                result[key] = item
+        elif number == 6:
+            result = [_decode_value(item) for _, _, item in _iter_fields(value)]
+    return result
@@ -0,0 +1,7 @@
+"""
+This module contains the event sequence verifier.
+"""
+
+from ag_ui.verify.verify import EventVerifier, VerificationError, verify_events
+
+__all__ = ["EventVerifier", "VerificationError", "verify_events"]
@@ -0,0 +1,310 @@
+"""
+This module contains the EventVerifier class, which checks that a stream of
+events follows the protocol.
+
+It applies the same rules as `verifyEvents` in `@ag-ui/client`: a run starts
+with RUN_STARTED, nothing follows RUN_FINISHED or RUN_ERROR, text messages and
+tool calls are started, continued and ended with matching ids and do not
+interleave, and steps and thinking blocks are started before they end. The
+verifier is an incremental state machine: each event costs a dictionary lookup
+and a few comparisons, and the state is bounded by the open message, tool call,
+thinking block and steps.
+"""
+
+import random
+from typing import AsyncIterable, AsyncIterator, Callable, Dict, Optional, Set
+
+from ag_ui.core.events import BaseEvent, EventType
+
+
+class VerificationError(ValueError):
+    """
+    Raised when an event breaks the protocol.
+    """
+
+
+# the events allowed in each restricted state; any event is allowed otherwise
+_ALLOWED_FIRST = frozenset((EventType.RUN_STARTED, EventType.RUN_ERROR))
+_ALLOWED_FINISHED = frozenset((EventType.RUN_ERROR,))
+_ALLOWED_ERRORED: frozenset = frozenset()
+_ALLOWED_IN_MESSAGE = frozenset((EventType.TEXT_MESSAGE_CONTENT, EventType.TEXT_MESSAGE_END, EventType.RAW))
+_ALLOWED_IN_TOOL_CALL = frozenset((EventType.TOOL_CALL_ARGS, EventType.TOOL_CALL_END, EventType.RAW))
+
+
+class EventVerifier:
+    """
+    Verifies a single run, one event at a time.
+
+    ```python
+    verifier = EventVerifier()
+    for event in events:
+        verifier.verify(event)
+    verifier.close()
+    ```
+    """
+    def __init__(self):
+        self.active_message_id: Optional[str] = None
+        self.active_tool_call_id: Optional[str] = None
+        self.active_steps: Set[str] = set()
+        self.thinking = False
+        self.thinking_message = False
+        self.started = False
+        self.finished = False
+        self.errored = False
+        # the events allowed next, or None if any event is
+        self._allowed: Optional[frozenset] = _ALLOWED_FIRST
+        self._handlers: Dict[EventType, Callable[[BaseEvent], None]] = {
+            EventType.RUN_STARTED: self._run_started,
+            EventType.TEXT_MESSAGE_START: self._text_message_start,
+            EventType.TEXT_MESSAGE_CONTENT: self._text_message_content,
+            EventType.TEXT_MESSAGE_END: self._text_message_end,
+            EventType.TOOL_CALL_START: self._tool_call_start,
+            EventType.TOOL_CALL_ARGS: self._tool_call_args,
+            EventType.TOOL_CALL_END: self._tool_call_end,
+            EventType.STEP_STARTED: self._step_started,
+            EventType.STEP_FINISHED: self._step_finished,
+            EventType.RUN_FINISHED: self._run_finished,
+            EventType.RUN_ERROR: self._run_error,
+            EventType.THINKING_START: self._thinking_start,
+            EventType.THINKING_END: self._thinking_end,
+            EventType.THINKING_TEXT_MESSAGE_START: self._thinking_text_message_start,
+            EventType.THINKING_TEXT_MESSAGE_CONTENT: self._thinking_text_message_content,
+            EventType.THINKING_TEXT_MESSAGE_END: self._thinking_text_message_end,
+        }
+
+    def verify(self, event: BaseEvent) -> None:
+        """
+        Checks the next event of the run. Raises VerificationError if the event
+        is not allowed in the current state.
+        """
+        event_type = event.type
+        allowed = self._allowed
+        if allowed is not None and event_type not in allowed:
+            self._reject(event_type)
+        handler = self._handlers.get(event_type)
+        if handler is not None:
+            handler(event)
+
+    def _reject(self, event_type: EventType) -> None:
+        if self.errored:
+            raise VerificationError(
+                f"Cannot send event type '{event_type.value}': The run has already errored with 'RUN_ERROR'. "
+                "No further events can be sent."
+            )
+        if self.finished:
+            raise VerificationError(
+                f"Cannot send event type '{event_type.value}': The run has already finished with 'RUN_FINISHED'. "
+                "Start a new run with 'RUN_STARTED'."
+            )
+        if self.active_message_id is not None:
+            raise VerificationError(
+                f"Cannot send event type '{event_type.value}' after 'TEXT_MESSAGE_START': "
+                "Send 'TEXT_MESSAGE_END' first."
+            )
+        if self.active_tool_call_id is not None:
+            if event_type == EventType.TOOL_CALL_START:
+                raise VerificationError(
+                    "Cannot send 'TOOL_CALL_START' event: A tool call is already in progress. "
+                    "Complete it with 'TOOL_CALL_END' first."
+                )
+            raise VerificationError(
+                f"Cannot send event type '{event_type.value}' after 'TOOL_CALL_START': "
+                "Send 'TOOL_CALL_END' first."
+            )
+        raise VerificationError("First event must be 'RUN_STARTED'")
+
+    def close(self) -> None:
+        """
+        Checks that the run did not end with an open text message, tool call,
+        thinking block or step. Runs that errored are not checked.
+        """
+        if self.errored:
+            return
+        if self.active_message_id is not None:
+            raise VerificationError(
+                f"Stream ended with text message '{self.active_message_id}' still open: "
+                "Send 'TEXT_MESSAGE_END' first."
+            )
+        if self.active_tool_call_id is not None:
+            raise VerificationError(
+                f"Stream ended with tool call '{self.active_tool_call_id}' still open: "
+                "Send 'TOOL_CALL_END' first."
+            )
+        if self.thinking_message:
+            raise VerificationError(
+                "Stream ended with a thinking message still open: Send 'THINKING_TEXT_MESSAGE_END' first."
+            )
+        if self.thinking:
+            raise VerificationError("Stream ended with a thinking step still open: Send 'THINKING_END' first.")
+        if self.active_steps:
+            raise VerificationError(
+                f"Stream ended while steps are still active: {', '.join(sorted(self.active_steps))}"
+            )
+
+    def _run_started(self, event: BaseEvent) -> None:  # pylint: disable=unused-argument
+        if self.started:
+            raise VerificationError(
+                "Cannot send multiple 'RUN_STARTED' events: A 'RUN_STARTED' event was already sent. "
+                "Each run must have exactly one 'RUN_STARTED' event at the beginning."
+            )
+        self.started = True
+        self._allowed = None
+
+    def _text_message_start(self, event: BaseEvent) -> None:
+        self.active_message_id = event.message_id
+        self._allowed = _ALLOWED_IN_MESSAGE
+
+    def _text_message_content(self, event: BaseEvent) -> None:
+        if self.active_message_id is None:
+            raise VerificationError(
+                "Cannot send 'TEXT_MESSAGE_CONTENT' event: No active text message found. "
+                "Start a text message with 'TEXT_MESSAGE_START' first."
+            )
+        if event.message_id != self.active_message_id:
+            raise VerificationError(
+                f"Cannot send 'TEXT_MESSAGE_CONTENT' event: Message ID mismatch. The ID '{event.message_id}' "
+                f"doesn't match the active message ID '{self.active_message_id}'."
+            )
+
+    def _text_message_end(self, event: BaseEvent) -> None:
+        if self.active_message_id is None:
+            raise VerificationError(
+                "Cannot send 'TEXT_MESSAGE_END' event: No active text message found. "
+                "A 'TEXT_MESSAGE_START' event must be sent first."
+            )
+        if event.message_id != self.active_message_id:
+            raise VerificationError(
+                f"Cannot send 'TEXT_MESSAGE_END' event: Message ID mismatch. The ID '{event.message_id}' "
+                f"doesn't match the active message ID '{self.active_message_id}'."
+            )
+        self.active_message_id = None
+        self._allowed = None
+
+    def _tool_call_start(self, event: BaseEvent) -> None:
+        self.active_tool_call_id = event.tool_call_id
+        self._allowed = _ALLOWED_IN_TOOL_CALL
+
+    def _tool_call_args(self, event: BaseEvent) -> None:
+        if self.active_tool_call_id is None:
+            raise VerificationError(
+                "Cannot send 'TOOL_CALL_ARGS' event: No active tool call found. "
+                "Start a tool call with 'TOOL_CALL_START' first."
+            )
+        if event.tool_call_id != self.active_tool_call_id:
+            raise VerificationError(
+                f"Cannot send 'TOOL_CALL_ARGS' event: Tool call ID mismatch. The ID '{event.tool_call_id}' "
+                f"doesn't match the active tool call ID '{self.active_tool_call_id}'."
+            )
+
+    def _tool_call_end(self, event: BaseEvent) -> None:
+        if self.active_tool_call_id is None:
+            raise VerificationError(
+                "Cannot send 'TOOL_CALL_END' event: No active tool call found. "
+                "A 'TOOL_CALL_START' event must be sent first."
+            )
+        if event.tool_call_id != self.active_tool_call_id:
+            raise VerificationError(
+                f"Cannot send 'TOOL_CALL_END' event: Tool call ID mismatch. The ID '{event.tool_call_id}' "
+                f"doesn't match the active tool call ID '{self.active_tool_call_id}'."
+            )
+        self.active_tool_call_id = None
+        self._allowed = None
+
+    def _step_started(self, event: BaseEvent) -> None:
+        if event.step_name in self.active_steps:
+            raise VerificationError(f"Step \"{event.step_name}\" is already active for 'STEP_STARTED'")
+        self.active_steps.add(event.step_name)
+
+    def _step_finished(self, event: BaseEvent) -> None:
+        if event.step_name not in self.active_steps:
+            raise VerificationError(
+                f"Cannot send 'STEP_FINISHED' for step \"{event.step_name}\" that was not started"
+            )
+        self.active_steps.remove(event.step_name)
+
+    def _run_finished(self, event: BaseEvent) -> None:  # pylint: disable=unused-argument
+        if self.active_steps:
+            raise VerificationError(
+                f"Cannot send 'RUN_FINISHED' while steps are still active: {', '.join(sorted(self.active_steps))}"
+            )
+        self.finished = True
+        self._allowed = _ALLOWED_FINISHED
+
+    def _run_error(self, event: BaseEvent) -> None:  # pylint: disable=unused-argument
+        self.errored = True
+        self._allowed = _ALLOWED_ERRORED
+
+    def _thinking_start(self, event: BaseEvent) -> None:  # pylint: disable=unused-argument
+        if self.thinking:
+            raise VerificationError(
+                "Cannot send 'THINKING_START' event: A thinking step is already in progress. "
+                "End it with 'THINKING_END' first."
+            )
+        self.thinking = True
+
+    def _thinking_end(self, event: BaseEvent) -> None:  # pylint: disable=unused-argument
+        if not self.thinking:
+            raise VerificationError(
+                "Cannot send 'THINKING_END' event: No active thinking step found. "
+                "A 'THINKING_START' event must be sent first."
+            )
+        self.thinking = False
+
+    def _thinking_text_message_start(self, event: BaseEvent) -> None:  # pylint: disable=unused-argument
+        if not self.thinking:
+            raise VerificationError(
+                "Cannot send 'THINKING_TEXT_MESSAGE_START' event: A thinking step is not in progress. "
+                "Create one with 'THINKING_START' first."
+            )
+        if self.thinking_message:
+            raise VerificationError(
+                "Cannot send 'THINKING_TEXT_MESSAGE_START' event: A thinking message is already in progress. "
+                "Complete it with 'THINKING_TEXT_MESSAGE_END' first."
+            )
+        self.thinking_message = True
+
+    def _thinking_text_message_content(self, event: BaseEvent) -> None:  # pylint: disable=unused-argument
+        if not self.thinking_message:
+            raise VerificationError(
+                "Cannot send 'THINKING_TEXT_MESSAGE_CONTENT' event: No active thinking message found. "
+                "Start a message with 'THINKING_TEXT_MESSAGE_START' first."
+            )
+
+    def _thinking_text_message_end(self, event: BaseEvent) -> None:  # pylint: disable=unused-argument
+        if not self.thinking_message:
+            raise VerificationError(
+                "Cannot send 'THINKING_TEXT_MESSAGE_END' event: No active thinking message found. "
+                "A 'THINKING_TEXT_MESSAGE_START' event must be sent first."
+            )
+        self.thinking_message = False
+
+
+async def verify_events(
+        events: AsyncIterable[BaseEvent],
+        sample_rate: float = 1.0,
+    ) -> AsyncIterator[BaseEvent]:
+    """
+    Passes events through, raising VerificationError at the first event that
+    breaks the protocol or if the stream ends with an open message, tool call,
+    thinking block or step.
+
+    With a `sample_rate` below 1, only that fraction of streams is verified and
+    the others are passed through untouched, so verification can stay on in
+    production at a fraction of its cost.
+
+    ```python
+    async for event in verify_events(send_events(), sample_rate=0.1):
+        yield encoder.encode(event)
+    ```
+    """
+    if sample_rate < 1.0 and random.random() >= sample_rate:
+        async for event in events:
+            yield event
+        return
+
+    verifier = EventVerifier()
+    verify = verifier.verify
+    async for event in events:
+        verify(event)
+        yield event
+    verifier.close()
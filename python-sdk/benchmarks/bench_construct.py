@@ -0,0 +1,69 @@
+"""
+Measures the cost of constructing token events with validation and with the
+trusted construction path.
+
+    python benchmarks/bench_construct.py
+"""
+
+import timeit
+
+from ag_ui.core.events import (
+    EventType,
+    TextMessageContentEvent,
+    TextMessageChunkEvent,
+    ToolCallArgsEvent,
+)
+
+MESSAGE_ID = "3f2a9c1e-5b7d-4e8a-9c2f-1a2b3c4d5e6f"
+TOOL_CALL_ID = "call_8d1b7f0c2e4a4f6b9a3c5d7e"
+
+CASES = [
+    (
+        "TextMessageContentEvent",
+        lambda: TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id=MESSAGE_ID, delta=" token"),
+        lambda: TextMessageContentEvent.model_construct(
+            type=EventType.TEXT_MESSAGE_CONTENT, message_id=MESSAGE_ID, delta=" token"
+        ),
+        lambda: TextMessageContentEvent.trusted(message_id=MESSAGE_ID, delta=" token"),
+    ),
+    (
+        "TextMessageChunkEvent",
+        lambda: TextMessageChunkEvent(
+            type=EventType.TEXT_MESSAGE_CHUNK, message_id=MESSAGE_ID, role="assistant", delta=" token"
+        ),
+        lambda: TextMessageChunkEvent.model_construct(
+            type=EventType.TEXT_MESSAGE_CHUNK, message_id=MESSAGE_ID, role="assistant", delta=" token"
+        ),
+        lambda: TextMessageChunkEvent.trusted(message_id=MESSAGE_ID, role="assistant", delta=" token"),
+    ),
+    (
+        "ToolCallArgsEvent",
+        lambda: ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id=TOOL_CALL_ID, delta='{"a"'),
+        lambda: ToolCallArgsEvent.model_construct(
+            type=EventType.TOOL_CALL_ARGS, tool_call_id=TOOL_CALL_ID, delta='{"a"'
+        ),
+        lambda: ToolCallArgsEvent.trusted(tool_call_id=TOOL_CALL_ID, delta='{"a"'),
+    ),
+]
+
+
+def measure(construct, number=100_000, repeat=7):
+    """Returns the best time per call in microseconds."""
+    return min(timeit.repeat(construct, number=number, repeat=repeat)) / number * 1e6
+
+
+def main():
+    """Runs the benchmark."""
+    print(f"{'event':<26}{'validated':>12}{'model_construct':>17}{'trusted':>10}{'speedup':>10}")
+    for name, validated, constructed, trusted in CASES:
+        validated_time = measure(validated)
+        constructed_time = measure(constructed)
+        trusted_time = measure(trusted)
+        print(
+            f"{name:<26}{validated_time:>10.2f}us{constructed_time:>15.2f}us{trusted_time:>8.2f}us"
+            f"{validated_time / trusted_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Measures the throughput of EventDecoder on a recorded run.
+
+The run mirrors a typical agent response: a few hundred token deltas, a tool
+call streamed in argument chunks, state snapshots and deltas, and a messages
+snapshot. It is encoded once as SSE and as protobuf, then fed to the decoder
+in chunks of different sizes, as a socket would deliver it.
+
+    python benchmarks/bench_decoder.py
+"""
+
+import json
+import time
+
+from ag_ui.core.types import UserMessage, AssistantMessage
+from ag_ui.core.events import (
+    EventType,
+    RunStartedEvent,
+    RunFinishedEvent,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    StateSnapshotEvent,
+    StateDeltaEvent,
+    MessagesSnapshotEvent,
+)
+from ag_ui.encoder import EventEncoder, AGUI_MEDIA_TYPE
+from ag_ui.decoder import EVENT_ADAPTER, EventDecoder
+
+MESSAGE_ID = "3f2a9c1e-5b7d-4e8a-9c2f-1a2b3c4d5e6f"
+TOOL_CALL_ID = "call_8d1b7f0c2e4a4f6b9a3c5d7e"
+
+
+def recorded_run():
+    """Builds the events of the recorded run."""
+    events = [
+        RunStartedEvent(type=EventType.RUN_STARTED, thread_id="thread_1", run_id="run_1"),
+        TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id=MESSAGE_ID, role="assistant"),
+    ]
+    events += [
+        TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id=MESSAGE_ID, delta=f" token{i}")
+        for i in range(500)
+    ]
+    events.append(TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id=MESSAGE_ID))
+    events.append(ToolCallStartEvent(
+        type=EventType.TOOL_CALL_START, tool_call_id=TOOL_CALL_ID, tool_call_name="generate_recipe"
+    ))
+    arguments = json.dumps({"recipe": {"title": "Soup", "ingredients": [{"name": f"item {i}"} for i in range(40)]}})
+    events += [
+        ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id=TOOL_CALL_ID, delta=arguments[i:i + 8])
+        for i in range(0, len(arguments), 8)
+    ]
+    events.append(ToolCallEndEvent(type=EventType.TOOL_CALL_END, tool_call_id=TOOL_CALL_ID))
+    state = {"steps": [{"description": f"Step {i}", "status": "pending"} for i in range(20)]}
+    events.append(StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=state))
+    events += [
+        StateDeltaEvent(
+            type=EventType.STATE_DELTA,
+            delta=[{"op": "replace", "path": f"/steps/{i}/status", "value": "completed"}]
+        )
+        for i in range(20)
+    ]
+    messages = [UserMessage(id=f"user_{i}", role="user", content="Hello " * 20) for i in range(10)]
+    messages += [AssistantMessage(id=f"assistant_{i}", role="assistant", content="Hi " * 50) for i in range(10)]
+    events.append(MessagesSnapshotEvent(type=EventType.MESSAGES_SNAPSHOT, messages=messages))
+    events.append(RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="thread_1", run_id="run_1"))
+    return events
+
+
+def split(stream, chunk_size):
+    """Splits a stream into chunks."""
+    return [stream[i:i + chunk_size] for i in range(0, len(stream), chunk_size)]
+
+
+def decode_with_decoder(chunks, content_type):
+    """Decodes chunks with EventDecoder."""
+    decoder = EventDecoder(content_type)
+    count = 0
+    for chunk in chunks:
+        count += len(decoder.feed(chunk))
+    return count + len(decoder.close())
+
+
+def decode_naively(chunks, _content_type):
+    """Decodes SSE like the TS client: text buffer, split and json.loads."""
+    buffer = ""
+    count = 0
+    for chunk in chunks:
+        buffer += chunk.decode("utf-8")
+        *complete, buffer = buffer.split("\n\n")
+        for event in complete:
+            lines = [line[6:] for line in event.split("\n") if line.startswith("data: ")]
+            EVENT_ADAPTER.validate_python(json.loads("\n".join(lines)))
+            count += 1
+    return count
+
+
+def measure(decode, stream, content_type, chunk_size, repeat=20):
+    """Returns the best throughput in MB/s and events/s."""
+    chunks = split(stream, chunk_size)
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = decode(chunks, content_type)
+        best = min(best, time.perf_counter() - start)
+    return len(stream) / best / 1e6, count / best
+
+
+def main():
+    """Runs the benchmark."""
+    events = recorded_run()
+    sse = EventEncoder().encode_many(events)
+    proto = EventEncoder(accept=AGUI_MEDIA_TYPE).encode_many(events)
+    print(f"{len(events)} events, {len(sse)} bytes as SSE, {len(proto)} bytes as protobuf\n")
+    print(f"{'decoder':<28}{'chunk':>8}{'MB/s':>10}{'events/s':>12}")
+    for chunk_size in (64, 1024, 16384):
+        for name, decode, stream, content_type in (
+            ("naive SSE (text split)", decode_naively, sse, None),
+            ("EventDecoder SSE", decode_with_decoder, sse, None),
+            ("EventDecoder protobuf", decode_with_decoder, proto, AGUI_MEDIA_TYPE),
+        ):
+            mb_per_s, events_per_s = measure(decode, stream, content_type, chunk_size)
+            print(f"{name:<28}{chunk_size:>8}{mb_per_s:>10.1f}{events_per_s:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
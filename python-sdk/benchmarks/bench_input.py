@@ -0,0 +1,85 @@
+"""
+Measures the time until the ids of a large run request are available, with
+RunAgentInput and with LazyRunAgentInput.
+
+The request holds a thread of 500 messages with tool calls and 40 tools with
+JSON schemas, as a long CopilotKit session would send.
+
+    python benchmarks/bench_input.py
+"""
+
+import json
+import time
+
+from ag_ui.core import LazyRunAgentInput, RunAgentInput
+
+MESSAGES = 500
+TOOLS = 40
+
+
+def request_body():
+    """Builds the JSON body of the request."""
+    messages = []
+    for i in range(MESSAGES // 4):
+        messages += [
+            {"id": f"u{i}", "role": "user", "content": "Plan a trip to Berlin " * 10},
+            {
+                "id": f"a{i}",
+                "role": "assistant",
+                "toolCalls": [{
+                    "id": f"call_{i}",
+                    "type": "function",
+                    "function": {"name": "search", "arguments": json.dumps({"query": "hotels in Berlin"})},
+                }],
+            },
+            {"id": f"t{i}", "role": "tool", "content": "Hotel list " * 20, "toolCallId": f"call_{i}"},
+            {"id": f"r{i}", "role": "assistant", "content": "Here are some options " * 20},
+        ]
+    tools = [
+        {
+            "name": f"tool_{i}",
+            "description": "A tool with a large schema " * 5,
+            "parameters": {
+                "type": "object",
+                "properties": {f"field_{j}": {"type": "string", "description": "A field"} for j in range(30)},
+            },
+        }
+        for i in range(TOOLS)
+    ]
+    return json.dumps({
+        "threadId": "thread_1",
+        "runId": "run_1",
+        "state": {},
+        "messages": messages,
+        "tools": tools,
+        "context": [],
+        "forwardedProps": {},
+    })
+
+
+def measure(run, repeat=20):
+    """Returns the best time of run in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Runs the benchmark."""
+    body = request_body()
+    print(f"{MESSAGES} messages, {TOOLS} tools, {len(body) / 1024:.0f}KB\n")
+    print(f"{'until the ids are available':<40}{'ms':>8}")
+    cases = [
+        ("RunAgentInput.model_validate_json", lambda: RunAgentInput.model_validate_json(body)),
+        ("LazyRunAgentInput.from_json", lambda: LazyRunAgentInput.from_json(body)),
+        ("LazyRunAgentInput, then validate()", lambda: LazyRunAgentInput.from_json(body).validate()),
+    ]
+    for name, run in cases:
+        print(f"{name:<40}{measure(run) * 1e3:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
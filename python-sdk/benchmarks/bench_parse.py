@@ -0,0 +1,63 @@
+"""
+Measures parsing logged events with the precompiled event adapter, against
+the naive path of decoding each line to a dict and constructing its class.
+
+The log holds the events of the recorded run of bench_decoder.py, one JSON
+event per line, as an analytics job would replay them.
+
+    python benchmarks/bench_parse.py
+"""
+
+import json
+import time
+
+from bench_decoder import recorded_run
+
+from ag_ui.core import events
+from ag_ui.core.events import BaseEvent, EventType
+from ag_ui.decoder import parse_event, parse_many
+
+REPEAT = 20
+
+EVENT_CLASSES = {
+    cls.model_fields["type"].annotation.__args__[0]: cls
+    for cls in vars(events).values()
+    if isinstance(cls, type) and issubclass(cls, BaseEvent) and cls is not BaseEvent
+}
+
+
+def parse_naively(lines):
+    """Decodes each line to a dict and constructs the class of its type."""
+    parsed = []
+    for line in lines:
+        data = json.loads(line)
+        parsed.append(EVENT_CLASSES[EventType(data["type"])](**data))
+    return parsed
+
+
+def measure(parse, lines):
+    """Returns the best time per event of parse in microseconds."""
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        parse(lines)
+        best = min(best, time.perf_counter() - start)
+    return best / len(lines) * 1e6
+
+
+def main():
+    """Runs the benchmark."""
+    lines = [event.model_dump_json(by_alias=True, exclude_none=True).encode() for event in recorded_run()]
+    assert parse_many(lines) == parse_naively(lines)
+    print(f"{len(lines)} events, {sum(len(line) for line in lines)} bytes\n")
+    print(f"{'parser':<36}{'us/event':>10}")
+    for name, parse in (
+        ("json.loads + class(**data)", parse_naively),
+        ("parse_event per line", lambda lines: [parse_event(line) for line in lines]),
+        ("parse_many", parse_many),
+    ):
+        print(f"{name:<36}{measure(parse, lines):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
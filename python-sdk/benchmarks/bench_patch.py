@@ -0,0 +1,156 @@
+"""
+Measures applying and producing state deltas on a large shared state.
+
+The state holds 1000 steps. Each tick marks one step completed and updates a
+progress counter, as an agent streaming its plan would. Patches are applied
+with ag_ui.patch and, if it is installed, the `jsonpatch` package, which the
+examples used before. Producing the delta of a tick with a StateTracker is
+compared with a deepcopy of the state and make_patch, and the bytes a
+StateEmitter sends for a snapshot per tick with the bytes of the snapshots.
+
+    python benchmarks/bench_patch.py
+"""
+
+import copy
+import time
+
+from ag_ui.core import EventType, StateSnapshotEvent
+
+from ag_ui.encoder import EventEncoder
+from ag_ui.patch import StateEmitter, StateTracker, apply_patch, compact_patch, make_patch
+
+try:
+    import jsonpatch
+except ImportError:  # pragma: no cover
+    jsonpatch = None
+
+STEPS = 1000
+
+
+def initial_state():
+    """Builds the state."""
+    return {
+        "progress": 0,
+        "steps": [{"description": f"Step {i}", "status": "pending", "notes": []} for i in range(STEPS)],
+    }
+
+
+def tick_patches():
+    """Builds the patch of each tick."""
+    return [
+        [
+            {"op": "replace", "path": f"/steps/{i}/status", "value": "completed"},
+            {"op": "add", "path": f"/steps/{i}/notes/-", "value": {"text": "done"}},
+            {"op": "replace", "path": "/progress", "value": i + 1},
+        ]
+        for i in range(STEPS)
+    ]
+
+
+def measure(run, repeat=5):
+    """Returns the best time of run in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Runs the benchmark."""
+    patches = tick_patches()
+    print(f"{STEPS} steps, {len(patches)} patches of {len(patches[0])} operations\n")
+    print(f"{'apply':<36}{'us/patch':>10}")
+
+    def apply_in_place():
+        state = initial_state()
+        for patch in patches:
+            state = apply_patch(state, patch)
+
+    candidates = [("ag_ui.patch.apply_patch", apply_in_place)]
+    if jsonpatch is not None:
+        def apply_jsonpatch_in_place():
+            state = initial_state()
+            for patch in patches:
+                state = jsonpatch.apply_patch(state, patch, in_place=True)
+
+        def apply_jsonpatch_copy():
+            state = initial_state()
+            for patch in patches[:100]:
+                state = jsonpatch.apply_patch(state, patch)
+
+        candidates += [
+            ("jsonpatch.apply_patch in_place", apply_jsonpatch_in_place),
+            ("jsonpatch.apply_patch", apply_jsonpatch_copy),
+        ]
+    for name, run in candidates:
+        count = 100 if name == "jsonpatch.apply_patch" else len(patches)
+        print(f"{name:<36}{measure(run) / count * 1e6:>10.1f}")
+
+    print(f"\n{'make_patch (one tick)':<36}{'us/patch':>10}")
+    previous = initial_state()
+    state = apply_patch(copy.deepcopy(previous), patches[0])
+    makers = [("ag_ui.patch.make_patch", make_patch)]
+    if jsonpatch is not None:
+        makers.append(("jsonpatch.make_patch", jsonpatch.make_patch))
+    for name, make in makers:
+        print(f"{name:<36}{measure(lambda make=make: [make(previous, state) for _ in range(20)]) / 20 * 1e6:>10.1f}")
+
+    print(f"\n{'produce a tick delta':<36}{'us/tick':>10}")
+
+    def produce_with_diff():
+        state = initial_state()
+        previous = copy.deepcopy(state)
+        for i in range(20):
+            state["steps"][i]["status"] = "completed"
+            state["steps"][i]["notes"].append({"text": "done"})
+            state["progress"] = i + 1
+            make_patch(previous, state)
+            previous = copy.deepcopy(state)
+
+    def produce_with_tracker():
+        tracker = StateTracker(initial_state())
+        state = tracker.state
+        for i in range(20):
+            step = state["steps"][i]
+            step["status"] = "completed"
+            step["notes"].append({"text": "done"})
+            state["progress"] = i + 1
+            tracker.patch()
+
+    # both include building the state once
+    for name, run in [("deepcopy + make_patch", produce_with_diff), ("StateTracker", produce_with_tracker)]:
+        print(f"{name:<36}{measure(run) / 20 * 1e6:>10.1f}")
+
+    encoder = EventEncoder()
+    emitter = StateEmitter()
+    state = initial_state()
+    snapshot_bytes = emitted_bytes = 0
+    for patch in patches[:100]:
+        state = apply_patch(state, patch)
+        snapshot_bytes += len(encoder.encode_bytes(StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=state)))
+        emitted_bytes += len(encoder.encode_bytes(emitter.update(state)))
+
+    def emit_ticks():
+        state = initial_state()
+        emitter = StateEmitter()
+        for patch in patches[:20]:
+            emitter.update(apply_patch(state, patch))
+
+    print(
+        f"\nStateEmitter: {emitted_bytes / 100:.0f} bytes/tick instead of {snapshot_bytes / 100:.0f} "
+        f"for snapshots, {measure(emit_ticks) / 20 * 1e6:.0f}us/tick"
+    )
+
+    window = patches[:50]
+    compacted = compact_patch(*window)
+    elapsed = measure(lambda: compact_patch(*window))
+    print(
+        f"\ncompact_patch: {sum(len(patch) for patch in window)} operations in 50 patches "
+        f"-> {len(compacted)} operations in {elapsed * 1e6:.0f}us"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Measures the memory held by the message history of a thread as pydantic
+messages and as a MessageStore, and the cost of converting between them.
+
+The thread holds 200 messages: user questions, assistant answers, tool calls
+and tool results, as a long CopilotKit session would.
+
+    python benchmarks/bench_store.py
+"""
+
+import time
+import tracemalloc
+
+from ag_ui.core import (
+    AssistantMessage,
+    FunctionCall,
+    MessageStore,
+    RunAgentInput,
+    ToolCall,
+    ToolMessage,
+    UserMessage,
+)
+
+MESSAGES = 200
+THREADS = 100
+
+
+def thread_messages(thread):
+    """Builds the messages of a thread, as validated from a request."""
+    messages = []
+    for i in range(MESSAGES // 4):
+        messages += [
+            UserMessage(id=f"{thread}-u{i}", role="user", content=f"Question {i}"),
+            AssistantMessage(
+                id=f"{thread}-a{i}",
+                role="assistant",
+                tool_calls=[ToolCall(
+                    id=f"{thread}-call{i}",
+                    type="function",
+                    function=FunctionCall(name="search", arguments='{"query": "hotels"}'),
+                )],
+            ),
+            ToolMessage(id=f"{thread}-t{i}", role="tool", content="Hotel list", tool_call_id=f"{thread}-call{i}"),
+            AssistantMessage(id=f"{thread}-r{i}", role="assistant", content=f"Answer {i}"),
+        ]
+    # validate a request body, so strings are not shared with the literals above
+    body = RunAgentInput(
+        thread_id="t", run_id="r", state={}, messages=messages, tools=[], context=[], forwarded_props={}
+    ).model_dump_json(by_alias=True)
+    return RunAgentInput.model_validate_json(body).messages
+
+
+def held(build):
+    """Returns the bytes held by what build returns, and the result."""
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+
+def main():
+    """Runs the benchmark."""
+    print(f"{THREADS} threads of {MESSAGES} messages\n")
+    models_size, threads = held(lambda: [thread_messages(thread) for thread in range(THREADS)])
+    store_size, stores = held(lambda: [MessageStore(thread_messages(thread)) for thread in range(THREADS)])
+    print(f"{'held memory':<32}{'KB/thread':>10}")
+    print(f"{'list of Message':<32}{models_size / THREADS / 1024:>10.1f}")
+    print(f"{'MessageStore':<32}{store_size / THREADS / 1024:>10.1f}")
+
+    print(f"\n{'conversion':<32}{'us/message':>10}")
+    start = time.perf_counter()
+    for messages in threads:
+        MessageStore(messages)
+    print(f"{'MessageStore(messages)':<32}{(time.perf_counter() - start) / THREADS / MESSAGES * 1e6:>10.2f}")
+    start = time.perf_counter()
+    for store in stores:
+        store.to_messages()
+    print(f"{'store.to_messages()':<32}{(time.perf_counter() - start) / THREADS / MESSAGES * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Measures the per-event overhead of verifying a stream.
+
+A run of token deltas, a tool call and a few steps is iterated through an
+async generator as a server would, plainly and wrapped in `verify_events` at
+different sample rates, and verified directly with `EventVerifier.verify`.
+
+    python benchmarks/bench_verify.py
+"""
+
+import asyncio
+import time
+
+from ag_ui.core.events import (
+    EventType,
+    RunStartedEvent,
+    RunFinishedEvent,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    StepStartedEvent,
+    StepFinishedEvent,
+)
+from ag_ui.verify import EventVerifier, verify_events
+
+
+def recorded_run():
+    """Builds the events of the recorded run."""
+    events = [RunStartedEvent(type=EventType.RUN_STARTED, thread_id="thread_1", run_id="run_1")]
+    for i in range(10):
+        events.append(StepStartedEvent(type=EventType.STEP_STARTED, step_name=f"step_{i}"))
+        events.append(TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id=f"m{i}", role="assistant"))
+        events += [
+            TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id=f"m{i}", delta=f" token{j}")
+            for j in range(100)
+        ]
+        events.append(TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id=f"m{i}"))
+        events.append(ToolCallStartEvent(type=EventType.TOOL_CALL_START, tool_call_id=f"c{i}", tool_call_name="f"))
+        events += [
+            ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id=f"c{i}", delta='{"a":')
+            for _ in range(20)
+        ]
+        events.append(ToolCallEndEvent(type=EventType.TOOL_CALL_END, tool_call_id=f"c{i}"))
+        events.append(StepFinishedEvent(type=EventType.STEP_FINISHED, step_name=f"step_{i}"))
+    events.append(RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="thread_1", run_id="run_1"))
+    return events
+
+
+async def produce(events):
+    """Yields the events like an agent."""
+    for event in events:
+        yield event
+
+
+async def consume(stream):
+    """Consumes a stream like a server."""
+    count = 0
+    async for _ in stream:
+        count += 1
+    return count
+
+
+def measure_async(make_stream, events, repeat=20):
+    """Returns the best time per event in nanoseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        asyncio.run(consume(make_stream(events)))
+        best = min(best, time.perf_counter() - start)
+    return best / len(events) * 1e9
+
+
+def measure_direct(events, repeat=20):
+    """Returns the best time per event of EventVerifier.verify in nanoseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        verifier = EventVerifier()
+        verify = verifier.verify
+        for event in events:
+            verify(event)
+        verifier.close()
+        best = min(best, time.perf_counter() - start)
+    return best / len(events) * 1e9
+
+
+def main():
+    """Runs the benchmark."""
+    events = recorded_run()
+    print(f"{len(events)} events\n")
+    baseline = measure_async(produce, events)
+    print(f"{'stream':<32}{'ns/event':>10}{'overhead':>10}")
+    print(f"{'plain':<32}{baseline:>10.0f}{'':>10}")
+    for sample_rate in (1.0, 0.1):
+        per_event = measure_async(lambda e, rate=sample_rate: verify_events(produce(e), rate), events)
+        print(f"{f'verify_events sample_rate={sample_rate}':<32}{per_event:>10.0f}{per_event - baseline:>10.0f}")
+    print(f"{'EventVerifier.verify':<32}{measure_direct(events):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import unittest
+
+from ag_ui.core.types import AssistantMessage, UserMessage, ToolMessage
+from ag_ui.core.events import (
+    EventType,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageChunkEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    ToolCallResultEvent,
+    StateSnapshotEvent,
+    StateDeltaEvent,
+    MessagesSnapshotEvent,
+    CustomEvent,
+    StepFinishedEvent,
+)
+from ag_ui.apply import EventApplier, apply_events
+from ag_ui.patch import JsonPatchError
+
+
+def text_message(message_id, *deltas):
+    """Create the events of a text message"""
+    return [
+        TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id=message_id, role="assistant"),
+        *(
+            TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id=message_id, delta=delta)
+            for delta in deltas
+        ),
+        TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id=message_id),
+    ]
+
+
+def tool_call(tool_call_id, name, *deltas, parent_message_id=None):
+    """Create the events of a tool call"""
+    return [
+        ToolCallStartEvent(
+            type=EventType.TOOL_CALL_START,
+            tool_call_id=tool_call_id,
+            tool_call_name=name,
+            parent_message_id=parent_message_id,
+        ),
+        *(ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id=tool_call_id, delta=delta) for delta in deltas),
+        ToolCallEndEvent(type=EventType.TOOL_CALL_END, tool_call_id=tool_call_id),
+    ]
+
+
+def apply(applier, events):
+    """Apply a list of events"""
+    for event in events:
+        applier.apply(event)
+    return applier
+
+
+async def agen(events):
+    """Yield events asynchronously"""
+    for event in events:
+        yield event
+
+
+class TestEventApplierMessages(unittest.TestCase):
+    """Test suite for the messages of EventApplier"""
+
+    def test_text_message(self):
+        """Test that text messages are appended with their content"""
+        user = UserMessage(id="u", role="user", content="Hi")
+        applier = apply(EventApplier(messages=[user]), text_message("m", "Hel", "lo", "!"))
+        self.assertEqual(applier.messages, [
+            user, AssistantMessage(id="m", role="assistant", content="Hello!")
+        ])
+
+    def test_read_while_streaming(self):
+        """Test that the messages are current while a message is streaming"""
+        applier = EventApplier()
+        events = text_message("m", "a", "b", "c")
+        apply(applier, events[:2])
+        self.assertEqual(applier.messages[-1].content, "a")
+        apply(applier, events[2:])
+        self.assertEqual(applier.messages[-1].content, "abc")
+
+    def test_tool_calls(self):
+        """Test that tool calls attach to their parent message or a new one"""
+        applier = apply(EventApplier(), [
+            *text_message("m", "Let me check"),
+            *tool_call("c1", "search", '{"q":', '"x"}', parent_message_id="m"),
+            *tool_call("c2", "lookup", "{}"),
+            ToolCallResultEvent(type=EventType.TOOL_CALL_RESULT, message_id="r", tool_call_id="c2", content="ok"),
+        ])
+        messages = applier.messages
+        self.assertEqual(len(messages), 3)
+        self.assertEqual(messages[0].content, "Let me check")
+        self.assertEqual(messages[0].tool_calls[0].function.name, "search")
+        self.assertEqual(messages[0].tool_calls[0].function.arguments, '{"q":"x"}')
+        self.assertEqual(messages[1].id, "c2")
+        self.assertEqual(messages[1].tool_calls[0].function.arguments, "{}")
+        self.assertEqual(messages[2], ToolMessage(id="r", role="tool", content="ok", tool_call_id="c2"))
+
+    def test_messages_snapshot(self):
+        """Test that a messages snapshot replaces the messages without being modified"""
+        snapshot = MessagesSnapshotEvent(
+            type=EventType.MESSAGES_SNAPSHOT,
+            messages=[AssistantMessage(id="a", role="assistant", content="Hi")],
+        )
+        applier = apply(EventApplier(), [*text_message("m", "x", "y"), snapshot])
+        apply(applier, [TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="a", delta="!")])
+        self.assertEqual([message.content for message in applier.messages], ["Hi!"])
+        self.assertEqual(snapshot.messages[0].content, "Hi")
+
+    def test_chunks_rejected(self):
+        """Test that chunk events must be expanded first"""
+        with self.assertRaisesRegex(ValueError, "must be transformed"):
+            EventApplier().apply(TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, message_id="m"))
+
+    def test_predict_state(self):
+        """Test that tool arguments are predicted into the state"""
+        applier = apply(EventApplier(state={"other": 1}), [
+            CustomEvent(
+                type=EventType.CUSTOM,
+                name="PredictState",
+                value=[{"state_key": "recipe", "tool": "write", "tool_argument": "recipe"}],
+            ),
+            *tool_call("c", "write", '{"recipe": {"title": "So', 'up"}}')[:2],
+        ])
+        self.assertEqual(applier.state, {"other": 1, "recipe": {"title": "So"}})
+        apply(applier, tool_call("c", "write", "", 'up"}}')[2:])
+        self.assertEqual(applier.state, {"other": 1, "recipe": {"title": "Soup"}})
+        apply(applier, [StepFinishedEvent(type=EventType.STEP_FINISHED, step_name="s")])
+        self.assertIsNone(applier.predict_state)
+
+
+class TestEventApplierState(unittest.TestCase):
+    """Test suite for the state of EventApplier"""
+
+    def test_snapshot_and_delta(self):
+        """Test that deltas are applied in place to a copy of the snapshot"""
+        snapshot = StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"steps": [{"status": "pending"}]})
+        applier = apply(EventApplier(), [
+            snapshot,
+            StateDeltaEvent(type=EventType.STATE_DELTA, delta=[
+                {"op": "replace", "path": "/steps/0/status", "value": "done"},
+                {"op": "add", "path": "/steps/-", "value": {"status": "pending"}},
+            ]),
+        ])
+        self.assertEqual(applier.state, {"steps": [{"status": "done"}, {"status": "pending"}]})
+        self.assertEqual(snapshot.snapshot, {"steps": [{"status": "pending"}]})
+
+    def test_failed_delta(self):
+        """Test that a failed delta leaves the state unchanged"""
+        state = {"a": 1, "list": [1, 2]}
+        applier = EventApplier(state=state)
+        with self.assertRaises(JsonPatchError):
+            applier.apply(StateDeltaEvent(type=EventType.STATE_DELTA, delta=[
+                {"op": "replace", "path": "/a", "value": 2},
+                {"op": "remove", "path": "/list/0"},
+                {"op": "add", "path": "/b", "value": 3},
+                {"op": "test", "path": "/a", "value": 1},
+            ]))
+        self.assertIs(applier.state, state)
+        self.assertEqual(state, {"a": 1, "list": [1, 2]})
+
+
+class TestApplyEvents(unittest.IsolatedAsyncioTestCase):
+    """Test suite for apply_events"""
+
+    async def test_passes_events_through(self):
+        """Test that events are applied and passed through"""
+        applier = EventApplier()
+        events = text_message("m", "Hi")
+        result = [event async for event in apply_events(agen(events), applier)]
+        self.assertEqual(result, events)
+        self.assertEqual(applier.messages[0].content, "Hi")
+
+
+if __name__ == "__main__":
+    unittest.main()
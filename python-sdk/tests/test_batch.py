@@ -0,0 +1,107 @@
+import unittest
+import asyncio
+
+from ag_ui.core.events import EventType, TextMessageContentEvent
+from ag_ui.encoder import EventEncoder, AGUI_MEDIA_TYPE, drain_queue, batch_events
+
+
+def content_event(delta):
+    """Create a text message content event"""
+    return TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="msg_1", delta=delta)
+
+
+class TestBatch(unittest.IsolatedAsyncioTestCase):
+    """Test suite for batched encoding"""
+
+    def test_encode_many(self):
+        """Test that encode_many concatenates the encoded events"""
+        events = [content_event("Hello"), content_event(" world")]
+        for encoder in (EventEncoder(), EventEncoder(accept=AGUI_MEDIA_TYPE)):
+            self.assertEqual(
+                encoder.encode_many(events),
+                b"".join(encoder.encode_bytes(event) for event in events)
+            )
+        self.assertEqual(EventEncoder().encode_many([]), b"")
+
+    async def test_drain_queue(self):
+        """Test that drain_queue takes everything already queued"""
+        queue = asyncio.Queue()
+        for i in range(5):
+            queue.put_nowait(i)
+        self.assertEqual(await drain_queue(queue, max_items=3), [0, 1, 2])
+        self.assertEqual(await drain_queue(queue), [3, 4])
+
+        # waits for the next item when the queue is empty
+        asyncio.get_running_loop().call_later(0.01, queue.put_nowait, 5)
+        self.assertEqual(await drain_queue(queue), [5])
+
+    async def test_batch_events(self):
+        """Test that events produced back to back are batched together"""
+        async def produce():
+            yield content_event("a")
+            yield content_event("b")
+            await asyncio.sleep(0.01)
+            yield content_event("c")
+
+        batches = [[event.delta for event in batch] async for batch in batch_events(produce())]
+        self.assertEqual(batches, [["a", "b"], ["c"]])
+
+    async def test_batch_events_max_pending(self):
+        """Test that batches are limited to max_pending events"""
+        async def produce():
+            for i in range(5):
+                yield i
+
+        batches = [batch async for batch in batch_events(produce(), max_pending=2)]
+        self.assertEqual([item for batch in batches for item in batch], [0, 1, 2, 3, 4])
+        self.assertTrue(all(len(batch) <= 2 for batch in batches))
+
+    async def test_batch_events_error(self):
+        """Test that producer errors are raised after the events before them"""
+        async def produce():
+            yield 1
+            raise ValueError("boom")
+
+        received = []
+        with self.assertRaises(ValueError):
+            async for batch in batch_events(produce()):
+                received.extend(batch)
+        self.assertEqual(received, [1])
+
+    async def test_batch_events_close(self):
+        """Test that closing the consumer cancels the producer"""
+        cancelled = asyncio.Event()
+
+        async def produce():
+            try:
+                yield 1
+                await asyncio.sleep(10)
+            finally:
+                cancelled.set()
+
+        batches = batch_events(produce())
+        self.assertEqual(await batches.__anext__(), [1])
+        await batches.aclose()
+        self.assertTrue(cancelled.is_set())
+
+    async def test_batch_events_stop_early(self):
+        """Test that a producer waiting for room is closed when the consumer stops"""
+        closed = []
+
+        async def produce():
+            try:
+                for i in range(10):
+                    yield i
+            finally:
+                closed.append(True)
+
+        batches = batch_events(produce(), max_pending=1)
+        self.assertEqual(await batches.__anext__(), [0])
+        # the producer is now waiting for room in the queue
+        await asyncio.sleep(0)
+        await batches.aclose()
+        self.assertEqual(closed, [True])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import unittest
+
+from ag_ui.core.events import (
+    EventType,
+    RunStartedEvent,
+    RunFinishedEvent,
+    TextMessageChunkEvent,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    ToolCallChunkEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    RawEvent,
+)
+from ag_ui.chunks import ChunkTransformer, transform_chunks
+from ag_ui.verify import verify_events
+
+RUN_STARTED = RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r")
+RUN_FINISHED = RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t", run_id="r")
+
+
+def text_chunk(message_id=None, delta=None):
+    """Create a text message chunk"""
+    return TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, message_id=message_id, delta=delta)
+
+
+def tool_chunk(tool_call_id=None, name=None, delta=None, parent_message_id=None):
+    """Create a tool call chunk"""
+    return ToolCallChunkEvent(
+        type=EventType.TOOL_CALL_CHUNK,
+        tool_call_id=tool_call_id,
+        tool_call_name=name,
+        delta=delta,
+        parent_message_id=parent_message_id,
+    )
+
+
+def transform(events):
+    """Transform a list of events"""
+    transformer = ChunkTransformer()
+    result = []
+    for event in events:
+        result += transformer.transform(event)
+    return result + transformer.close()
+
+
+async def agen(events):
+    """Yield events asynchronously"""
+    for event in events:
+        yield event
+
+
+class TestChunkTransformer(unittest.TestCase):
+    """Test suite for ChunkTransformer"""
+
+    def test_text_message_chunks(self):
+        """Test that text chunks expand into start, content and end"""
+        result = transform([RUN_STARTED, text_chunk("m", "Hel"), text_chunk(delta="lo"), RUN_FINISHED])
+        self.assertEqual(result, [
+            RUN_STARTED,
+            TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id="m", role="assistant"),
+            TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="Hel"),
+            TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="lo"),
+            TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="m"),
+            RUN_FINISHED,
+        ])
+
+    def test_tool_call_chunks(self):
+        """Test that tool call chunks expand into start, args and end"""
+        result = transform([tool_chunk("c", "search", '{"q":', "m"), tool_chunk("c", delta='"x"}')])
+        self.assertEqual(result, [
+            ToolCallStartEvent(
+                type=EventType.TOOL_CALL_START, tool_call_id="c", tool_call_name="search", parent_message_id="m"
+            ),
+            ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="c", delta='{"q":'),
+            ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="c", delta='"x"}'),
+            ToolCallEndEvent(type=EventType.TOOL_CALL_END, tool_call_id="c"),
+        ])
+
+    def test_switching_ids(self):
+        """Test that a chunk with another id closes the open message or tool call"""
+        result = transform([
+            text_chunk("m1", "a"), text_chunk("m2", "b"), tool_chunk("c", "f"), text_chunk("m3"),
+        ])
+        self.assertEqual([(event.type, getattr(event, "message_id", None)) for event in result], [
+            (EventType.TEXT_MESSAGE_START, "m1"),
+            (EventType.TEXT_MESSAGE_CONTENT, "m1"),
+            (EventType.TEXT_MESSAGE_END, "m1"),
+            (EventType.TEXT_MESSAGE_START, "m2"),
+            (EventType.TEXT_MESSAGE_CONTENT, "m2"),
+            (EventType.TEXT_MESSAGE_END, "m2"),
+            (EventType.TOOL_CALL_START, None),
+            (EventType.TOOL_CALL_END, None),
+            (EventType.TEXT_MESSAGE_START, "m3"),
+            (EventType.TEXT_MESSAGE_END, "m3"),
+        ])
+
+    def test_raw_does_not_close(self):
+        """Test that raw events pass through without closing the open message"""
+        raw = RawEvent(type=EventType.RAW, event={})
+        result = transform([text_chunk("m", "a"), raw, text_chunk(delta="b")])
+        self.assertEqual([event.type for event in result], [
+            EventType.TEXT_MESSAGE_START,
+            EventType.TEXT_MESSAGE_CONTENT,
+            EventType.RAW,
+            EventType.TEXT_MESSAGE_CONTENT,
+            EventType.TEXT_MESSAGE_END,
+        ])
+
+    def test_empty_delta(self):
+        """Test that empty text deltas produce no content events"""
+        result = transform([text_chunk("m", ""), text_chunk(delta="")])
+        self.assertEqual([event.type for event in result], [
+            EventType.TEXT_MESSAGE_START, EventType.TEXT_MESSAGE_END
+        ])
+
+    def test_missing_ids(self):
+        """Test that the first chunk must carry the id and name"""
+        with self.assertRaisesRegex(ValueError, "must have a messageId"):
+            transform([text_chunk(delta="a")])
+        with self.assertRaisesRegex(ValueError, "must have a toolCallId"):
+            transform([tool_chunk(name="f")])
+        with self.assertRaisesRegex(ValueError, "must have a toolCallName"):
+            transform([tool_chunk("c")])
+
+    def test_canonical_events_pass_through(self):
+        """Test that streams without chunks are unchanged"""
+        events = [
+            RUN_STARTED,
+            TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id="m", role="assistant"),
+            TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="m"),
+            RUN_FINISHED,
+        ]
+        self.assertEqual(transform(events), events)
+
+
+class TestTransformChunks(unittest.IsolatedAsyncioTestCase):
+    """Test suite for transform_chunks"""
+
+    async def test_output_verifies(self):
+        """Test that the expanded stream follows the protocol"""
+        events = [
+            RUN_STARTED,
+            text_chunk("m", "Hi"),
+            tool_chunk("c", "f", "{}"),
+            text_chunk("m2", "Bye"),
+        ]
+        result = [event async for event in verify_events(transform_chunks(agen(events)))]
+        self.assertEqual(result[-1].type, EventType.TEXT_MESSAGE_END)
+        self.assertEqual(len(result), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
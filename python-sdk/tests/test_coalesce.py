@@ -0,0 +1,141 @@
+import unittest
+import asyncio
+
+from ag_ui.core.events import (
+    EventType,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageChunkEvent,
+    ToolCallArgsEvent,
+    ToolCallChunkEvent,
+    RunFinishedEvent,
+)
+from ag_ui.encoder import coalesce_deltas
+
+
+def content(delta, message_id="msg_1"):
+    """Create a text message content event"""
+    return TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id=message_id, delta=delta)
+
+
+async def produce(*events, delay=0):
+    """Yield events, optionally sleeping between them"""
+    for event in events:
+        if delay:
+            await asyncio.sleep(delay)
+        yield event
+
+
+async def collect(events, **kwargs):
+    """Collect the coalesced events"""
+    return [event async for event in coalesce_deltas(events, **kwargs)]
+
+
+class TestCoalesce(unittest.IsolatedAsyncioTestCase):
+    """Test suite for the delta coalescing stage"""
+
+    async def test_merges_consecutive_deltas(self):
+        """Test that deltas for the same message are merged"""
+        events = await collect(produce(
+            TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id="msg_1", role="assistant"),
+            content("Hello"),
+            content(","),
+            content(" world"),
+            TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="msg_1"),
+            RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t", run_id="r"),
+        ), window=10)
+
+        self.assertEqual(
+            [event.type for event in events],
+            [
+                EventType.TEXT_MESSAGE_START,
+                EventType.TEXT_MESSAGE_CONTENT,
+                EventType.TEXT_MESSAGE_CONTENT,
+                EventType.TEXT_MESSAGE_END,
+                EventType.RUN_FINISHED,
+            ]
+        )
+        # the first delta after a quiet period is sent right away
+        self.assertEqual(events[1].delta, "Hello")
+        self.assertEqual(events[2].delta, ", world")
+        self.assertEqual(events[2].message_id, "msg_1")
+
+    async def test_does_not_merge_across_streams(self):
+        """Test that deltas for different messages and tool calls are kept apart"""
+        events = await collect(produce(
+            content("a", "msg_1"),
+            content("b", "msg_1"),
+            content("c", "msg_2"),
+            content("d", "msg_2"),
+            ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="call_1", delta='{"a"'),
+            ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="call_1", delta=": 1}"),
+        ), window=10)
+
+        self.assertEqual(
+            [(event.type, event.delta) for event in events],
+            [
+                (EventType.TEXT_MESSAGE_CONTENT, "a"),
+                (EventType.TEXT_MESSAGE_CONTENT, "b"),
+                (EventType.TEXT_MESSAGE_CONTENT, "cd"),
+                (EventType.TOOL_CALL_ARGS, '{"a": 1}'),
+            ]
+        )
+
+    async def test_merges_chunks(self):
+        """Test that chunks without ids continue the previous chunk"""
+        events = await collect(produce(
+            TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, message_id="msg_1", role="assistant", delta="a"),
+            TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, message_id="msg_1", role="assistant", delta="b"),
+            TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, delta="c"),
+            ToolCallChunkEvent(type=EventType.TOOL_CALL_CHUNK, tool_call_id="call_1", tool_call_name="f", delta="{"),
+            ToolCallChunkEvent(type=EventType.TOOL_CALL_CHUNK, tool_call_id="call_1", tool_call_name="f", delta="}"),
+            ToolCallChunkEvent(type=EventType.TOOL_CALL_CHUNK, tool_call_id="call_2", tool_call_name="g", delta="{"),
+        ), window=10)
+
+        self.assertEqual([event.delta for event in events], ["a", "bc", "{}", "{"])
+        self.assertEqual(events[1].message_id, "msg_1")
+        self.assertEqual(events[3].tool_call_id, "call_2")
+
+    async def test_byte_budget(self):
+        """Test that merged deltas stay within the byte budget"""
+        events = await collect(produce(*[content("é") for _ in range(10)]), window=10, max_bytes=4)
+        self.assertEqual([event.delta for event in events], ["é", "éé", "éé", "éé", "éé", "é"])
+
+    async def test_window_flushes_pending_delta(self):
+        """Test that a held delta is sent when the window ends"""
+        received = []
+
+        async def slow():
+            yield content("a")
+            yield content("b")
+            await asyncio.sleep(0.2)
+            received.append("late")
+            yield content("c")
+
+        async for event in coalesce_deltas(slow(), window=0.05):
+            received.append(event.delta)
+
+        self.assertEqual(received, ["a", "b", "late", "c"])
+
+    async def test_zero_window_passes_through(self):
+        """Test that a zero window does not merge anything"""
+        events = await collect(produce(content("a"), content("b"), delay=0.001), window=0)
+        self.assertEqual([event.delta for event in events], ["a", "b"])
+
+    async def test_error_flushes_pending_delta(self):
+        """Test that held deltas are sent before a producer error is raised"""
+        async def failing():
+            yield content("a")
+            yield content("b")
+            raise ValueError("boom")
+
+        received = []
+        with self.assertRaises(ValueError):
+            async for event in coalesce_deltas(failing(), window=10):
+                received.append(event.delta)
+        self.assertEqual(received, ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+import zlib
+from unittest import mock
+
+from ag_ui.core.events import EventType, TextMessageContentEvent, RunFinishedEvent
+from ag_ui.encoder import EventEncoder, AGUI_MEDIA_TYPE, StreamCompressor, negotiate_encoding
+from ag_ui.encoder import compression
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+def content_event(delta):
+    """Create a text message content event"""
+    return TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="msg_1", delta=delta)
+
+
+def decompressor(encoding):
+    """Create an incremental decompressor for a content encoding"""
+    if encoding == "gzip":
+        return zlib.decompressobj(wbits=31)
+    if encoding == "deflate":
+        return zlib.decompressobj(wbits=15)
+    return zstandard.ZstdDecompressor().decompressobj()
+
+
+class TestCompression(unittest.TestCase):
+    """Test suite for streaming compression"""
+
+    def test_negotiate_encoding(self):
+        """Test Accept-Encoding negotiation"""
+        with mock.patch.object(compression, "zstandard", None):
+            self.assertIsNone(negotiate_encoding(None))
+            self.assertIsNone(negotiate_encoding(""))
+            self.assertIsNone(negotiate_encoding("identity"))
+            self.assertIsNone(negotiate_encoding("br"))
+            self.assertIsNone(negotiate_encoding("gzip;q=0"))
+            self.assertIsNone(negotiate_encoding("zstd"))
+            self.assertEqual(negotiate_encoding("gzip, deflate, br"), "gzip")
+            self.assertEqual(negotiate_encoding("gzip;q=0.5, deflate"), "deflate")
+            self.assertEqual(negotiate_encoding("GZIP ; Q=0.8"), "gzip")
+            self.assertEqual(negotiate_encoding("x-gzip"), "gzip")
+            self.assertEqual(negotiate_encoding("*"), "gzip")
+            self.assertEqual(negotiate_encoding("gzip;q=0, *"), "deflate")
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_negotiate_zstd(self):
+        """Test that zstd is preferred when it is available"""
+        self.assertEqual(negotiate_encoding("gzip, deflate, br, zstd"), "zstd")
+        self.assertEqual(negotiate_encoding("gzip, zstd;q=0.9"), "gzip")
+
+    def test_unsupported_encoding(self):
+        """Test that unknown encodings are rejected"""
+        with self.assertRaises(ValueError):
+            StreamCompressor("br")
+
+    def test_every_write_is_decodable(self):
+        """Test that each write can be decompressed as soon as it is received"""
+        encodings = ["gzip", "deflate"] + (["zstd"] if zstandard is not None else [])
+        for encoding in encodings:
+            with self.subTest(encoding=encoding):
+                compressor = StreamCompressor(encoding)
+                stream = decompressor(encoding)
+                for i in range(20):
+                    data = f"data: {i}\n\n".encode()
+                    self.assertEqual(stream.decompress(compressor.compress(data)), data)
+                stream.decompress(compressor.finish())
+                self.assertEqual(compressor.finish(), b"")
+                with self.assertRaises(ValueError):
+                    compressor.compress(b"late")
+
+    def test_encoder_compresses_batches(self):
+        """Test that the encoder compresses and flushes each batch"""
+        plain = EventEncoder()
+        encoder = EventEncoder(accept_encoding="gzip")
+        self.assertEqual(encoder.get_content_encoding(), "gzip")
+        self.assertIsNone(plain.get_content_encoding())
+        self.assertEqual(plain.finish(), b"")
+
+        events = [content_event(f"token {i}") for i in range(200)]
+        stream = zlib.decompressobj(wbits=31)
+        received = b""
+        sent = 0
+        for i in range(0, len(events), 10):
+            chunk = encoder.encode_many(events[i:i + 10])
+            sent += len(chunk)
+            received += stream.decompress(chunk)
+            self.assertEqual(received, plain.encode_many(events[:i + 10]))
+
+        trailer = encoder.finish()
+        stream.decompress(trailer)
+        self.assertTrue(stream.eof)
+        self.assertLess(sent + len(trailer), len(received) / 5)
+        # a second finish writes no second trailer
+        self.assertEqual(encoder.finish(), b"")
+
+    def test_encoder_single_events(self):
+        """Test encode, encode_bytes and encode_into with compression"""
+        for accept in (None, AGUI_MEDIA_TYPE):
+            with self.subTest(accept=accept):
+                plain = EventEncoder(accept=accept)
+                encoder = EventEncoder(accept=accept, accept_encoding="deflate")
+                stream = zlib.decompressobj()
+                event = RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t", run_id="r")
+
+                encoded = encoder.encode(event)
+                self.assertIsInstance(encoded, bytes)
+                self.assertEqual(stream.decompress(encoded), plain.encode_bytes(event))
+                self.assertEqual(stream.decompress(encoder.encode_bytes(event)), plain.encode_bytes(event))
+
+                buffer = bytearray(b"x")
+                written = encoder.encode_into(buffer, event)
+                self.assertEqual(written, len(buffer) - 1)
+                self.assertEqual(stream.decompress(bytes(buffer[1:])), plain.encode_bytes(event))
+                self.assertEqual(encoder.encode_many([]), b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
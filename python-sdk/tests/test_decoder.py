@@ -0,0 +1,123 @@
+import unittest
+
+from ag_ui.core.types import UserMessage
+from ag_ui.core.events import (
+    EventType,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageChunkEvent,
+    ThinkingStartEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    StateSnapshotEvent,
+    StateDeltaEvent,
+    MessagesSnapshotEvent,
+    CustomEvent,
+    RunStartedEvent,
+    RunFinishedEvent,
+)
+from ag_ui.encoder import EventEncoder, AGUI_MEDIA_TYPE
+from ag_ui.decoder import EventDecoder, decode_stream
+
+
+def recorded_run():
+    """Create the events of a typical run"""
+    return [
+        RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r"),
+        TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id="m", role="assistant"),
+        TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="Héllo 👋\n\nworld"),
+        TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="m", timestamp=1648214400000),
+        TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, delta="chunk"),
+        ToolCallStartEvent(type=EventType.TOOL_CALL_START, tool_call_id="c", tool_call_name="f"),
+        ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="c", delta='{"a": 1}'),
+        StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"a": [1, 2.5, None, True]}),
+        StateDeltaEvent(type=EventType.STATE_DELTA, delta=[{"op": "add", "path": "/b", "value": "x"}]),
+        MessagesSnapshotEvent(
+            type=EventType.MESSAGES_SNAPSHOT,
+            messages=[UserMessage(id="1", role="user", content="Hi")]
+        ),
+        CustomEvent(type=EventType.CUSTOM, name="n", value={"x": 1}),
+        RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t", run_id="r"),
+    ]
+
+
+class TestDecoder(unittest.IsolatedAsyncioTestCase):
+    """Test suite for the stream decoder"""
+
+    def assertDecodes(self, content_type, stream, expected, chunk_size):
+        """Feed a stream in chunks and compare the decoded events"""
+        decoder = EventDecoder(content_type)
+        decoded = []
+        for i in range(0, len(stream), chunk_size):
+            decoded.extend(decoder.feed(stream[i:i + chunk_size]))
+        decoded.extend(decoder.close())
+        self.assertEqual(decoded, expected)
+
+    def test_round_trip_sse(self):
+        """Test that encoded SSE streams decode for every chunk size"""
+        events = recorded_run() + [ThinkingStartEvent(type=EventType.THINKING_START, title="T")]
+        stream = EventEncoder().encode_many(events)
+        for chunk_size in (1, 2, 3, 7, 64, len(stream)):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertDecodes("text/event-stream; charset=utf-8", stream, events, chunk_size)
+
+    def test_round_trip_protobuf(self):
+        """Test that encoded protobuf streams decode for every chunk size"""
+        events = recorded_run()
+        stream = EventEncoder(accept=AGUI_MEDIA_TYPE).encode_many(events)
+        for chunk_size in (1, 2, 3, 5, 64, len(stream)):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertDecodes(AGUI_MEDIA_TYPE, stream, events, chunk_size)
+
+    def test_sse_fields(self):
+        """Test multi-line data, comments, other fields and a missing final blank line"""
+        stream = (
+            b": keep-alive\n\n"
+            b"event: message\nid: 1\nretry: 10\n"
+            b'data: {"type": "CUSTOM",\ndata:"name": "n",\ndata: "value": 1}\n\n'
+            b"id: 2\n\n"
+            b'data:{"type":"RUN_FINISHED","threadId":"t","runId":"r"}'
+        )
+        self.assertDecodes(None, stream, [
+            CustomEvent(type=EventType.CUSTOM, name="n", value=1),
+            RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t", run_id="r"),
+        ], 4)
+
+    def test_errors(self):
+        """Test invalid events and truncated streams"""
+        with self.assertRaises(ValueError):
+            EventDecoder().feed(b'data: {"type": "UNKNOWN"}\n\n')
+        with self.assertRaises(ValueError):
+            EventDecoder().feed(b'data: [1]\n\n')
+        with self.assertRaises(ValueError):
+            EventDecoder().feed(b'data: {"type": "RUN_FINISHED"}\n\n')
+
+        decoder = EventDecoder(AGUI_MEDIA_TYPE)
+        frame = EventEncoder(accept=AGUI_MEDIA_TYPE).encode_bytes(recorded_run()[0])
+        self.assertEqual(decoder.feed(frame[:-1]), [])
+        with self.assertRaises(ValueError):
+            decoder.close()
+
+    def test_big_integers(self):
+        """Test that integers beyond 64 bits are decoded exactly"""
+        stream = b'data: {"type": "CUSTOM", "name": "n", "value": 123456789012345678901234567890}\n\n'
+        self.assertEqual(
+            EventDecoder().feed(stream),
+            [CustomEvent(type=EventType.CUSTOM, name="n", value=123456789012345678901234567890)]
+        )
+
+    async def test_decode_stream(self):
+        """Test decoding an async iterable of chunks"""
+        events = recorded_run()
+        stream = EventEncoder().encode_many(events)
+
+        async def chunks():
+            for i in range(0, len(stream), 10):
+                yield stream[i:i + 10]
+
+        self.assertEqual([event async for event in decode_stream(chunks(), "text/event-stream")], events)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import asyncio
+import unittest
+from typing import List
+
+from pydantic import BaseModel
+
+from ag_ui.core.events import (
+    EventType,
+    RunStartedEvent,
+    StateDeltaEvent,
+    StateSnapshotEvent,
+)
+from ag_ui.patch import StateEmitter, apply_patch, emit_state
+
+
+class Step(BaseModel):
+    description: str
+    status: str = "pending"
+
+
+class Plan(BaseModel):
+    steps: List[Step]
+
+
+def large_state():
+    return {"steps": [{"description": f"Step {i}", "status": "pending"} for i in range(20)]}
+
+
+class TestStateEmitter(unittest.TestCase):
+    """Test suite for StateEmitter"""
+
+    def test_first_update_is_snapshot(self):
+        """Test that the client gets a snapshot before any delta"""
+        emitter = StateEmitter()
+        event = emitter.update(large_state())
+        self.assertEqual(event.type, EventType.STATE_SNAPSHOT)
+        self.assertEqual(emitter.client_state, large_state())
+
+    def test_small_change_is_delta(self):
+        """Test that a small change of a large state is sent as a delta"""
+        emitter = StateEmitter()
+        state = large_state()
+        emitter.update(state)
+        state["steps"][3]["status"] = "completed"
+        event = emitter.update(state)
+        self.assertEqual(event.type, EventType.STATE_DELTA)
+        self.assertEqual(event.delta, [{"op": "replace", "path": "/steps/3/status", "value": "completed"}])
+
+    def test_large_change_is_snapshot(self):
+        """Test that a change larger than the state is sent as a snapshot"""
+        emitter = StateEmitter(state={"a": 1, "b": 2})
+        event = emitter.update({"c": 3})
+        self.assertEqual(event.type, EventType.STATE_SNAPSHOT)
+        self.assertEqual(event.snapshot, {"c": 3})
+
+    def test_unchanged_state_is_dropped(self):
+        """Test that nothing is sent when the client has the state"""
+        emitter = StateEmitter(state=large_state())
+        self.assertIsNone(emitter.update(large_state()))
+
+    def test_periodic_snapshot(self):
+        """Test that a snapshot is sent after snapshot_interval deltas"""
+        emitter = StateEmitter(state=large_state(), snapshot_interval=3)
+        state = large_state()
+        types = []
+        for step in state["steps"][:8]:
+            step["status"] = "completed"
+            types.append(emitter.update(state).type)
+        cycle = [EventType.STATE_DELTA] * 3 + [EventType.STATE_SNAPSHOT]
+        self.assertEqual(types, cycle * 2)
+
+    def test_reset(self):
+        """Test that reset forces a snapshot"""
+        emitter = StateEmitter(state=large_state())
+        emitter.reset()
+        self.assertIsNone(emitter.client_state)
+        self.assertEqual(emitter.update(large_state()).type, EventType.STATE_SNAPSHOT)
+
+    def test_model_state(self):
+        """Test that pydantic models are compared as JSON"""
+        plan = Plan(steps=[Step(description=f"Step {i}") for i in range(10)])
+        emitter = StateEmitter()
+        event = emitter.update(plan)
+        self.assertIs(event.snapshot, plan)
+        plan.steps[0].status = "completed"
+        event = emitter.update(plan)
+        self.assertEqual(event.delta, [{"op": "replace", "path": "/steps/0/status", "value": "completed"}])
+
+    def test_emit(self):
+        """Test that snapshots are replaced and other events passed through"""
+        emitter = StateEmitter()
+        state = large_state()
+        first = StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=state)
+        self.assertIs(emitter.emit(first), first)
+
+        delta = StateDeltaEvent(type=EventType.STATE_DELTA, delta=[{"op": "replace", "path": "/steps/0/status", "value": "completed"}])
+        self.assertIs(emitter.emit(delta), delta)
+        self.assertEqual(emitter.client_state["steps"][0]["status"], "completed")
+
+        # the final snapshot repeats what the deltas already sent
+        state["steps"][0]["status"] = "completed"
+        self.assertIsNone(emitter.emit(StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=state)))
+
+        started = RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r")
+        self.assertIs(emitter.emit(started), started)
+
+    def test_failed_delta_forces_snapshot(self):
+        """Test that a delta the client cannot apply is followed by a snapshot"""
+        emitter = StateEmitter(state={})
+        emitter.emit(StateDeltaEvent(type=EventType.STATE_DELTA, delta=[{"op": "remove", "path": "/missing"}]))
+        self.assertEqual(emitter.update({"a": 1}).type, EventType.STATE_SNAPSHOT)
+
+    def test_client_state_follows_events(self):
+        """Test that applying the emitted events reproduces each state"""
+        emitter = StateEmitter(snapshot_interval=4)
+        state = large_state()
+        client = None
+        for i in range(20):
+            state["steps"][i]["status"] = "completed"
+            if i % 5 == 0:
+                state["steps"].append({"description": f"Step {20 + i}", "status": "pending"})
+            event = emitter.update(state)
+            if event.type == EventType.STATE_SNAPSHOT:
+                client = dict(event.snapshot, steps=[dict(step) for step in event.snapshot["steps"]])
+            else:
+                client = apply_patch(client, event.delta)
+            self.assertEqual(client, state)
+
+    def test_emit_state(self):
+        """Test the async stage"""
+        state = large_state()
+
+        async def events():
+            yield StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=dict(state))
+            yield StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=dict(state, title="Plan"))
+            yield StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=dict(state, title="Plan"))
+
+        async def collect():
+            return [event async for event in emit_state(events())]
+
+        sent = asyncio.run(collect())
+        self.assertEqual([event.type for event in sent], [EventType.STATE_SNAPSHOT, EventType.STATE_DELTA])
+        self.assertEqual(sent[1].delta, [{"op": "add", "path": "/title", "value": "Plan"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,11 @@
 import unittest
 import json
+import struct
 from datetime import datetime
 
 from ag_ui.encoder.encoder import EventEncoder, AGUI_MEDIA_TYPE
 from ag_ui.core.events import BaseEvent, EventType, TextMessageContentEvent, ToolCallStartEvent
+from ag_ui.proto import decode
 
 
 class TestEventEncoder(unittest.TestCase):
@@ -186,3 +188,65 @@ class TestEventEncoder(unittest.TestCase):
             original_event.model_dump(), 
             deserialized_event.model_dump()
         )
+
+    def test_content_type_negotiation(self):
+        """Test that the content type follows the accept header"""
+        self.assertEqual(EventEncoder().get_content_type(), "text/event-stream")
+        self.assertEqual(EventEncoder(accept="text/event-stream").get_content_type(), "text/event-stream")
+        self.assertEqual(EventEncoder(accept="*/*").get_content_type(), "text/event-stream")
+        self.assertEqual(EventEncoder(accept=AGUI_MEDIA_TYPE).get_content_type(), AGUI_MEDIA_TYPE)
+        self.assertEqual(
+            EventEncoder(accept=f"text/event-stream;q=0.5, {AGUI_MEDIA_TYPE}").get_content_type(),
+            AGUI_MEDIA_TYPE
+        )
+        self.assertEqual(
+            EventEncoder(accept=f"text/event-stream, {AGUI_MEDIA_TYPE}").get_content_type(),
+            "text/event-stream"
+        )
+        self.assertEqual(
+            EventEncoder(accept=f"{AGUI_MEDIA_TYPE};q=0").get_content_type(),
+            "text/event-stream"
+        )
+
+    def test_encode_protobuf(self):
+        """Test that events are encoded as length-prefixed protobuf when accepted"""
+        event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg_123",
+            delta="Hello, world!",
+            timestamp=1648214400000
+        )
+        encoder = EventEncoder(accept=AGUI_MEDIA_TYPE)
+        encoded = encoder.encode(event)
+
+        self.assertIsInstance(encoded, bytes)
+        (length,) = struct.unpack(">I", encoded[:4])
+        self.assertEqual(length, len(encoded) - 4)
+        self.assertEqual(decode(encoded[4:]), event)
+
+    def test_encode_bytes(self):
+        """Test that encode_bytes matches encode for SSE and protobuf"""
+        event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg_123",
+            delta="Hello, wörld! 👋"
+        )
+        encoder = EventEncoder()
+        self.assertEqual(encoder.encode_bytes(event), encoder.encode(event).encode("utf-8"))
+
+        proto_encoder = EventEncoder(accept=AGUI_MEDIA_TYPE)
+        self.assertEqual(proto_encoder.encode_bytes(event), proto_encoder.encode(event))
+
+    def test_encode_into(self):
+        """Test that encode_into appends frames to the buffer"""
+        events = [
+            TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="msg_1", delta="Hello"),
+            TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="msg_1", delta=" world"),
+        ]
+        for encoder in (EventEncoder(), EventEncoder(accept=AGUI_MEDIA_TYPE)):
+            buffer = bytearray(b"prefix")
+            written = [encoder.encode_into(buffer, event) for event in events]
+
+            expected = b"".join(encoder.encode_bytes(event) for event in events)
+            self.assertEqual(bytes(buffer), b"prefix" + expected)
+            self.assertEqual(sum(written), len(expected))
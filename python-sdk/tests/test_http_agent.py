@@ -0,0 +1,166 @@
+import unittest
+import asyncio
+import json
+
+from ag_ui.core.types import RunAgentInput, UserMessage
+from ag_ui.core.events import (
+    EventType,
+    RunStartedEvent,
+    RunFinishedEvent,
+    TextMessageContentEvent,
+)
+from ag_ui.encoder import EventEncoder, AGUI_MEDIA_TYPE
+
+try:
+    import httpx
+    from ag_ui.client import ConnectionPool, HttpAgent
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+class AgentApp:
+    """A minimal ASGI app that streams a run back to the caller"""
+
+    def __init__(self):
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.delay = 0
+
+    async def __call__(self, scope, receive, send):
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        headers = {key.decode(): value.decode() for key, value in scope["headers"]}
+        self.requests.append((scope["path"], headers, json.loads(body)))
+
+        if scope["path"] == "/missing":
+            await send({"type": "http.response.start", "status": 404, "headers": []})
+            await send({"type": "http.response.body", "body": b"not found"})
+            return
+
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+
+        data = json.loads(body)
+        encoder = EventEncoder(accept=headers.get("accept"))
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", encoder.get_content_type().encode())],
+        })
+        for event in (
+            RunStartedEvent(type=EventType.RUN_STARTED, thread_id=data["threadId"], run_id=data["runId"]),
+            TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="Hello"),
+            RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id=data["threadId"], run_id=data["runId"]),
+        ):
+            await send({"type": "http.response.body", "body": encoder.encode_bytes(event), "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+
+def run_input(run_id="run_1"):
+    """Create the input of a run"""
+    return RunAgentInput(
+        thread_id="thread_1",
+        run_id=run_id,
+        state=None,
+        messages=[UserMessage(id="1", role="user", content="Hi")],
+        tools=[],
+        context=[],
+        forwarded_props=None,
+    )
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestHttpAgent(unittest.IsolatedAsyncioTestCase):
+    """Test suite for the HTTP agent client"""
+
+    async def asyncSetUp(self):
+        self.app = AgentApp()
+        self.pool = ConnectionPool(max_connections_per_host=2, transport=httpx.ASGITransport(app=self.app))
+
+    async def asyncTearDown(self):
+        await self.pool.aclose()
+
+    async def test_run(self):
+        """Test that a run posts the input and yields the decoded events"""
+        agent = HttpAgent("http://agent.test/run", headers={"Authorization": "Bearer x"}, pool=self.pool)
+        events = [event async for event in agent.run(run_input())]
+
+        self.assertEqual(
+            [event.type for event in events],
+            [EventType.RUN_STARTED, EventType.TEXT_MESSAGE_CONTENT, EventType.RUN_FINISHED]
+        )
+        self.assertEqual(events[0].run_id, "run_1")
+
+        path, headers, body = self.app.requests[0]
+        self.assertEqual(path, "/run")
+        self.assertEqual(headers["authorization"], "Bearer x")
+        self.assertEqual(headers["accept"], "text/event-stream")
+        self.assertEqual(body["threadId"], "thread_1")
+        self.assertIsNone(body["state"])
+        self.assertIsNone(body["forwardedProps"])
+        self.assertEqual(body["messages"], [{"id": "1", "role": "user", "content": "Hi"}])
+
+    async def test_run_protobuf(self):
+        """Test that protobuf responses are decoded"""
+        agent = HttpAgent("http://agent.test/run", headers={"Accept": AGUI_MEDIA_TYPE}, pool=self.pool)
+        agent.request_headers = lambda input_data: {**agent.headers, "Content-Type": "application/json"}
+        events = [event async for event in agent.run(run_input())]
+        self.assertEqual(self.app.requests[0][1]["accept"], AGUI_MEDIA_TYPE)
+        self.assertEqual(events[1].delta, "Hello")
+
+    async def test_error_status(self):
+        """Test that error responses raise"""
+        agent = HttpAgent("http://agent.test/missing", pool=self.pool)
+        with self.assertRaises(httpx.HTTPStatusError):
+            async for _ in agent.run(run_input()):
+                pass
+
+    async def test_per_host_limit(self):
+        """Test that concurrent runs against a host are limited"""
+        self.app.delay = 0.02
+        agent = HttpAgent("http://agent.test/run", pool=self.pool)
+
+        async def run(run_id):
+            return [event async for event in agent.run(run_input(run_id))]
+
+        results = await asyncio.gather(*(run(f"run_{i}") for i in range(6)))
+        self.assertEqual([events[-1].run_id for events in results], [f"run_{i}" for i in range(6)])
+        self.assertEqual(self.app.max_active, 2)
+
+    async def test_per_host_limit_default_port(self):
+        """Test that a host shares its limit with and without its default port"""
+        self.app.delay = 0.02
+        agents = [
+            HttpAgent("http://agent.test/run", pool=self.pool),
+            HttpAgent("http://agent.test:80/run", pool=self.pool),
+        ]
+
+        async def run(run_id):
+            agent = agents[int(run_id[-1]) % 2]
+            return [event async for event in agent.run(run_input(run_id))]
+
+        await asyncio.gather(*(run(f"run_{i}") for i in range(6)))
+        self.assertEqual(self.app.max_active, 2)
+
+    async def test_owned_pool(self):
+        """Test that an agent without a pool creates and closes its own"""
+        async with HttpAgent("http://agent.test/run") as agent:
+            self.assertIsInstance(agent.pool, ConnectionPool)
+        self.assertTrue(agent.pool.client.is_closed)
+
+        agent = HttpAgent("http://agent.test/run", pool=self.pool)
+        await agent.aclose()
+        self.assertFalse(self.pool.client.is_closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
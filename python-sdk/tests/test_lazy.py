@@ -0,0 +1,89 @@
+import asyncio
+import json
+import unittest
+
+from pydantic import ValidationError
+
+from ag_ui.core import LazyRunAgentInput, RunAgentInput, UserMessage, ToolMessage
+
+
+def request_body(messages=None, **fields):
+    """Create the JSON body of a run request"""
+    return json.dumps({
+        "threadId": "thread_1",
+        "runId": "run_1",
+        "state": {"count": 1},
+        "messages": messages if messages is not None else [
+            {"id": "1", "role": "user", "content": "What is the weather?"},
+            {"id": "2", "role": "tool", "content": "sunny", "toolCallId": "call_1"},
+        ],
+        "tools": [{"name": "search", "description": "Search the web", "parameters": {"type": "object"}}],
+        "context": [{"description": "city", "value": "Berlin"}],
+        "forwardedProps": {},
+        **fields,
+    })
+
+
+class TestLazyRunAgentInput(unittest.TestCase):
+    """Test suite for LazyRunAgentInput"""
+
+    def test_envelope(self):
+        """Test that the ids are available without validating the rest"""
+        input_data = LazyRunAgentInput.from_json(request_body(messages=[{"role": "nobody"}]))
+        self.assertEqual(input_data.thread_id, "thread_1")
+        self.assertEqual(input_data.run_id, "run_1")
+        self.assertEqual(input_data.state, {"count": 1})
+
+    def test_fields_are_validated_on_access(self):
+        """Test that fields are validated like RunAgentInput validates them"""
+        input_data = LazyRunAgentInput.from_json(request_body())
+        messages = input_data.messages
+        self.assertIsInstance(messages[0], UserMessage)
+        self.assertIsInstance(messages[1], ToolMessage)
+        self.assertEqual(messages[1].tool_call_id, "call_1")
+        self.assertIs(input_data.messages, messages)
+        self.assertEqual(input_data.tools[0].name, "search")
+        self.assertEqual(input_data.context[0].value, "Berlin")
+
+    def test_invalid_field_raises_on_access(self):
+        """Test that an invalid message raises when the messages are read"""
+        input_data = LazyRunAgentInput.from_json(request_body(messages=[{"id": "1", "role": "nobody"}]))
+        with self.assertRaises(ValidationError):
+            input_data.messages
+        with self.assertRaises(ValidationError):
+            input_data.validate()
+
+    def test_invalid_envelope(self):
+        """Test that missing, extra and invalid envelope fields are rejected up front"""
+        body = json.loads(request_body())
+        del body["runId"]
+        with self.assertRaises(ValidationError):
+            LazyRunAgentInput.from_dict(body)
+        with self.assertRaises(ValidationError):
+            LazyRunAgentInput.from_json(request_body(extra=True))
+        with self.assertRaises(ValidationError):
+            LazyRunAgentInput.from_json(request_body(threadId=1))
+        with self.assertRaises(ValidationError):
+            LazyRunAgentInput.from_json(request_body(messages={}))
+        with self.assertRaises(ValidationError):
+            LazyRunAgentInput.from_json(request_body()[:-1])
+
+    def test_validate(self):
+        """Test that validate returns the same input as eager validation"""
+        body = request_body()
+        self.assertEqual(LazyRunAgentInput.from_json(body).validate(), RunAgentInput.model_validate_json(body))
+
+    def test_validate_async(self):
+        """Test that validation can run in the background"""
+        input_data = LazyRunAgentInput.from_json(request_body())
+
+        async def run():
+            return await input_data.validate_async()
+
+        validated = asyncio.run(run())
+        self.assertIsInstance(validated, RunAgentInput)
+        self.assertIs(validated.messages, input_data.messages)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+
+from ag_ui.core.types import AssistantMessage, FunctionCall, ToolCall, ToolMessage, UserMessage
+from ag_ui.core.events import (
+    EventType,
+    MessagesSnapshotEvent,
+    TextMessageChunkEvent,
+    ToolCallChunkEvent,
+)
+from ag_ui.apply import EventApplier, MessagesEmitter
+
+
+def conversation(length):
+    """Create a conversation of user and assistant messages"""
+    return [
+        UserMessage(id=f"u{i}", role="user", content=f"question {i}") if i % 2 == 0
+        else AssistantMessage(id=f"a{i}", role="assistant", content=f"answer {i}")
+        for i in range(length)
+    ]
+
+
+def assistant_with_tool_call(message_id, tool_call_id, content=None):
+    """Create an assistant message that calls a tool"""
+    return AssistantMessage(
+        id=message_id,
+        role="assistant",
+        content=content,
+        tool_calls=[ToolCall(
+            id=tool_call_id,
+            type="function",
+            function=FunctionCall(name="search", arguments='{"query": "weather"}'),
+        )],
+    )
+
+
+class TestMessagesEmitter(unittest.TestCase):
+    """Test suite for MessagesEmitter"""
+
+    def assertClientReaches(self, client, events, messages):
+        """Asserts that applying events to the client's messages gives messages"""
+        for event in events:
+            client.apply(event)
+        self.assertEqual(
+            [message.model_dump(exclude_none=True) for message in client.messages],
+            [message.model_dump(exclude_none=True) for message in messages],
+        )
+
+    def test_first_update_is_snapshot(self):
+        """Test that the client gets a snapshot first"""
+        emitter = MessagesEmitter()
+        events = emitter.update(conversation(4))
+        self.assertEqual([event.type for event in events], [EventType.MESSAGES_SNAPSHOT])
+        self.assertEqual(emitter.messages, conversation(4))
+
+    def test_appended_messages(self):
+        """Test that appended assistant and tool messages are sent as events"""
+        messages = conversation(3)
+        emitter = MessagesEmitter()
+        client = EventApplier()
+        self.assertClientReaches(client, emitter.update(messages), messages)
+
+        messages = messages + [
+            assistant_with_tool_call("a3", "call1", content="Let me look"),
+            ToolMessage(id="t4", role="tool", content="sunny", tool_call_id="call1"),
+            AssistantMessage(id="a5", role="assistant", content="It is sunny"),
+        ]
+        events = emitter.update(messages)
+        self.assertNotIn(EventType.MESSAGES_SNAPSHOT, [event.type for event in events])
+        self.assertClientReaches(client, events, messages)
+
+    def test_unchanged_messages(self):
+        """Test that nothing is sent when the client has the messages"""
+        emitter = MessagesEmitter(messages=conversation(4))
+        self.assertEqual(emitter.update(conversation(4)), [])
+
+    def test_changed_message_is_snapshot(self):
+        """Test that a change to an earlier message sends a snapshot"""
+        emitter = MessagesEmitter(messages=conversation(4))
+        messages = conversation(4)
+        messages[1] = AssistantMessage(id="a1", role="assistant", content="edited")
+        self.assertEqual([event.type for event in emitter.update(messages)], [EventType.MESSAGES_SNAPSHOT])
+
+        emitter = MessagesEmitter(messages=conversation(4))
+        self.assertEqual([event.type for event in emitter.update(conversation(2))], [EventType.MESSAGES_SNAPSHOT])
+
+    def test_user_message_is_snapshot(self):
+        """Test that messages that cannot be sent as events are sent in a snapshot"""
+        emitter = MessagesEmitter(messages=conversation(2))
+        events = emitter.update(conversation(3))
+        self.assertEqual([event.type for event in events], [EventType.MESSAGES_SNAPSHOT])
+        self.assertEqual(events[0].messages, conversation(3))
+
+    def test_streamed_messages_are_not_repeated(self):
+        """Test that text and tool calls streamed as chunks are not sent again"""
+        emitter = MessagesEmitter(messages=conversation(1))
+        streamed = [
+            TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, message_id="chatcmpl-1", role="assistant", delta="Let "),
+            TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, delta="me look"),
+            ToolCallChunkEvent(type=EventType.TOOL_CALL_CHUNK, tool_call_id="call1", tool_call_name="search", delta="{}"),
+        ]
+        for event in streamed:
+            self.assertEqual(emitter.emit(event), [event])
+
+        # the message appended to the conversation has an id of its own
+        messages = conversation(1) + [assistant_with_tool_call("a1", "call1", content="Let me look")]
+        self.assertEqual(emitter.update(messages), [])
+
+        messages = messages + [ToolMessage(id="t2", role="tool", content="sunny", tool_call_id="call1")]
+        self.assertEqual([event.type for event in emitter.update(messages)], [EventType.TOOL_CALL_RESULT])
+
+    def test_emit_replaces_snapshots(self):
+        """Test that emitted snapshots are replaced with the appended messages"""
+        emitter = MessagesEmitter()
+        first = MessagesSnapshotEvent(type=EventType.MESSAGES_SNAPSHOT, messages=conversation(1))
+        self.assertEqual(emitter.emit(first), [first])
+
+        second = MessagesSnapshotEvent(type=EventType.MESSAGES_SNAPSHOT, messages=conversation(2))
+        self.assertEqual(
+            [event.type for event in emitter.emit(second)],
+            [EventType.TEXT_MESSAGE_START, EventType.TEXT_MESSAGE_CONTENT, EventType.TEXT_MESSAGE_END],
+        )
+
+    def test_reset(self):
+        """Test that reset forces a snapshot"""
+        emitter = MessagesEmitter(messages=conversation(2))
+        emitter.reset()
+        self.assertIsNone(emitter.messages)
+        self.assertEqual([event.type for event in emitter.update(conversation(2))], [EventType.MESSAGES_SNAPSHOT])
+
+    def test_long_conversation(self):
+        """Test that each step of a long conversation sends only its own messages"""
+        emitter = MessagesEmitter()
+        client = EventApplier()
+        messages = conversation(200)
+        self.assertClientReaches(client, emitter.update(messages), messages)
+        for i in range(200, 210):
+            messages = messages + [AssistantMessage(id=f"a{i}", role="assistant", content=f"step {i}")]
+            events = emitter.update(messages)
+            self.assertEqual(len(events), 3)
+            self.assertClientReaches(client, events, messages)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+import gc
+
+from ag_ui.core.events import (
+    EventType,
+    TextMessageContentEvent,
+    StateSnapshotEvent,
+    RunFinishedEvent,
+)
+from ag_ui.encoder import EventEncoder, EncoderMetrics, metrics_app
+
+
+def content_event(delta):
+    """Create a text message content event"""
+    return TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="msg_1", delta=delta)
+
+
+class TestMetrics(unittest.IsolatedAsyncioTestCase):
+    """Test suite for encoder metrics"""
+
+    def test_records_events(self):
+        """Test that counts, bytes and encode times are recorded per event type"""
+        metrics = EncoderMetrics()
+        encoder = EventEncoder(metrics=metrics)
+        plain = EventEncoder()
+        events = [content_event("a"), content_event("b")]
+        snapshot = StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"a": 1})
+
+        self.assertEqual(encoder.encode(snapshot), plain.encode(snapshot))
+        self.assertEqual(encoder.encode_many(events), plain.encode_many(events))
+        buffer = bytearray()
+        encoder.encode_into(buffer, content_event("é"))
+
+        stream = encoder.stream_metrics
+        self.assertEqual(stream.types[EventType.STATE_SNAPSHOT][:2], [1, len(plain.encode_bytes(snapshot))])
+        self.assertEqual(
+            stream.types[EventType.TEXT_MESSAGE_CONTENT][:2],
+            [3, len(plain.encode_many(events)) + len(buffer)]
+        )
+        self.assertEqual(stream.total_events, 4)
+        self.assertEqual(stream.sent_bytes, stream.total_bytes)
+        self.assertEqual(sum(stream.latency), 4)
+        self.assertGreater(stream.types[EventType.STATE_SNAPSHOT][2], 0)
+        self.assertLess(stream.latency_quantile(0.5), float("inf"))
+
+        # running streams are included in the totals
+        self.assertEqual(metrics.totals().total_events, 4)
+
+    def test_compressed_bytes(self):
+        """Test that bytes are recorded before and after compression"""
+        metrics = EncoderMetrics()
+        encoder = EventEncoder(accept_encoding="gzip", metrics=metrics)
+        sent = len(encoder.encode_many([content_event("token") for _ in range(50)]))
+        sent += len(encoder.finish())
+        self.assertEqual(encoder.stream_metrics.sent_bytes, sent)
+        self.assertLess(sent, encoder.stream_metrics.total_bytes)
+
+    def test_streams(self):
+        """Test that finished and dropped streams add to the totals once"""
+        metrics = EncoderMetrics()
+        finished = EventEncoder(metrics=metrics)
+        finished.encode(RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t", run_id="r"))
+        finished.finish()
+        finished.finish()
+        self.assertEqual(sum(metrics.stream_bytes), 1)
+
+        dropped = EventEncoder(metrics=metrics)
+        dropped.encode(content_event("a"))
+        del dropped
+        gc.collect()
+
+        totals = metrics.totals()
+        self.assertEqual(metrics.streams, 2)
+        self.assertEqual(sum(metrics.stream_bytes), 2)
+        self.assertEqual(totals.types[EventType.RUN_FINISHED][0], 1)
+        self.assertEqual(totals.types[EventType.TEXT_MESSAGE_CONTENT][0], 1)
+
+    def test_disabled(self):
+        """Test that encoders without a sink have no stream metrics"""
+        encoder = EventEncoder()
+        self.assertIsNone(encoder.stream_metrics)
+        self.assertEqual(encoder.finish(), b"")
+
+    async def test_prometheus(self):
+        """Test the Prometheus text exposition"""
+        metrics = EncoderMetrics()
+        encoder = EventEncoder(metrics=metrics)
+        encoder.encode_many([content_event("a"), content_event("b")])
+        encoder.finish()
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        await metrics_app(metrics)({"type": "http", "method": "GET", "path": "/"}, None, send)
+        self.assertEqual(sent[0]["status"], 200)
+        self.assertIn((b"content-type", b"text/plain; version=0.0.4; charset=utf-8"), sent[0]["headers"])
+
+        lines = sent[1]["body"].decode().splitlines()
+        self.assertIn('ag_ui_encoder_events_total{type="TEXT_MESSAGE_CONTENT"} 2', lines)
+        self.assertIn("ag_ui_encoder_streams_total 1", lines)
+        self.assertIn('ag_ui_encoder_encode_seconds_bucket{le="+Inf"} 2', lines)
+        self.assertIn("ag_ui_encoder_encode_seconds_count 2", lines)
+        self.assertIn('ag_ui_encoder_stream_bytes_bucket{le="1024"} 1', lines)
+        for line in lines:
+            if not line.startswith("#"):
+                name, value = line.rsplit(" ", 1)
+                self.assertTrue(name.startswith("ag_ui_encoder_"))
+                float(value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import json
+import unittest
+
+from pydantic import ValidationError
+
+from ag_ui.core.events import (
+    EventType,
+    ThinkingStartEvent,
+    ThinkingTextMessageContentEvent,
+    TextMessageContentEvent,
+    RunStartedEvent,
+)
+from ag_ui.decoder import parse_event, parse_many
+from ag_ui.encoder import EventEncoder
+
+# a valid event of each type, as sent on the wire
+SAMPLES = {
+    EventType.TEXT_MESSAGE_START: {"messageId": "m", "role": "assistant"},
+    EventType.TEXT_MESSAGE_CONTENT: {"messageId": "m", "delta": "Hi"},
+    EventType.TEXT_MESSAGE_END: {"messageId": "m"},
+    EventType.TEXT_MESSAGE_CHUNK: {"messageId": "m", "delta": "Hi"},
+    EventType.THINKING_TEXT_MESSAGE_START: {},
+    EventType.THINKING_TEXT_MESSAGE_CONTENT: {"delta": "Hmm"},
+    EventType.THINKING_TEXT_MESSAGE_END: {},
+    EventType.TOOL_CALL_START: {"toolCallId": "c", "toolCallName": "search"},
+    EventType.TOOL_CALL_ARGS: {"toolCallId": "c", "delta": "{}"},
+    EventType.TOOL_CALL_END: {"toolCallId": "c"},
+    EventType.TOOL_CALL_CHUNK: {"toolCallId": "c", "delta": "{}"},
+    EventType.TOOL_CALL_RESULT: {"messageId": "t", "toolCallId": "c", "content": "sunny"},
+    EventType.THINKING_START: {"title": "Planning"},
+    EventType.THINKING_END: {},
+    EventType.STATE_SNAPSHOT: {"snapshot": {"count": 1}},
+    EventType.STATE_DELTA: {"delta": [{"op": "replace", "path": "/count", "value": 2}]},
+    EventType.MESSAGES_SNAPSHOT: {"messages": [{"id": "u", "role": "user", "content": "Hi"}]},
+    EventType.RAW: {"event": {"source": "llm"}},
+    EventType.CUSTOM: {"name": "n", "value": 1},
+    EventType.RUN_STARTED: {"threadId": "t", "runId": "r"},
+    EventType.RUN_FINISHED: {"threadId": "t", "runId": "r"},
+    EventType.RUN_ERROR: {"message": "failed"},
+    EventType.STEP_STARTED: {"stepName": "plan"},
+    EventType.STEP_FINISHED: {"stepName": "plan"},
+}
+
+
+def sample_line(event_type):
+    """Create the JSON of a sample event"""
+    return json.dumps({"type": event_type.value, **SAMPLES[event_type]}).encode()
+
+
+class TestParseEvent(unittest.TestCase):
+    """Test suite for parse_event"""
+
+    def test_every_event_type(self):
+        """Test that an event of every type can be parsed"""
+        self.assertEqual(set(SAMPLES), set(EventType))
+        for event_type in EventType:
+            event = parse_event(sample_line(event_type))
+            self.assertEqual(event.type, event_type)
+
+    def test_thinking_events(self):
+        """Test that thinking events are parsed into their classes"""
+        self.assertIsInstance(parse_event(sample_line(EventType.THINKING_START)), ThinkingStartEvent)
+        self.assertIsInstance(
+            parse_event(sample_line(EventType.THINKING_TEXT_MESSAGE_CONTENT)),
+            ThinkingTextMessageContentEvent,
+        )
+
+    def test_round_trip(self):
+        """Test that encoded events are parsed back to equal events"""
+        event = TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="Hi")
+        self.assertEqual(parse_event(event.model_dump_json(by_alias=True, exclude_none=True)), event)
+
+    def test_invalid(self):
+        """Test that invalid events raise ValidationError"""
+        invalid = (
+            b'{"type": "UNKNOWN"}',
+            b"[1]",
+            b"{",
+            b'{"type": "RUN_STARTED"}',
+            b'{"type": "TEXT_MESSAGE_CONTENT", "messageId": "m", "delta": ""}',
+        )
+        for data in invalid:
+            with self.assertRaises(ValidationError):
+                parse_event(data)
+
+
+class TestParseMany(unittest.TestCase):
+    """Test suite for parse_many"""
+
+    def test_lines(self):
+        """Test that lines are parsed in order and blank lines skipped"""
+        lines = [sample_line(event_type) + b"\n" for event_type in EventType]
+        lines.insert(3, b"\n")
+        events = parse_many(lines)
+        self.assertEqual([event.type for event in events], list(EventType))
+
+    def test_str_lines(self):
+        """Test that text lines are parsed"""
+        lines = [sample_line(EventType.RUN_STARTED).decode(), "", sample_line(EventType.RUN_FINISHED).decode()]
+        self.assertEqual([event.type for event in parse_many(lines)], [EventType.RUN_STARTED, EventType.RUN_FINISHED])
+        self.assertEqual(parse_many([]), [])
+
+    def test_event_log(self):
+        """Test parsing the SSE data of an encoded run"""
+        events = [RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r")] * 3
+        stream = EventEncoder().encode_many(events)
+        lines = [line[len(b"data: "):] for line in stream.split(b"\n") if line.startswith(b"data: ")]
+        self.assertEqual(parse_many(lines), events)
+
+    def test_invalid_line(self):
+        """Test that the error of the invalid line is raised"""
+        with self.assertRaises(ValidationError):
+            parse_many([sample_line(EventType.RUN_STARTED), b'{"type": "UNKNOWN"}'])
+
+    def test_lines_are_not_merged(self):
+        """Test that lines which only form events when joined are rejected"""
+        with self.assertRaises(ValidationError):
+            parse_many([b'{"type": "CUSTOM", "name": "n", "value": "', b'"}'])
+        with self.assertRaises(ValidationError):
+            parse_many([sample_line(EventType.RUN_STARTED) + b"," + sample_line(EventType.RUN_FINISHED)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,280 @@
+import unittest
+import copy
+
+from ag_ui.core.events import EventType, StateDeltaEvent
+from ag_ui.encoder import EventEncoder, AGUI_MEDIA_TYPE
+from ag_ui.patch import (
+    PATCH_OPERATIONS,
+    JsonPatchError,
+    apply_patch,
+    compact_patch,
+    format_pointer,
+    make_patch,
+    parse_pointer,
+    validate_patch,
+)
+
+
+class TestPointer(unittest.TestCase):
+    """Test suite for JSON Pointers"""
+
+    def test_parse(self):
+        """Test that pointers are split and unescaped"""
+        self.assertEqual(parse_pointer(""), ())
+        self.assertEqual(parse_pointer("/a/0/"), ("a", "0", ""))
+        self.assertEqual(parse_pointer("/a~1b/c~0d/~01"), ("a/b", "c~d", "~1"))
+        with self.assertRaises(JsonPatchError):
+            parse_pointer("a/b")
+
+    def test_format(self):
+        """Test that tokens are escaped"""
+        self.assertEqual(format_pointer(["a/b", "c~d", 0]), "/a~1b/c~0d/0")
+        self.assertEqual(parse_pointer(format_pointer(["~1", "/"])), ("~1", "/"))
+
+
+class TestApplyPatch(unittest.TestCase):
+    """Test suite for apply_patch"""
+
+    def test_operations(self):
+        """Test each operation"""
+        document = {"a": {"b": [1, 2, 3]}, "c": "x", "a~/b": 0}
+        result = apply_patch(document, [
+            {"op": "add", "path": "/a/b/1", "value": 9},
+            {"op": "remove", "path": "/a/b/0"},
+            {"op": "replace", "path": "/c", "value": "y"},
+            {"op": "copy", "from": "/a/b", "path": "/d"},
+            {"op": "move", "from": "/c", "path": "/e"},
+            {"op": "replace", "path": "/a~0~1b", "value": 1},
+            {"op": "add", "path": "/d/-", "value": 4},
+            {"op": "test", "path": "/d", "value": [9, 2, 3, 4]},
+        ])
+        self.assertIs(result, document)
+        self.assertEqual(document, {"a": {"b": [9, 2, 3]}, "a~/b": 1, "d": [9, 2, 3, 4], "e": "y"})
+
+    def test_types(self):
+        """Test that the test operation compares JSON types"""
+        document = {"flag": True, "count": 1, "nested": {"items": [1, 2.5, None]}}
+        with self.assertRaises(JsonPatchError):
+            apply_patch(document, [{"op": "test", "path": "/flag", "value": 1}])
+        with self.assertRaises(JsonPatchError):
+            apply_patch(document, [{"op": "test", "path": "/count", "value": True}])
+        apply_patch(document, [
+            {"op": "test", "path": "/flag", "value": True},
+            {"op": "test", "path": "/count", "value": 1},
+            {"op": "test", "path": "/nested", "value": {"items": [1, 2.5, None]}},
+        ])
+
+    def test_root(self):
+        """Test that replacing the root returns the new document"""
+        self.assertEqual(apply_patch({"a": 1}, [{"op": "replace", "path": "", "value": [1]}]), [1])
+        self.assertEqual(apply_patch(None, [{"op": "add", "path": "", "value": {}}]), {})
+
+    def test_move_onto_itself(self):
+        """Test that moving a location onto itself, including the root, changes nothing"""
+        document = {"a": [1]}
+        self.assertIs(apply_patch(document, [
+            {"op": "move", "from": "", "path": ""},
+            {"op": "move", "from": "/a", "path": "/a"},
+        ]), document)
+        self.assertEqual(document, {"a": [1]})
+        with self.assertRaises(JsonPatchError):
+            apply_patch(document, [{"op": "move", "from": "/b", "path": "/b"}])
+
+    def test_values_copied(self):
+        """Test that the document does not share values with the patch"""
+        value = {"x": []}
+        document = apply_patch({}, [{"op": "add", "path": "/v", "value": value}])
+        document["v"]["x"].append(1)
+        self.assertEqual(value, {"x": []})
+
+    def test_atomic(self):
+        """Test that a failing patch leaves the document unchanged"""
+        document = {"a": 1, "list": [1, 2], "obj": {"k": "v"}}
+        original = copy.deepcopy(document)
+        with self.assertRaises(JsonPatchError):
+            apply_patch(document, [
+                {"op": "replace", "path": "/a", "value": 2},
+                {"op": "remove", "path": "/list/0"},
+                {"op": "add", "path": "/list/0", "value": 5},
+                {"op": "move", "from": "/obj/k", "path": "/moved"},
+                {"op": "add", "path": "/b", "value": 3},
+                {"op": "test", "path": "/a", "value": 1},
+            ])
+        self.assertEqual(document, original)
+
+    def test_invalid(self):
+        """Test that invalid operations raise"""
+        for operation in (
+            {"op": "add", "path": "/a/b", "value": 1},
+            {"op": "remove", "path": "/missing"},
+            {"op": "replace", "path": "/missing", "value": 1},
+            {"op": "replace", "path": "/list/5", "value": 1},
+            {"op": "add", "path": "/list/01", "value": 1},
+            {"op": "add", "path": "/list/2", "value": 1},
+            {"op": "move", "from": "/list", "path": "/list/0"},
+            {"op": "remove", "path": ""},
+            {"op": "test", "path": "/list", "value": [2]},
+            {"op": "test", "path": "/list", "value": [True]},
+            {"op": "test", "path": "/list/0", "value": 1.0},
+            {"op": "test", "path": "/list", "value": [1, 1]},
+            {"op": "test", "path": "", "value": {"list": [1], "other": None}},
+            {"op": "add", "path": "a", "value": 1},
+        ):
+            with self.assertRaises(JsonPatchError, msg=operation):
+                apply_patch({"list": [1]}, [operation])
+
+    def test_validation(self):
+        """Test that operations are validated against the protocol's operation types"""
+        self.assertEqual(PATCH_OPERATIONS, {"add", "remove", "replace", "move", "copy", "test"})
+        for operation in (
+            {"op": "merge", "path": "/a", "value": 1},
+            {"op": "add", "path": "/a"},
+            {"op": "copy", "path": "/a"},
+            {"op": "add", "path": 1, "value": 1},
+            {"path": "/a"},
+            "add",
+        ):
+            with self.assertRaises(JsonPatchError, msg=operation):
+                validate_patch([operation])
+        validate_patch([{"op": "remove", "path": "/a"}, {"op": "move", "from": "/a", "path": "/b"}])
+
+
+class TestMakePatch(unittest.TestCase):
+    """Test suite for make_patch"""
+
+    def test_round_trip(self):
+        """Test that the patch turns the source into the target"""
+        source = {"steps": [{"status": "pending"}, {"status": "pending"}, {}], "a": 1, "b": {"c": [1]}}
+        target = {"steps": [{"status": "completed"}, {"status": "pending"}], "b": {"c": [1, 2]}, "d": True}
+        original = copy.deepcopy(source)
+        patch = make_patch(source, target)
+        self.assertEqual(source, original)
+        self.assertEqual(patch, [
+            {"op": "remove", "path": "/a"},
+            {"op": "replace", "path": "/steps/0/status", "value": "completed"},
+            {"op": "remove", "path": "/steps/2"},
+            {"op": "add", "path": "/b/c/-", "value": 2},
+            {"op": "add", "path": "/d", "value": True},
+        ])
+        self.assertEqual(apply_patch(source, patch), target)
+
+    def test_types(self):
+        """Test that values of different types are replaced"""
+        self.assertEqual(make_patch({"a": 1}, {"a": True}), [{"op": "replace", "path": "/a", "value": True}])
+        self.assertEqual(make_patch([1], {"0": 1}), [{"op": "replace", "path": "", "value": {"0": 1}}])
+        self.assertEqual(make_patch({"a": [1]}, {"a": [1]}), [])
+
+
+class TestCompactPatch(unittest.TestCase):
+    """Test suite for compact_patch"""
+
+    def assertCompacts(self, document, patches, expected):
+        """Assert that the patches compact to expected with the same effect"""
+        snapshot = copy.deepcopy(patches)
+        compacted = compact_patch(*patches)
+        self.assertEqual(compacted, expected)
+        self.assertEqual(patches, snapshot)
+        sequential = copy.deepcopy(document)
+        for patch in patches:
+            sequential = apply_patch(sequential, patch)
+        self.assertEqual(apply_patch(copy.deepcopy(document), compacted), sequential)
+
+    def test_overwrites(self):
+        """Test that overwritten operations are dropped"""
+        self.assertCompacts(
+            {"progress": 0, "steps": [{"status": "pending"}]},
+            [
+                [{"op": "replace", "path": "/progress", "value": 1}],
+                [{"op": "replace", "path": "/steps/0/status", "value": "running"}],
+                [{"op": "replace", "path": "/progress", "value": 2}],
+                [{"op": "replace", "path": "/steps/0", "value": {"status": "done"}}],
+            ],
+            [
+                {"op": "replace", "path": "/progress", "value": 2},
+                {"op": "replace", "path": "/steps/0", "value": {"status": "done"}},
+            ],
+        )
+
+    def test_folds_into_added_value(self):
+        """Test that operations below an added value are folded into it"""
+        self.assertCompacts(
+            {},
+            [
+                [{"op": "add", "path": "/plan", "value": {"steps": []}}],
+                [{"op": "add", "path": "/plan/steps/-", "value": "a"}],
+                [{"op": "add", "path": "/plan/steps/0", "value": "b"}],
+                [{"op": "add", "path": "/plan/title", "value": "t"}],
+            ],
+            [{"op": "add", "path": "/plan", "value": {"steps": ["b", "a"], "title": "t"}}],
+        )
+
+    def test_add_then_remove(self):
+        """Test that a remove after an add keeps the add"""
+        self.assertCompacts(
+            {"a": 1},
+            [[{"op": "add", "path": "/a", "value": 2}], [{"op": "remove", "path": "/a"}]],
+            [{"op": "add", "path": "/a", "value": 2}, {"op": "remove", "path": "/a"}],
+        )
+
+    def test_replace_after_add(self):
+        """Test that a replace of an added path stays an add"""
+        self.assertCompacts(
+            {},
+            [[{"op": "add", "path": "/a", "value": 1}], [{"op": "replace", "path": "/a", "value": 2}]],
+            [{"op": "add", "path": "/a", "value": 2}],
+        )
+
+    def test_array_shifts(self):
+        """Test that operations are not merged across array insertions"""
+        self.assertCompacts(
+            {"list": [{"v": 0}, {"v": 1}], "n": 0},
+            [
+                [{"op": "replace", "path": "/list/1/v", "value": 2}, {"op": "replace", "path": "/n", "value": 1}],
+                [{"op": "add", "path": "/list/0", "value": {"v": 9}}],
+                [{"op": "replace", "path": "/list/1/v", "value": 3}, {"op": "replace", "path": "/n", "value": 2}],
+            ],
+            [
+                {"op": "replace", "path": "/list/1/v", "value": 2},
+                {"op": "add", "path": "/list/0", "value": {"v": 9}},
+                {"op": "replace", "path": "/list/1/v", "value": 3},
+                {"op": "replace", "path": "/n", "value": 2},
+            ],
+        )
+
+    def test_reads(self):
+        """Test that operations read by copy and test are kept"""
+        self.assertCompacts(
+            {"a": 1},
+            [
+                [{"op": "replace", "path": "/a", "value": 2}],
+                [{"op": "copy", "from": "/a", "path": "/b"}],
+                [{"op": "test", "path": "/b", "value": 2}],
+                [{"op": "replace", "path": "/a", "value": 3}],
+            ],
+            [
+                {"op": "replace", "path": "/a", "value": 2},
+                {"op": "copy", "from": "/a", "path": "/b"},
+                {"op": "test", "path": "/b", "value": 2},
+                {"op": "replace", "path": "/a", "value": 3},
+            ],
+        )
+
+
+class TestStateDeltaEncoding(unittest.TestCase):
+    """Test that produced patches can be encoded"""
+
+    def test_protobuf(self):
+        """Test that a compacted patch encodes as protobuf"""
+        delta = compact_patch(make_patch({"a": [1]}, {"a": [1, 2], "b": "x"}))
+        event = StateDeltaEvent(type=EventType.STATE_DELTA, delta=delta)
+        self.assertTrue(EventEncoder(accept=AGUI_MEDIA_TYPE).encode(event))
+
+    def test_every_operation(self):
+        """Test that every operation type of the patch engine encodes as protobuf"""
+        delta = [{"op": op, "path": "/a", "from": "/b", "value": 1} for op in sorted(PATCH_OPERATIONS)]
+        event = StateDeltaEvent(type=EventType.STATE_DELTA, delta=delta)
+        self.assertTrue(EventEncoder(accept=AGUI_MEDIA_TYPE).encode(event))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import unittest
+
+from ag_ui.core.types import UserMessage, AssistantMessage, ToolMessage, FunctionCall, ToolCall
+from ag_ui.core.events import (
+    EventType,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageChunkEvent,
+    ToolCallStartEvent,
+    StateSnapshotEvent,
+    StateDeltaEvent,
+    MessagesSnapshotEvent,
+    RawEvent,
+    CustomEvent,
+    RunStartedEvent,
+    RunErrorEvent,
+    ThinkingStartEvent,
+)
+from ag_ui.proto import encode, decode
+
+
+class TestProto(unittest.TestCase):
+    """Test suite for the protobuf encoding of events"""
+
+    def assertRoundTrip(self, event):
+        """Encode and decode an event and compare it to the original"""
+        decoded = decode(encode(event))
+        self.assertIsInstance(decoded, type(event))
+        self.assertEqual(decoded, event)
+
+    def test_wire_format(self):
+        """Test the encoded bytes match the events.proto wire format"""
+        event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg_1",
+            delta="Hi",
+            timestamp=1
+        )
+        # Event.text_message_content (2) { base_event (1) { type: 1, timestamp: 1 }, message_id, delta }
+        self.assertEqual(
+            encode(event),
+            b"\x12\x11\n\x04\x08\x01\x10\x01\x12\x05msg_1\x1a\x02Hi"
+        )
+
+    def test_text_message_events(self):
+        """Test round-tripping text message events"""
+        self.assertRoundTrip(TextMessageStartEvent(
+            type=EventType.TEXT_MESSAGE_START,
+            message_id="msg_1",
+            role="assistant",
+            timestamp=1648214400000
+        ))
+        self.assertRoundTrip(TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg_1",
+            delta="Hello, wörld! 👋"
+        ))
+
+    def test_chunk_events(self):
+        """Test chunk events, which have no EventType enum value in events.proto"""
+        self.assertRoundTrip(TextMessageChunkEvent(
+            type=EventType.TEXT_MESSAGE_CHUNK,
+            message_id="msg_1",
+            delta=""
+        ))
+
+    def test_optional_fields(self):
+        """Test optional fields are preserved, including empty strings"""
+        self.assertRoundTrip(ToolCallStartEvent(
+            type=EventType.TOOL_CALL_START,
+            tool_call_id="call_1",
+            tool_call_name="search"
+        ))
+        self.assertRoundTrip(ToolCallStartEvent(
+            type=EventType.TOOL_CALL_START,
+            tool_call_id="call_1",
+            tool_call_name="search",
+            parent_message_id=""
+        ))
+        self.assertRoundTrip(RunErrorEvent(
+            type=EventType.RUN_ERROR,
+            message="Something went wrong",
+            code="ERR"
+        ))
+
+    def test_state_events(self):
+        """Test round-tripping state snapshots and JSON patch deltas"""
+        self.assertRoundTrip(StateSnapshotEvent(
+            type=EventType.STATE_SNAPSHOT,
+            snapshot={
+                "counter": 42,
+                "ratio": 0.5,
+                "items": ["apple", None, True, False],
+                "nested": {"empty": {}, "list": []}
+            },
+            raw_event={"source": "test"}
+        ))
+        self.assertRoundTrip(StateDeltaEvent(
+            type=EventType.STATE_DELTA,
+            delta=[
+                {"op": "add", "path": "/counter", "value": 1},
+                {"op": "replace", "path": "/items/0", "value": None},
+                {"op": "remove", "path": "/ratio"},
+                {"op": "move", "path": "/b", "from": "/a"},
+            ]
+        ))
+
+    def test_invalid_patch_operation(self):
+        """Test that unknown JSON patch operations are rejected"""
+        event = StateDeltaEvent(
+            type=EventType.STATE_DELTA,
+            delta=[{"op": "merge", "path": "/a", "value": 1}]
+        )
+        with self.assertRaises(ValueError):
+            encode(event)
+
+    def test_messages_snapshot(self):
+        """Test round-tripping messages with and without tool calls"""
+        self.assertRoundTrip(MessagesSnapshotEvent(
+            type=EventType.MESSAGES_SNAPSHOT,
+            messages=[
+                UserMessage(id="msg_1", role="user", content="Hello"),
+                AssistantMessage(
+                    id="msg_2",
+                    role="assistant",
+                    tool_calls=[
+                        ToolCall(
+                            id="call_1",
+                            type="function",
+                            function=FunctionCall(name="search", arguments='{"q": "x"}')
+                        )
+                    ]
+                ),
+                ToolMessage(id="msg_3", role="tool", content="result", tool_call_id="call_1"),
+            ]
+        ))
+
+    def test_run_and_custom_events(self):
+        """Test round-tripping run lifecycle and custom events"""
+        self.assertRoundTrip(RunStartedEvent(
+            type=EventType.RUN_STARTED,
+            thread_id="thread_1",
+            run_id="run_1",
+            timestamp=-1
+        ))
+        self.assertRoundTrip(CustomEvent(
+            type=EventType.CUSTOM,
+            name="PredictState",
+            value=[{"state_key": "steps", "tool": "SearchTool"}]
+        ))
+
+    def test_null_values(self):
+        """Test round-tripping events whose required value is null"""
+        self.assertRoundTrip(StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=None))
+        self.assertRoundTrip(RawEvent(type=EventType.RAW, event=None, source="test"))
+        self.assertRoundTrip(CustomEvent(type=EventType.CUSTOM, name="x", value=None))
+
+    def test_unsupported_event_type(self):
+        """Test that events missing from events.proto cannot be encoded"""
+        with self.assertRaises(ValueError):
+            encode(ThinkingStartEvent(type=EventType.THINKING_START))
+
+    def test_decode_invalid_data(self):
+        """Test that data without an event is rejected"""
+        with self.assertRaises(ValueError):
+            decode(b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import unittest
+import random
+from unittest import mock
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel
+
+from ag_ui.core.types import UserMessage, AssistantMessage, FunctionCall, ToolCall
+from ag_ui.core.events import (
+    EventType,
+    BaseEvent,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageChunkEvent,
+    ThinkingTextMessageStartEvent,
+    ThinkingTextMessageContentEvent,
+    ThinkingTextMessageEndEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    ToolCallChunkEvent,
+    ToolCallResultEvent,
+    ThinkingStartEvent,
+    ThinkingEndEvent,
+    StateSnapshotEvent,
+    StateDeltaEvent,
+    MessagesSnapshotEvent,
+    RawEvent,
+    CustomEvent,
+    RunStartedEvent,
+    RunFinishedEvent,
+    RunErrorEvent,
+    StepStartedEvent,
+    StepFinishedEvent,
+)
+from ag_ui.encoder import serializer
+from ag_ui.encoder.serializer import serialize, get_serializer
+
+
+class Color(str, Enum):
+    """A string enum used as a free-form value"""
+    RED = "red"
+
+
+class Recipe(BaseModel):
+    """A pydantic model used as a free-form value"""
+    title: str
+    skill_level: str = None
+
+
+class TestSerializer(unittest.TestCase):
+    """Test suite for the fast event serializers"""
+
+    def assertSameAsPydantic(self, event):
+        """Compare the fast serializer output to pydantic's"""
+        self.assertEqual(
+            serialize(event),
+            event.model_dump_json(by_alias=True, exclude_none=True)
+        )
+
+    def test_all_event_types(self):
+        """Test every event class against model_dump_json"""
+        text = 'He said "hi" \\ \n\t\r\b\f \x00\x1f\x7f é 👋  '
+        events = [
+            BaseEvent(type=EventType.RAW),
+            TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id="m", role="assistant"),
+            TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta=text),
+            TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="m", timestamp=1648214400000),
+            TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, delta=text),
+            ThinkingTextMessageStartEvent(type=EventType.THINKING_TEXT_MESSAGE_START),
+            ThinkingTextMessageContentEvent(type=EventType.THINKING_TEXT_MESSAGE_CONTENT, delta=text),
+            ThinkingTextMessageEndEvent(type=EventType.THINKING_TEXT_MESSAGE_END),
+            ToolCallStartEvent(type=EventType.TOOL_CALL_START, tool_call_id="t", tool_call_name="n"),
+            ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="t", delta='{"a": 1}'),
+            ToolCallEndEvent(type=EventType.TOOL_CALL_END, tool_call_id="t", timestamp=-1),
+            ToolCallChunkEvent(type=EventType.TOOL_CALL_CHUNK, tool_call_id="t", delta="{"),
+            ToolCallResultEvent(
+                type=EventType.TOOL_CALL_RESULT, message_id="m", tool_call_id="t", content=text, role="tool"
+            ),
+            ThinkingStartEvent(type=EventType.THINKING_START, title="Thinking"),
+            ThinkingEndEvent(type=EventType.THINKING_END),
+            StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"a": [1, 2.5, None, True, {"b": text}]}),
+            StateDeltaEvent(type=EventType.STATE_DELTA, delta=[{"op": "add", "path": "/a", "value": 1}]),
+            MessagesSnapshotEvent(
+                type=EventType.MESSAGES_SNAPSHOT,
+                messages=[
+                    UserMessage(id="1", role="user", content="Hi"),
+                    AssistantMessage(
+                        id="2",
+                        role="assistant",
+                        tool_calls=[
+                            ToolCall(id="c", type="function", function=FunctionCall(name="f", arguments="{}"))
+                        ]
+                    ),
+                ]
+            ),
+            RawEvent(type=EventType.RAW, event={"x": 1}, source="openai"),
+            CustomEvent(type=EventType.CUSTOM, name="n", value=None),
+            RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r"),
+            RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t", run_id="r"),
+            RunErrorEvent(type=EventType.RUN_ERROR, message=text, code="E"),
+            StepStartedEvent(type=EventType.STEP_STARTED, step_name="s"),
+            StepFinishedEvent(type=EventType.STEP_FINISHED, step_name="s"),
+        ]
+        for event in events:
+            with self.subTest(event=type(event).__name__):
+                self.assertSameAsPydantic(event)
+
+    def test_free_form_values(self):
+        """Test values that JSON libraries disagree on"""
+        values = [
+            1e16, 1.5e300, 1e-7, 5e-324, -0.0, float("nan"), float("inf"),
+            2 ** 63, 2 ** 64, -(2 ** 70),
+            {1: "int key"},
+            Color.RED,
+            datetime(2024, 1, 1, 12, 30),
+            Recipe(title="Soup"),
+            [Recipe(title="Soup", skill_level="Beginner")],
+        ]
+        for value in values:
+            with self.subTest(value=value):
+                self.assertSameAsPydantic(CustomEvent(type=EventType.CUSTOM, name="n", value=value))
+                self.assertSameAsPydantic(
+                    TextMessageContentEvent(
+                        type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="x", raw_event=value
+                    )
+                )
+
+    def test_random_floats(self):
+        """Test random floats against model_dump_json"""
+        rng = random.Random(42)
+        for _ in range(500):
+            value = rng.uniform(-1, 1) * 10 ** rng.randint(-30, 30)
+            self.assertSameAsPydantic(StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"v": value}))
+
+    def test_unvalidated_values(self):
+        """Test values of unexpected types set without validation"""
+        event = TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="x")
+        event.timestamp = True
+        self.assertSameAsPydantic(event)
+
+    def test_without_orjson(self):
+        """Test that free-form values fall back to pydantic without orjson"""
+        with mock.patch.object(serializer, "orjson", None):
+            self.assertSameAsPydantic(
+                StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"a": [1, 2.5, None]})
+            )
+
+    def test_subclass_with_extra_fields(self):
+        """Test subclasses that allow extra fields"""
+
+        class ExtendedEvent(TextMessageContentEvent):
+            """Event that allows extra fields"""
+            model_config = {"extra": "allow"}
+
+        event = ExtendedEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="x", source_node="agent"
+        )
+        self.assertSameAsPydantic(event)
+
+    def test_serializer_is_cached(self):
+        """Test that serializers are built once per class"""
+        self.assertIs(get_serializer(TextMessageContentEvent), get_serializer(TextMessageContentEvent))
+
+
+if __name__ == "__main__":
+    unittest.main()
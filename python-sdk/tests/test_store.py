@@ -0,0 +1,94 @@
+import unittest
+
+from ag_ui.core import (
+    AssistantMessage,
+    DeveloperMessage,
+    FunctionCall,
+    MessageStore,
+    SystemMessage,
+    ToolCall,
+    ToolMessage,
+    UserMessage,
+)
+
+
+def messages():
+    """Create one message of each role"""
+    return [
+        DeveloperMessage(id="1", role="developer", content="Be brief"),
+        SystemMessage(id="2", role="system", content="You are a travel agent"),
+        UserMessage(id="3", role="user", content="Find a hotel", name="alice"),
+        AssistantMessage(
+            id="4",
+            role="assistant",
+            tool_calls=[ToolCall(
+                id="call_1",
+                type="function",
+                function=FunctionCall(name="search", arguments='{"city": "Berlin"}'),
+            )],
+        ),
+        ToolMessage(id="5", role="tool", content="Hotel Adlon", tool_call_id="call_1"),
+        AssistantMessage(id="6", role="assistant", content="Try Hotel Adlon"),
+    ]
+
+
+class TestMessageStore(unittest.TestCase):
+    """Test suite for MessageStore"""
+
+    def test_round_trip(self):
+        """Test that messages read from the store equal the messages stored"""
+        store = MessageStore(messages())
+        self.assertEqual(len(store), 6)
+        self.assertEqual(store.to_messages(), messages())
+        self.assertEqual(list(store), messages())
+        self.assertEqual(
+            [message.model_dump_json(by_alias=True, exclude_none=True) for message in store],
+            [message.model_dump_json(by_alias=True, exclude_none=True) for message in messages()],
+        )
+
+    def test_indexing(self):
+        """Test that messages can be read by index and slice"""
+        store = MessageStore(messages())
+        self.assertEqual(store[0], messages()[0])
+        self.assertEqual(store[-1], messages()[-1])
+        self.assertEqual(store[2:4], messages()[2:4])
+        self.assertIsInstance(store[4], ToolMessage)
+        with self.assertRaises(IndexError):
+            store[6]
+        self.assertEqual(store.role(3), "assistant")
+        self.assertEqual(store.message_id(3), "4")
+
+    def test_append(self):
+        """Test that messages can be appended and cleared"""
+        store = MessageStore()
+        for message in messages():
+            store.append(message)
+        self.assertEqual(store.to_messages(), messages())
+        store.clear()
+        self.assertEqual(len(store), 0)
+        store.extend(messages()[3:])
+        self.assertEqual(store.to_messages(), messages()[3:])
+
+    def test_copies(self):
+        """Test that changes to a message read from the store are not stored"""
+        store = MessageStore(messages())
+        message = store[5]
+        message.content = "changed"
+        self.assertEqual(store[5].content, "Try Hotel Adlon")
+
+    def test_interned_names(self):
+        """Test that tool names are shared between messages"""
+        name = "".join(["sea", "rch"])
+        store = MessageStore([
+            AssistantMessage(
+                id=str(i),
+                role="assistant",
+                tool_calls=[ToolCall(id=f"call_{i}", type="function", function=FunctionCall(name=name, arguments="{}"))],
+            )
+            for i in range(2)
+        ])
+        self.assertIs(store[0].tool_calls[0].function.name, store[1].tool_calls[0].function.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+import unittest
+import copy
+from typing import Any, List
+
+from pydantic import BaseModel, Field
+
+from ag_ui.core.events import EventType
+from ag_ui.patch import StateTracker, TrackedDict, TrackedList, TrackedModel, apply_patch
+
+
+class Plan(BaseModel):
+    steps: List[Any] = Field(default_factory=list)
+    title: str = ""
+
+
+class AgentState(BaseModel):
+    messages: List[Any] = Field(default_factory=list)
+    plan: Plan = Field(default_factory=Plan)
+
+
+class TestStateTracker(unittest.TestCase):
+    """Test suite for StateTracker"""
+
+    def assertReplays(self, tracker, change):
+        """Asserts that the patch of a change turns the previous snapshot into the document"""
+        before = tracker.snapshot()
+        change(tracker.state)
+        patch = tracker.patch()
+        self.assertEqual(apply_patch(copy.deepcopy(before), patch), tracker.snapshot())
+        return patch
+
+    def test_dict(self):
+        """Test that dict changes are recorded with their path"""
+        tracker = StateTracker({"a": {"b": 1}})
+
+        def change(state):
+            state["a"]["b"] = 2
+            state["a"]["c"] = [1]
+            del state["a"]["b"]
+            state["d"] = None
+
+        patch = self.assertReplays(tracker, change)
+        self.assertEqual(patch, [
+            {"op": "add", "path": "/a/c", "value": [1]},
+            {"op": "remove", "path": "/a/b"},
+            {"op": "add", "path": "/d", "value": None},
+        ])
+        self.assertEqual(tracker.document, {"a": {"c": [1]}, "d": None})
+
+    def test_list(self):
+        """Test that list changes are recorded, appends at the end"""
+        tracker = StateTracker({"items": [1, 2, 3]})
+
+        def change(state):
+            items = state["items"]
+            items.append(4)
+            items.insert(0, 0)
+            items[1] = 10
+            self.assertEqual(items.pop(), 4)
+            items.remove(3)
+
+        patch = self.assertReplays(tracker, change)
+        self.assertEqual(patch[0], {"op": "add", "path": "/items/-", "value": 4})
+        self.assertEqual(tracker.document, {"items": [0, 10, 2]})
+
+    def test_shifted_elements(self):
+        """Test that held proxies follow their element when the list shifts"""
+        tracker = StateTracker({"steps": [{"status": "pending"} for _ in range(3)]})
+
+        def change(state):
+            last = state["steps"][2]
+            state["steps"].insert(0, {"status": "new"})
+            del state["steps"][1]
+            last["status"] = "completed"
+
+        patch = self.assertReplays(tracker, change)
+        self.assertEqual(patch[-1], {"op": "replace", "path": "/steps/2/status", "value": "completed"})
+
+    def test_slices_and_sort(self):
+        """Test that slice assignments and sorts replace the list"""
+        tracker = StateTracker({"items": [3, 1, 2]})
+
+        def change(state):
+            state["items"].sort()
+            state["items"][1:] = [5, 6, 7]
+
+        patch = self.assertReplays(tracker, change)
+        self.assertEqual(patch, [{"op": "replace", "path": "/items", "value": [1, 5, 6, 7]}])
+
+    def test_detached_container(self):
+        """Test that changes to a container removed from the document are not recorded"""
+        tracker = StateTracker({"a": {"b": 1}})
+        held = tracker.state["a"]
+        del tracker.state["a"]
+        tracker.patch()
+        held["b"] = 2
+        self.assertFalse(tracker.pending)
+
+    def test_assigned_proxy_is_copied(self):
+        """Test that assigning a proxy does not share its container between two paths"""
+        tracker = StateTracker({"a": {"b": 1}})
+
+        def change(state):
+            state["c"] = state["a"]
+            state["a"]["b"] = 2
+
+        self.assertReplays(tracker, change)
+        self.assertEqual(tracker.document, {"a": {"b": 2}, "c": {"b": 1}})
+
+    def test_setdefault(self):
+        """Test that setdefault returns a tracked value"""
+        tracker = StateTracker({})
+
+        def change(state):
+            state.setdefault("items", []).append(1)
+
+        self.assertReplays(tracker, change)
+        self.assertEqual(tracker.document, {"items": [1]})
+
+    def test_proxies(self):
+        """Test the proxy types and comparisons"""
+        tracker = StateTracker({"a": {}, "b": [], "c": 1})
+        state = tracker.state
+        self.assertIsInstance(state, TrackedDict)
+        self.assertIsInstance(state["b"], TrackedList)
+        self.assertEqual(state["c"], 1)
+        self.assertEqual(state, {"a": {}, "b": [], "c": 1})
+        self.assertEqual(len(state), 3)
+        self.assertIn("a", state)
+
+    def test_model(self):
+        """Test that pydantic model fields are tracked as attributes"""
+        tracker = StateTracker(AgentState())
+
+        def change(state):
+            self.assertIsInstance(state, TrackedModel)
+            state.messages.append({"role": "user", "content": "hi"})
+            state.plan.steps.append({"status": "pending"})
+            state.plan.title = "Plan"
+
+        patch = self.assertReplays(tracker, change)
+        self.assertEqual(patch[-1], {"op": "replace", "path": "/plan/title", "value": "Plan"})
+
+        def replace_plan(state):
+            state.plan = Plan(title="Other")
+
+        patch = self.assertReplays(tracker, replace_plan)
+        self.assertEqual(patch, [{"op": "replace", "path": "/plan", "value": {"steps": [], "title": "Other"}}])
+        with self.assertRaises(AttributeError):
+            del tracker.state.plan
+
+    def test_events(self):
+        """Test delta and snapshot events"""
+        tracker = StateTracker({"count": 0})
+        self.assertIsNone(tracker.delta_event())
+
+        tracker.state["count"] = 1
+        tracker.state["count"] = 2
+        self.assertTrue(tracker.pending)
+        event = tracker.delta_event()
+        self.assertEqual(event.type, EventType.STATE_DELTA)
+        self.assertEqual(event.delta, [{"op": "replace", "path": "/count", "value": 2}])
+        self.assertFalse(tracker.pending)
+
+        tracker.state["count"] = 3
+        event = tracker.snapshot_event()
+        self.assertEqual(event.type, EventType.STATE_SNAPSHOT)
+        self.assertEqual(event.snapshot, {"count": 3})
+        self.assertIsNone(tracker.delta_event())
+
+    def test_recorded_values_are_copied(self):
+        """Test that later changes do not alter recorded operations"""
+        tracker = StateTracker({})
+        item = {"status": "pending"}
+        tracker.state["item"] = item
+        item["status"] = "completed"
+        self.assertEqual(tracker.patch(), [{"op": "add", "path": "/item", "value": {"status": "pending"}}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import unittest
+
+from pydantic import ValidationError
+
+from ag_ui.core import set_trusted_validation
+from ag_ui.core.types import UserMessage, AssistantMessage, ToolCall, FunctionCall
+from ag_ui.core.events import (
+    EventType,
+    TextMessageContentEvent,
+    TextMessageChunkEvent,
+    ToolCallArgsEvent,
+    StateSnapshotEvent,
+    MessagesSnapshotEvent,
+)
+from ag_ui.encoder import EventEncoder
+
+
+class TestTrusted(unittest.TestCase):
+    """Test suite for trusted construction"""
+
+    def tearDown(self):
+        set_trusted_validation(False)
+
+    def test_same_as_validated(self):
+        """Test that trusted instances equal validated ones"""
+        pairs = [
+            (
+                TextMessageContentEvent.trusted(message_id="m", delta="Hello"),
+                TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="Hello"),
+            ),
+            (
+                TextMessageChunkEvent.trusted(delta="x", timestamp=1),
+                TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, delta="x", timestamp=1),
+            ),
+            (
+                ToolCallArgsEvent.trusted(type=EventType.TOOL_CALL_ARGS, tool_call_id="c", delta="{"),
+                ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="c", delta="{"),
+            ),
+            (
+                StateSnapshotEvent.trusted(snapshot={"a": 1}),
+                StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"a": 1}),
+            ),
+            (
+                UserMessage.trusted(id="1", content="Hi"),
+                UserMessage(id="1", role="user", content="Hi"),
+            ),
+        ]
+        encoder = EventEncoder()
+        for trusted, validated in pairs:
+            with self.subTest(model=type(validated).__name__):
+                self.assertIs(type(trusted), type(validated))
+                self.assertEqual(trusted, validated)
+                self.assertEqual(list(trusted.__dict__), list(validated.__dict__))
+                self.assertEqual(trusted.model_fields_set, validated.model_fields_set)
+                self.assertEqual(trusted.model_dump_json(by_alias=True), validated.model_dump_json(by_alias=True))
+                if isinstance(validated, StateSnapshotEvent):
+                    self.assertEqual(encoder.encode(trusted), encoder.encode(validated))
+
+    def test_nested_models(self):
+        """Test that trusted models can be nested"""
+        message = AssistantMessage.trusted(
+            id="2",
+            tool_calls=[ToolCall.trusted(id="c", function=FunctionCall.trusted(name="f", arguments="{}"))],
+        )
+        event = MessagesSnapshotEvent.trusted(messages=[message])
+        self.assertEqual(
+            event,
+            MessagesSnapshotEvent(type=EventType.MESSAGES_SNAPSHOT, messages=[message.model_dump()])
+        )
+
+    def test_skips_validation(self):
+        """Test that values are not validated"""
+        event = TextMessageContentEvent.trusted(message_id=1, delta="")
+        self.assertEqual(event.message_id, 1)
+        self.assertEqual(event.delta, "")
+
+    def test_rejects_unknown_and_missing_fields(self):
+        """Test that field names are still checked"""
+        with self.assertRaises(TypeError):
+            TextMessageContentEvent.trusted(message_id="m", delta="x", messageId="m")
+        with self.assertRaises(TypeError):
+            TextMessageContentEvent.trusted(message_id="m")
+
+    def test_assignment(self):
+        """Test that fields of trusted instances can be reassigned"""
+        event = TextMessageContentEvent.trusted(message_id="m", delta="x")
+        event.timestamp = 1
+        self.assertIn("timestamp", event.model_fields_set)
+
+    def test_validation_flag(self):
+        """Test that validation can be turned back on"""
+        set_trusted_validation(True)
+        with self.assertRaises(ValidationError):
+            TextMessageContentEvent.trusted(message_id=1, delta="x")
+        with self.assertRaises(ValueError):
+            TextMessageContentEvent.trusted(message_id="m", delta="")
+        self.assertEqual(
+            TextMessageContentEvent.trusted(message_id="m", delta="x"),
+            TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="x")
+        )
+
+        set_trusted_validation(False)
+        self.assertEqual(TextMessageContentEvent.trusted(message_id=1, delta="x").message_id, 1)
+
+    def test_subclasses(self):
+        """Test that subclasses get their own constructor"""
+
+        class LabeledEvent(TextMessageContentEvent):
+            """Event with an extra field"""
+            label: str = "none"
+
+        TextMessageContentEvent.trusted(message_id="m", delta="x")
+        event = LabeledEvent.trusted(message_id="m", delta="x")
+        self.assertIs(type(event), LabeledEvent)
+        self.assertEqual(event.label, "none")
+
+        class ExtendedEvent(TextMessageContentEvent):
+            """Event that allows extra fields"""
+            model_config = {"extra": "allow"}
+
+        event = ExtendedEvent.trusted(message_id="m", delta="x", source="agent")
+        self.assertEqual(event.source, "agent")
+
+    def test_field_names_of_constructor(self):
+        """Test that fields named like the names the constructor uses are assigned"""
+
+        class NamedEvent(TextMessageContentEvent):
+            """Event with fields named like the constructor's own names"""
+            cls: str
+            instance: str = "default"
+            new: int = 0
+            fields_set: list = []
+            deepcopy: dict = {}
+            set_attribute: bool = False
+            MISSING: str = "missing"
+
+        event = NamedEvent.trusted(message_id="m", delta="x", cls="c", instance="i", fields_set=[1])
+        self.assertIs(type(event), NamedEvent)
+        self.assertEqual(event, NamedEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="x", cls="c", instance="i", fields_set=[1]
+        ))
+        self.assertEqual(event.model_fields_set, {"type", "message_id", "delta", "cls", "instance", "fields_set"})
+        self.assertEqual(NamedEvent.trusted(message_id="m", delta="x", cls="c").deepcopy, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
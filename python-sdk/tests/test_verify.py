@@ -0,0 +1,245 @@
+import unittest
+from unittest import mock
+
+from ag_ui.core.events import (
+    EventType,
+    RunStartedEvent,
+    RunFinishedEvent,
+    RunErrorEvent,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    StepStartedEvent,
+    StepFinishedEvent,
+    ThinkingStartEvent,
+    ThinkingEndEvent,
+    ThinkingTextMessageStartEvent,
+    ThinkingTextMessageContentEvent,
+    ThinkingTextMessageEndEvent,
+    RawEvent,
+    StateSnapshotEvent,
+)
+from ag_ui.verify import EventVerifier, VerificationError, verify_events
+
+RUN_STARTED = RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r")
+RUN_FINISHED = RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t", run_id="r")
+RUN_ERROR = RunErrorEvent(type=EventType.RUN_ERROR, message="boom")
+
+
+def message(message_id="m", delta="Hi"):
+    """Create the events of a text message"""
+    return [
+        TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id=message_id, role="assistant"),
+        TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id=message_id, delta=delta),
+        TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id=message_id),
+    ]
+
+
+def tool_call(tool_call_id="c"):
+    """Create the events of a tool call"""
+    return [
+        ToolCallStartEvent(type=EventType.TOOL_CALL_START, tool_call_id=tool_call_id, tool_call_name="f"),
+        ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id=tool_call_id, delta="{}"),
+        ToolCallEndEvent(type=EventType.TOOL_CALL_END, tool_call_id=tool_call_id),
+    ]
+
+
+def step(name, finished=False):
+    """Create a step event"""
+    if finished:
+        return StepFinishedEvent(type=EventType.STEP_FINISHED, step_name=name)
+    return StepStartedEvent(type=EventType.STEP_STARTED, step_name=name)
+
+
+def verify(events):
+    """Verify a complete run"""
+    verifier = EventVerifier()
+    for event in events:
+        verifier.verify(event)
+    verifier.close()
+
+
+async def agen(events):
+    """Yield events asynchronously"""
+    for event in events:
+        yield event
+
+
+class TestEventVerifier(unittest.TestCase):
+    """Test suite for EventVerifier"""
+
+    def assertRejected(self, events, text):
+        """Assert that verifying the events raises an error containing text"""
+        with self.assertRaises(VerificationError) as context:
+            verify(events)
+        self.assertIn(text, str(context.exception))
+
+    def test_valid_run(self):
+        """Test that a complete run passes"""
+        verify([
+            RUN_STARTED,
+            step("plan"),
+            *message("m1"),
+            RawEvent(type=EventType.RAW, event={}),
+            *tool_call("c1"),
+            StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={}),
+            ThinkingStartEvent(type=EventType.THINKING_START),
+            ThinkingTextMessageStartEvent(type=EventType.THINKING_TEXT_MESSAGE_START),
+            ThinkingTextMessageContentEvent(type=EventType.THINKING_TEXT_MESSAGE_CONTENT, delta="hm"),
+            ThinkingTextMessageEndEvent(type=EventType.THINKING_TEXT_MESSAGE_END),
+            ThinkingEndEvent(type=EventType.THINKING_END),
+            *message("m2"),
+            step("plan", finished=True),
+            RUN_FINISHED,
+            RUN_ERROR,
+        ])
+
+    def test_raw_inside_message_and_tool_call(self):
+        """Test that raw events are allowed inside messages and tool calls"""
+        raw = RawEvent(type=EventType.RAW, event={})
+        start, content, end = message()
+        verify([RUN_STARTED, start, raw, content, end, RUN_FINISHED])
+        start, args, end = tool_call()
+        verify([RUN_STARTED, start, raw, args, end, RUN_FINISHED])
+
+    def test_first_event(self):
+        """Test that a run must start with RUN_STARTED or RUN_ERROR"""
+        self.assertRejected([*message()], "First event must be 'RUN_STARTED'")
+        verify([RUN_ERROR])
+
+    def test_multiple_run_started(self):
+        """Test that RUN_STARTED is only sent once"""
+        self.assertRejected([RUN_STARTED, RUN_STARTED], "Cannot send multiple 'RUN_STARTED' events")
+
+    def test_after_finished(self):
+        """Test that only RUN_ERROR may follow RUN_FINISHED"""
+        self.assertRejected(
+            [RUN_STARTED, RUN_FINISHED, *message()],
+            "The run has already finished with 'RUN_FINISHED'"
+        )
+
+    def test_after_error(self):
+        """Test that nothing may follow RUN_ERROR"""
+        self.assertRejected([RUN_STARTED, RUN_ERROR, RUN_FINISHED], "The run has already errored")
+
+    def test_interleaved_message(self):
+        """Test that other events are rejected inside a text message"""
+        start, content, end = message()
+        self.assertRejected([RUN_STARTED, start, tool_call()[0]], "after 'TEXT_MESSAGE_START'")
+        self.assertRejected([RUN_STARTED, start, *message("m2")], "after 'TEXT_MESSAGE_START'")
+        self.assertRejected([RUN_STARTED, start, content, RUN_FINISHED, end], "after 'TEXT_MESSAGE_START'")
+
+    def test_message_id_mismatch(self):
+        """Test that message content and end must match the open message"""
+        start, _, _ = message("m1")
+        _, content, end = message("m2")
+        self.assertRejected([RUN_STARTED, start, content], "Message ID mismatch")
+        self.assertRejected([RUN_STARTED, start, end], "Message ID mismatch")
+
+    def test_message_not_started(self):
+        """Test that message content and end need an open message"""
+        _, content, end = message()
+        self.assertRejected([RUN_STARTED, content], "No active text message found")
+        self.assertRejected([RUN_STARTED, end], "No active text message found")
+
+    def test_nested_tool_call(self):
+        """Test that tool calls do not nest or interleave"""
+        self.assertRejected(
+            [RUN_STARTED, tool_call("c1")[0], tool_call("c2")[0]],
+            "A tool call is already in progress"
+        )
+        self.assertRejected([RUN_STARTED, tool_call()[0], *message()], "after 'TOOL_CALL_START'")
+
+    def test_tool_call_id_mismatch(self):
+        """Test that tool call args and end must match the open tool call"""
+        start = tool_call("c1")[0]
+        _, args, end = tool_call("c2")
+        self.assertRejected([RUN_STARTED, start, args], "Tool call ID mismatch")
+        self.assertRejected([RUN_STARTED, start, end], "Tool call ID mismatch")
+        self.assertRejected([RUN_STARTED, args], "No active tool call found")
+        self.assertRejected([RUN_STARTED, end], "No active tool call found")
+
+    def test_steps(self):
+        """Test that steps are started once and finished after starting"""
+        self.assertRejected([RUN_STARTED, step("a"), step("a")], 'Step "a" is already active')
+        self.assertRejected([RUN_STARTED, step("a", finished=True)], 'step "a" that was not started')
+        self.assertRejected(
+            [RUN_STARTED, step("a"), step("b"), RUN_FINISHED],
+            "Cannot send 'RUN_FINISHED' while steps are still active: a, b"
+        )
+        verify([RUN_STARTED, step("a"), step("b"), step("a", True), step("b", True), RUN_FINISHED])
+
+    def test_thinking(self):
+        """Test that thinking blocks and messages are opened before use"""
+        start = ThinkingStartEvent(type=EventType.THINKING_START)
+        end = ThinkingEndEvent(type=EventType.THINKING_END)
+        message_start = ThinkingTextMessageStartEvent(type=EventType.THINKING_TEXT_MESSAGE_START)
+        content = ThinkingTextMessageContentEvent(type=EventType.THINKING_TEXT_MESSAGE_CONTENT, delta="x")
+        message_end = ThinkingTextMessageEndEvent(type=EventType.THINKING_TEXT_MESSAGE_END)
+        self.assertRejected([RUN_STARTED, start, start], "A thinking step is already in progress")
+        self.assertRejected([RUN_STARTED, end], "No active thinking step found")
+        self.assertRejected([RUN_STARTED, message_start], "A thinking step is not in progress")
+        self.assertRejected([RUN_STARTED, start, message_start, message_start], "already in progress")
+        self.assertRejected([RUN_STARTED, start, content], "No active thinking message found")
+        self.assertRejected([RUN_STARTED, start, message_end], "No active thinking message found")
+
+    def test_close(self):
+        """Test that a run may not end with open messages, tool calls or steps"""
+        self.assertRejected([RUN_STARTED, message()[0]], "text message 'm' still open")
+        self.assertRejected([RUN_STARTED, tool_call()[0]], "tool call 'c' still open")
+        self.assertRejected([RUN_STARTED, ThinkingStartEvent(type=EventType.THINKING_START)], "thinking step")
+        self.assertRejected([RUN_STARTED, step("a")], "steps are still active: a")
+        verify([RUN_STARTED, step("a"), RUN_ERROR])
+
+    def test_bounded_state(self):
+        """Test that the verifier keeps no state for finished messages"""
+        verifier = EventVerifier()
+        verifier.verify(RUN_STARTED)
+        for i in range(1000):
+            for event in message(f"m{i}"):
+                verifier.verify(event)
+        self.assertIsNone(verifier.active_message_id)
+        self.assertEqual(verifier.active_steps, set())
+
+
+class TestVerifyEvents(unittest.IsolatedAsyncioTestCase):
+    """Test suite for verify_events"""
+
+    async def test_passes_events_through(self):
+        """Test that a valid run is passed through unchanged"""
+        events = [RUN_STARTED, *message(), *tool_call(), RUN_FINISHED]
+        result = [event async for event in verify_events(agen(events))]
+        self.assertEqual(result, events)
+
+    async def test_raises_at_invalid_event(self):
+        """Test that the events before an invalid event are yielded"""
+        seen = []
+        with self.assertRaises(VerificationError):
+            async for event in verify_events(agen([RUN_STARTED, *message(), RUN_STARTED])):
+                seen.append(event)
+        self.assertEqual(len(seen), 4)
+
+    async def test_raises_at_end(self):
+        """Test that an open message at the end of the stream raises"""
+        with self.assertRaises(VerificationError):
+            async for _ in verify_events(agen([RUN_STARTED, message()[0]])):
+                pass
+
+    async def test_sampling(self):
+        """Test that unsampled streams are not verified"""
+        invalid = [*message(), RUN_STARTED]
+        with mock.patch("ag_ui.verify.verify.random.random", return_value=0.5):
+            result = [event async for event in verify_events(agen(invalid), sample_rate=0.1)]
+            self.assertEqual(result, invalid)
+            with self.assertRaises(VerificationError):
+                async for _ in verify_events(agen(invalid), sample_rate=0.6):
+                    pass
+        result = [event async for event in verify_events(agen(invalid), sample_rate=0.0)]
+        self.assertEqual(result, invalid)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,18 +1,27 @@
 from .endpoint import add_crewai_flow_fastapi_endpoint
+from .pool import FlowPool
+from .channel import CHANNEL_METRICS, ChannelMetrics, OverflowPolicy
 from .sdk import (
   CopilotKitState,
   copilotkit_predict_state,
   copilotkit_emit_state,
   copilotkit_stream
 )
+from .executor import copilotkit_run_blocking, set_blocking_executor
 from .enterprise import CrewEnterpriseEventListener
 
 CREW_ENTERPRISE_EVENT_LISTENER = CrewEnterpriseEventListener()
 
 __all__ = [
   "add_crewai_flow_fastapi_endpoint",
+  "FlowPool",
+  "OverflowPolicy",
+  "ChannelMetrics",
+  "CHANNEL_METRICS",
   "CopilotKitState",
   "copilotkit_predict_state",
   "copilotkit_emit_state",
-  "copilotkit_stream"
+  "copilotkit_stream",
+  "copilotkit_run_blocking",
+  "set_blocking_executor",
 ]
@@ -0,0 +1,338 @@
+"""
+The channel that carries the events of a flow run to its endpoint.
+
+The crewai event bus calls listeners synchronously, so listeners cannot wait
+for a slow client. Each run gets an `EventChannel` of its own, resolved through
+`channel_context` and checked against the flow that emitted the event, so
+events of one run can never reach another. When more than `max_size` events
+are queued, the channel applies its `OverflowPolicy`:
+
+- `BLOCK` queues the event, and the flow waits in the next `yield_control()`
+  until the endpoint has taken the queued events.
+- `DROP_DELTAS` drops text and tool call deltas. Once a delta of a message or
+  tool call is dropped, its later deltas are dropped too, and the endpoint
+  sends the messages of the step as a snapshot.
+- `COALESCE_DELTAS` appends a delta to the queued delta of the same message or
+  tool call, when that delta is the last queued event.
+- `LATEST_SNAPSHOT` replaces the queued state snapshots with the new one.
+
+Other events are always queued. `ChannelMetrics` counts the events of every
+channel, and the runs cancelled because their client disconnected with the
+steps and LLM streams they stopped. It can be served with
+`ag_ui.encoder.metrics_app`:
+
+    app.mount("/metrics", metrics_app(CHANNEL_METRICS, prefix="ag_ui_crewai_channel"))
+"""
+import asyncio
+import threading
+from bisect import bisect_left
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, List, Optional, Set
+from weakref import WeakSet
+
+from ag_ui.core import EventType
+
+
+class OverflowPolicy(str, Enum):
+    """
+    What a full channel does with a new event.
+    """
+    BLOCK = "block"
+    DROP_DELTAS = "drop_deltas"
+    COALESCE_DELTAS = "coalesce_deltas"
+    LATEST_SNAPSHOT = "latest_snapshot"
+
+
+class ChannelMetrics:
+    """
+    Metrics of the event channels of a server process.
+
+    Counters include the channels that are still open. `max_depth` holds the
+    number of closed channels whose deepest queue fell into each bucket of
+    `DEPTH_BUCKETS`, with a last count for the deeper ones.
+    """
+    DEPTH_BUCKETS = (1, 4, 16, 64, 256, 1024, 4096)
+    COUNTERS = (
+        "events", "dropped", "coalesced", "replaced", "blocked",
+        "disconnected", "cancelled", "cancelled_steps", "cancelled_streams",
+    )
+
+    def __init__(self):
+        self.channels = 0
+        self._closed = dict.fromkeys(self.COUNTERS, 0)
+        self._open: "WeakSet[EventChannel]" = WeakSet()
+        self.max_depth = [0] * (len(self.DEPTH_BUCKETS) + 1)
+
+    def open(self, channel: "EventChannel") -> None:
+        """
+        Records a new channel.
+        """
+        self.channels += 1
+        self._open.add(channel)
+
+    def close(self, channel: "EventChannel") -> None:
+        """
+        Adds a closed channel to the totals.
+        """
+        if channel not in self._open:
+            return
+        self._open.discard(channel)
+        for name in self.COUNTERS:
+            self._closed[name] += int(getattr(channel, name))
+        self.max_depth[bisect_left(self.DEPTH_BUCKETS, channel.max_depth)] += 1
+
+    @property
+    def open_channels(self) -> int:
+        """
+        The number of channels that are open.
+        """
+        return len(self._open)
+
+    @property
+    def queued(self) -> int:
+        """
+        The number of events queued in the open channels.
+        """
+        return sum(channel.depth for channel in self._open)
+
+    def totals(self) -> dict:
+        """
+        Returns the counters of all channels, including the open ones.
+        """
+        totals = dict(self._closed)
+        for channel in self._open:
+            for name in self.COUNTERS:
+                totals[name] += int(getattr(channel, name))
+        return totals
+
+    def render_prometheus(self, prefix: str = "ag_ui_crewai_channel") -> str:
+        """
+        Returns the metrics in the Prometheus text exposition format.
+        """
+        descriptions = {
+            "events": "Events put into channels.",
+            "dropped": "Deltas dropped by full channels.",
+            "coalesced": "Deltas appended to a queued delta by full channels.",
+            "replaced": "State snapshots replaced by a newer one in full channels.",
+            "blocked": "Times a flow waited for a full channel.",
+            "disconnected": "Runs whose client disconnected before the run finished.",
+            "cancelled": "Runs cancelled before they finished.",
+            "cancelled_steps": "Flow methods that were running when their run was cancelled.",
+            "cancelled_streams": "LLM streams closed before their last chunk by a cancelled run.",
+        }
+        lines = []
+        for name, value in self.totals().items():
+            lines += [
+                f"# HELP {prefix}_{name}_total {descriptions[name]}",
+                f"# TYPE {prefix}_{name}_total counter",
+                f"{prefix}_{name}_total {value}",
+            ]
+        lines += [
+            f"# HELP {prefix}_channels_total Channels opened.",
+            f"# TYPE {prefix}_channels_total counter",
+            f"{prefix}_channels_total {self.channels}",
+            f"# HELP {prefix}_open Channels open.",
+            f"# TYPE {prefix}_open gauge",
+            f"{prefix}_open {self.open_channels}",
+            f"# HELP {prefix}_queued Events queued in open channels.",
+            f"# TYPE {prefix}_queued gauge",
+            f"{prefix}_queued {self.queued}",
+            f"# HELP {prefix}_max_depth Deepest queue of a closed channel.",
+            f"# TYPE {prefix}_max_depth histogram",
+        ]
+        cumulative = 0
+        for bound, count in zip(self.DEPTH_BUCKETS, self.max_depth):
+            cumulative += count
+            lines.append(f'{prefix}_max_depth_bucket{{le="{bound}"}} {cumulative}')
+        cumulative += self.max_depth[-1]
+        lines += [
+            f'{prefix}_max_depth_bucket{{le="+Inf"}} {cumulative}',
+            f"{prefix}_max_depth_count {cumulative}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+CHANNEL_METRICS = ChannelMetrics()
+
+_DELTAS = (EventType.TEXT_MESSAGE_CHUNK, EventType.TOOL_CALL_CHUNK)
+
+
+class EventChannel:
+    """
+    A bounded queue of the events of a single flow run, created on the event
+    loop that sends them.
+
+    ```python
+    channel = EventChannel(flow, max_size=256, overflow=OverflowPolicy.BLOCK)
+    token = channel_context.set(channel)
+    ...
+    for item in await channel.get_all():
+        ...
+    channel.close()
+    ```
+
+    `None` closes the stream and is always queued.
+    """
+
+    def __init__(
+            self,
+            flow: Any,
+            max_size: int = 256,
+            overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+            metrics: Optional[ChannelMetrics] = CHANNEL_METRICS,
+        ):
+        if max_size < 1:
+            raise ValueError("EventChannel max_size must be at least 1")
+        self.flow = flow
+        self.max_size = max_size
+        self.overflow = OverflowPolicy(overflow)
+        self._items: Deque[Any] = deque()
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+        # the messages and tool calls whose later deltas are dropped
+        self._dropping: Set[str] = set()
+        # continuation chunks of a message or tool call may carry no id
+        self._message_id: Optional[str] = None
+        self._tool_call_id: Optional[str] = None
+        self._metrics = metrics
+        self.events = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.replaced = 0
+        self.blocked = 0
+        self.max_depth = 0
+        self.running_steps = 0
+        self.disconnected = False
+        self.cancelled = False
+        self.cancelled_steps = 0
+        self.cancelled_streams = 0
+        if metrics is not None:
+            metrics.open(self)
+
+    @property
+    def depth(self) -> int:
+        """
+        The number of queued events.
+        """
+        return len(self._items)
+
+    @property
+    def full(self) -> bool:
+        """
+        Whether the channel holds `max_size` events or more.
+        """
+        return len(self._items) >= self.max_size
+
+    def put(self, item: Any) -> None:
+        """
+        Queues an event, applying the overflow policy if the channel is full.
+        Never waits, so it can be called from event bus listeners. Events put
+        from other threads, such as blocking work on the executor, are handed
+        to the event loop of the channel.
+        """
+        if threading.get_ident() != self._thread_id:
+            self._loop.call_soon_threadsafe(self.put, item)
+            return
+        self.events += 1
+        event_type = getattr(item, "type", None)
+        if event_type == EventType.STEP_STARTED:
+            self.running_steps += 1
+        elif event_type == EventType.STEP_FINISHED:
+            self.running_steps -= 1
+        if item is not None and not self._admit(item):
+            return
+        self._items.append(item)
+        if len(self._items) > self.max_depth:
+            self.max_depth = len(self._items)
+        self._readable.set()
+        if self.full:
+            self._writable.clear()
+
+    def _admit(self, item: Any) -> bool:
+        """
+        Returns False if the item was dropped or merged into a queued one.
+        """
+        event_type = getattr(item, "type", None)
+        if self.overflow is OverflowPolicy.DROP_DELTAS and event_type in _DELTAS:
+            if event_type == EventType.TEXT_MESSAGE_CHUNK:
+                key = self._message_id = item.message_id or self._message_id
+            else:
+                key = self._tool_call_id = item.tool_call_id or self._tool_call_id
+            if key in self._dropping:
+                self.dropped += 1
+                return False
+            if self.full:
+                if key is not None:
+                    self._dropping.add(key)
+                self.dropped += 1
+                return False
+            return True
+        if not self.full:
+            return True
+        if self.overflow is OverflowPolicy.COALESCE_DELTAS and event_type in _DELTAS:
+            if self._items and _coalesce(self._items[-1], item):
+                self.coalesced += 1
+                return False
+        elif self.overflow is OverflowPolicy.LATEST_SNAPSHOT and event_type == EventType.STATE_SNAPSHOT:
+            kept = deque(
+                queued for queued in self._items
+                if getattr(queued, "type", None) != EventType.STATE_SNAPSHOT
+            )
+            self.replaced += len(self._items) - len(kept)
+            self._items = kept
+        return True
+
+    async def wait_writable(self) -> None:
+        """
+        Waits until a full channel with the `BLOCK` policy has room again.
+        """
+        if self.overflow is OverflowPolicy.BLOCK and self.full:
+            self.blocked += 1
+            await self._writable.wait()
+
+    async def get_all(self) -> List[Any]:
+        """
+        Waits for the next event, then takes every queued event.
+        """
+        while not self._items:
+            self._readable.clear()
+            await self._readable.wait()
+        items = list(self._items)
+        self._items.clear()
+        self._writable.set()
+        return items
+
+    def cancel(self) -> None:
+        """
+        Records that the run is cancelled before it finished.
+        """
+        self.cancelled = True
+        self.cancelled_steps = self.running_steps
+
+    def close(self) -> None:
+        """
+        Releases waiting producers and adds the channel to the metrics.
+        """
+        self._items.clear()
+        self._writable.set()
+        if self._metrics is not None:
+            self._metrics.close(self)
+
+
+def _coalesce(last: Any, item: Any) -> bool:
+    """
+    Appends the delta of item to last if both belong to the same stream.
+    """
+    if getattr(last, "type", None) != item.type or item.delta is None:
+        return False
+    if item.type == EventType.TEXT_MESSAGE_CHUNK:
+        if item.message_id not in (None, last.message_id):
+            return False
+    elif item.tool_call_id not in (None, last.tool_call_id) or item.tool_call_name not in (None, last.tool_call_name):
+        return False
+    last.delta = (last.delta or "") + item.delta
+    return True
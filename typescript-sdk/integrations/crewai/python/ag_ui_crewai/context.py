@@ -3,5 +3,7 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from crewai.flow.flow import Flow
+    from .channel import EventChannel
 
 flow_context: contextvars.ContextVar['Flow'] = contextvars.ContextVar('flow')
+channel_context: contextvars.ContextVar['EventChannel'] = contextvars.ContextVar('channel')
@@ -11,11 +11,12 @@ from crewai.cli.crew_chat import (
   build_system_message as crew_chat_build_system_message,
   create_tool_function as crew_chat_create_tool_function
 )
-from litellm import completion
+from litellm import acompletion
 from .sdk import (
   copilotkit_stream,
   copilotkit_exit,
 )
+from .executor import copilotkit_run_blocking
 
 _CREW_INPUTS_CACHE = {}
 
@@ -90,7 +91,7 @@ class ChatWithCrewFlow(Flow):
         tools += [self.crew_tool_schema, CREW_EXIT_TOOL]
 
         response = await copilotkit_stream(
-            completion(
+            acompletion(
                 model=self.crew.chat_llm,
                 messages=messages,
                 tools=tools,
@@ -107,7 +108,8 @@ class ChatWithCrewFlow(Flow):
                 # run the crew
                 crew_function = crew_chat_create_tool_function(self.crew, messages)
                 args = json.loads(message["tool_calls"][0]["function"]["arguments"])
-                result = crew_function(**args)
+                # the crew runs for minutes, so it runs off the event loop
+                result = await copilotkit_run_blocking(crew_function, **args)
 
                 if isinstance(result, str):
                     self.state["outputs"] = result
@@ -132,7 +134,7 @@ class ChatWithCrewFlow(Flow):
                 })
 
                 response = await copilotkit_stream(
-                    completion( # pylint: disable=too-many-arguments
+                    acompletion( # pylint: disable=too-many-arguments
                         model=self.crew.chat_llm,
                         messages = [
                             {
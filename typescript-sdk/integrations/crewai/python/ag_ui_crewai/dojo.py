@@ -1,8 +1,11 @@
 import os
 import uvicorn
 from fastapi import FastAPI
+from ag_ui.encoder import metrics_app
 
 from .endpoint import add_crewai_flow_fastapi_endpoint
+from .pool import FlowPool
+from .channel import CHANNEL_METRICS
 from .examples.agentic_chat import AgenticChatFlow
 from .examples.human_in_the_loop import HumanInTheLoopFlow
 from .examples.tool_based_generative_ui import ToolBasedGenerativeUIFlow
@@ -14,40 +17,43 @@ app = FastAPI(title="CrewAI Dojo Example Server")
 
 add_crewai_flow_fastapi_endpoint(
     app=app,
-    flow=AgenticChatFlow(),
+    flow=FlowPool(AgenticChatFlow),
     path="/agentic_chat",
 )
 
 add_crewai_flow_fastapi_endpoint(
     app=app,
-    flow=HumanInTheLoopFlow(),
+    flow=FlowPool(HumanInTheLoopFlow),
     path="/human_in_the_loop",
 )
 
 add_crewai_flow_fastapi_endpoint(
     app=app,
-    flow=ToolBasedGenerativeUIFlow(),
+    flow=FlowPool(ToolBasedGenerativeUIFlow),
     path="/tool_based_generative_ui",
 )
 
 add_crewai_flow_fastapi_endpoint(
     app=app,
-    flow=AgenticGenerativeUIFlow(),
+    flow=FlowPool(AgenticGenerativeUIFlow),
     path="/agentic_generative_ui",
 )
 
 add_crewai_flow_fastapi_endpoint(
     app=app,
-    flow=SharedStateFlow(),
+    flow=FlowPool(SharedStateFlow),
     path="/shared_state",
 )
 
 add_crewai_flow_fastapi_endpoint(
     app=app,
-    flow=PredictiveStateUpdatesFlow(),
+    flow=FlowPool(PredictiveStateUpdatesFlow),
     path="/predictive_state_updates",
 )
 
+# Serve the event channel metrics in the Prometheus text format
+app.mount("/metrics", metrics_app(CHANNEL_METRICS, prefix="ag_ui_crewai_channel"))
+
 def main():
     """Run the uvicorn server."""
     port = int(os.getenv("PORT", "8000"))
@@ -3,7 +3,7 @@ AG-UI FastAPI server for CrewAI.
 """
 import copy
 import asyncio
-from typing import List, Optional
+from typing import Awaitable, Callable, List, Optional, Union
 from fastapi import FastAPI, Request
 from fastapi.responses import StreamingResponse
 
@@ -31,11 +31,12 @@ from ag_ui.core.events import (
   ToolCallChunkEvent,
   StepStartedEvent,
   StepFinishedEvent,
-  MessagesSnapshotEvent,
   StateSnapshotEvent,
   CustomEvent,
 )
+from ag_ui.apply import MessagesEmitter
 from ag_ui.encoder import EventEncoder
+from ag_ui.patch import StateEmitter
 
 from .events import (
   BridgedTextMessageChunkEvent,
@@ -43,35 +44,44 @@ from .events import (
   BridgedCustomEvent,
   BridgedStateSnapshotEvent
 )
-from .context import flow_context
-from .sdk import litellm_messages_to_ag_ui_messages
+from .context import flow_context, channel_context
+from .channel import CHANNEL_METRICS, ChannelMetrics, EventChannel, OverflowPolicy
+from .sdk import LiteLLMMessagesConverter
 from .crews import ChatWithCrewFlow
-
-QUEUES = {}
-QUEUES_LOCK = asyncio.Lock()
-
-
-async def create_queue(flow: object) -> asyncio.Queue:
-    """Create a queue for a flow."""
-    queue_id = id(flow)
-    async with QUEUES_LOCK:
-        queue = asyncio.Queue()
-        QUEUES[queue_id] = queue
-        return queue
-
-
-def get_queue(flow: object) -> Optional[asyncio.Queue]:
-    """Get the queue for a flow."""
-    queue_id = id(flow)
-    # not using a lock here should be fine
-    return QUEUES.get(queue_id)
-
-async def delete_queue(flow: object) -> None:
-    """Delete the queue for a flow."""
-    queue_id = id(flow)
-    async with QUEUES_LOCK:
-        if queue_id in QUEUES:
-            del QUEUES[queue_id]
+from .pool import FlowFactory, FlowPool
+
+# how often a run that sends nothing checks whether its client is still connected
+DISCONNECT_POLL_SECONDS = 1.0
+
+def get_channel(flow: object) -> Optional[EventChannel]:
+    """Get the event channel of the run of a flow."""
+    channel = channel_context.get(None)
+    # a flow started by the flow of a run has a run of its own
+    if channel is None or channel.flow is not flow:
+        return None
+    return channel
+
+async def receive_events(channel: EventChannel, request: Request) -> Optional[List]:
+    """
+    Waits for the next events of a run. Returns None if the client
+    disconnected while the flow had nothing to send.
+    """
+    while True:
+        try:
+            return await asyncio.wait_for(channel.get_all(), DISCONNECT_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            if await request.is_disconnected():
+                return None
+
+class FlowMessages:  # pylint: disable=too-few-public-methods
+    """
+    The messages of a flow after a method finished. The endpoint converts them
+    and sends only what the client does not have yet, or a snapshot if the
+    channel had dropped deltas by then.
+    """
+    def __init__(self, messages: list, dropped: int = 0):
+        self.messages = messages
+        self.dropped = dropped
 
 GLOBAL_EVENT_LISTENER = None
 
@@ -82,9 +92,9 @@ class FastAPICrewFlowEventListener(BaseEventListener):
         """Setup listeners for the FastAPI CrewFlow event listener"""
         @crewai_event_bus.on(FlowStartedEvent)
         def _(source, event):  # pylint: disable=unused-argument
-            queue = get_queue(source)
-            if queue is not None:
-                queue.put_nowait(
+            channel = get_channel(source)
+            if channel is not None:
+                channel.put(
                     RunStartedEvent(
                         type=EventType.RUN_STARTED,
                          # will be replaced by the correct thread_id/run_id when sending the event
@@ -94,21 +104,21 @@ class FastAPICrewFlowEventListener(BaseEventListener):
                 )
         @crewai_event_bus.on(FlowFinishedEvent)
         def _(source, event):  # pylint: disable=unused-argument
-            queue = get_queue(source)
-            if queue is not None:
-                queue.put_nowait(
+            channel = get_channel(source)
+            if channel is not None:
+                channel.put(
                     RunFinishedEvent(
                         type=EventType.RUN_FINISHED,
                         thread_id="?",
                         run_id="?",
                     ),
                 )
-                queue.put_nowait(None)
+                channel.put(None)
         @crewai_event_bus.on(MethodExecutionStartedEvent)
         def _(source, event):
-            queue = get_queue(source)
-            if queue is not None:
-                queue.put_nowait(
+            channel = get_channel(source)
+            if channel is not None:
+                channel.put(
                     StepStartedEvent(
                         type=EventType.STEP_STARTED,
                         step_name=event.method_name
@@ -116,23 +126,16 @@ class FastAPICrewFlowEventListener(BaseEventListener):
                 )
         @crewai_event_bus.on(MethodExecutionFinishedEvent)
         def _(source, event):
-            queue = get_queue(source)
-            if queue is not None:
-                messages = litellm_messages_to_ag_ui_messages(source.state.messages)
-
-                queue.put_nowait(
-                    MessagesSnapshotEvent(
-                        type=EventType.MESSAGES_SNAPSHOT,
-                        messages=messages
-                    )
-                )
-                queue.put_nowait(
+            channel = get_channel(source)
+            if channel is not None:
+                channel.put(FlowMessages(list(source.state.messages), channel.dropped))
+                channel.put(
                     StateSnapshotEvent(
                         type=EventType.STATE_SNAPSHOT,
                         snapshot=source.state
                     )
                 )
-                queue.put_nowait(
+                channel.put(
                     StepFinishedEvent(
                         type=EventType.STEP_FINISHED,
                         step_name=event.method_name
@@ -140,9 +143,9 @@ class FastAPICrewFlowEventListener(BaseEventListener):
                 )
         @crewai_event_bus.on(BridgedTextMessageChunkEvent)
         def _(source, event):
-            queue = get_queue(source)
-            if queue is not None:
-                queue.put_nowait(
+            channel = get_channel(source)
+            if channel is not None:
+                channel.put(
                     TextMessageChunkEvent(
                         type=EventType.TEXT_MESSAGE_CHUNK,
                         message_id=event.message_id,
@@ -152,9 +155,9 @@ class FastAPICrewFlowEventListener(BaseEventListener):
                 )
         @crewai_event_bus.on(BridgedToolCallChunkEvent)
         def _(source, event):
-            queue = get_queue(source)
-            if queue is not None:
-                queue.put_nowait(
+            channel = get_channel(source)
+            if channel is not None:
+                channel.put(
                     ToolCallChunkEvent(
                         type=EventType.TOOL_CALL_CHUNK,
                         tool_call_id=event.tool_call_id,
@@ -164,9 +167,9 @@ class FastAPICrewFlowEventListener(BaseEventListener):
                 )
         @crewai_event_bus.on(BridgedCustomEvent)
         def _(source, event):
-            queue = get_queue(source)
-            if queue is not None:
-                queue.put_nowait(
+            channel = get_channel(source)
+            if channel is not None:
+                channel.put(
                     CustomEvent(
                         type=EventType.CUSTOM,
                         name=event.name,
@@ -175,17 +178,53 @@ class FastAPICrewFlowEventListener(BaseEventListener):
                 )
         @crewai_event_bus.on(BridgedStateSnapshotEvent)
         def _(source, event):
-            queue = get_queue(source)
-            if queue is not None:
-                queue.put_nowait(
+            channel = get_channel(source)
+            if channel is not None:
+                channel.put(
                     StateSnapshotEvent(
                         type=EventType.STATE_SNAPSHOT,
                         snapshot=event.snapshot
                     )
                 )
 
-def add_crewai_flow_fastapi_endpoint(app: FastAPI, flow: Flow, path: str = "/"):
-    """Adds a CrewAI endpoint to the FastAPI app."""
+def flow_provider(flow: Union[Flow, FlowFactory, FlowPool]) -> Callable[[], Awaitable[Flow]]:
+    """
+    Returns a function that provides the flow of a run: a copy of a template
+    flow, a flow built by a factory, or a flow taken from a pool. Copies and
+    builds run in a worker thread, so they never block the event loop.
+    """
+    if isinstance(flow, FlowPool):
+        return flow.acquire
+
+    if isinstance(flow, Flow):
+        async def copy_flow() -> Flow:
+            return await asyncio.to_thread(copy.deepcopy, flow)
+        return copy_flow
+
+    async def build_flow() -> Flow:
+        return await asyncio.to_thread(flow)
+    return build_flow
+
+def add_crewai_flow_fastapi_endpoint(  # pylint: disable=too-many-arguments
+        app: FastAPI,
+        flow: Union[Flow, FlowFactory, FlowPool],
+        path: str = "/",
+        *,
+        max_events: int = 256,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        metrics: Optional[ChannelMetrics] = CHANNEL_METRICS,
+    ):
+    """
+    Adds a CrewAI endpoint to the FastAPI app.
+
+    `flow` is a flow that is deep-copied for every run, a function that builds
+    the flow of a run, such as the flow class, or a `FlowPool` of flows built
+    ahead of the runs. Copies and builds run in a worker thread rather than on
+    the event loop; a pool also takes them off the path of the request.
+
+    The events of a run are queued in an `EventChannel` of up to `max_events`
+    events, which applies `overflow` when a slow client lets it fill up.
+    """
     global GLOBAL_EVENT_LISTENER # pylint: disable=global-statement
 
     # Set up the global event listener singleton
@@ -194,17 +233,23 @@ def add_crewai_flow_fastapi_endpoint(app: FastAPI, flow: Flow, path: str = "/"):
     if GLOBAL_EVENT_LISTENER is None:
         GLOBAL_EVENT_LISTENER = FastAPICrewFlowEventListener()
 
+    new_flow = flow_provider(flow)
+
     @app.post(path)
     async def agentic_chat_endpoint(input_data: RunAgentInput, request: Request):
         """Agentic chat endpoint"""
 
-        flow_copy = copy.deepcopy(flow)
+        flow_copy = await new_flow()
 
         # Get the accept header from the request
         accept_header = request.headers.get("accept")
 
-        # Create an event encoder to properly format SSE events
-        encoder = EventEncoder(accept=accept_header)
+        # Create an event encoder to properly format SSE events,
+        # compressed if the client accepts it
+        encoder = EventEncoder(
+            accept=accept_header,
+            accept_encoding=request.headers.get("accept-encoding"),
+        )
 
         inputs = crewai_prepare_inputs(
             state=input_data.state,
@@ -214,40 +259,104 @@ def add_crewai_flow_fastapi_endpoint(app: FastAPI, flow: Flow, path: str = "/"):
         inputs["id"] = input_data.thread_id
 
         async def event_generator():
-            queue = await create_queue(flow_copy)
+            # sends the state snapshots of the flow as deltas when they are smaller
+            state_emitter = StateEmitter()
+            # sends the messages of the flow as they are appended, after a first snapshot
+            messages_emitter = MessagesEmitter()
+            messages_converter = LiteLLMMessagesConverter()
+            # the deltas dropped before the last messages snapshot
+            repaired = 0
+            channel = EventChannel(flow_copy, max_size=max_events, overflow=overflow, metrics=metrics)
             token = flow_context.set(flow_copy)
+            channel_token = channel_context.set(channel)
+            kickoff = asyncio.create_task(flow_copy.kickoff_async(inputs=inputs))
+            # a flow that ends without finishing, e.g. with an error, ends the stream
+            kickoff.add_done_callback(channel.put)
+            finished = False
             try:
-                asyncio.create_task(flow_copy.kickoff_async(inputs=inputs))
-
-                while True:
-                    item = await queue.get()
-                    if item is None:
-                        break
-
-                    if item.type == EventType.RUN_STARTED or item.type == EventType.RUN_FINISHED:
-                        item.thread_id = input_data.thread_id
-                        item.run_id = input_data.run_id
-
-                    yield encoder.encode(item)
-
+                while not finished:
+                    items = await receive_events(channel, request)
+                    if items is None:
+                        channel.disconnected = True
+                        return
+
+                    # send everything that is already queued in a single write
+                    events = []
+                    for item in items:
+                        if item is None:
+                            finished = True
+                            break
+
+                        if item is kickoff:
+                            finished = True
+                            if not kickoff.cancelled() and kickoff.exception() is not None:
+                                raise kickoff.exception()
+                            break
+
+                        if isinstance(item, FlowMessages):
+                            if item.dropped > repaired:
+                                # the snapshot replaces the cut off messages
+                                messages_emitter.reset()
+                                repaired = item.dropped
+                            events.extend(messages_emitter.update(messages_converter.convert(item.messages)))
+                            continue
+
+                        if item.type == EventType.RUN_STARTED or item.type == EventType.RUN_FINISHED:
+                            item.thread_id = input_data.thread_id
+                            item.run_id = input_data.run_id
+
+                        item = state_emitter.emit(item)
+                        if item is not None:
+                            events.extend(messages_emitter.emit(item))
+
+                    if events:
+                        yield encoder.encode_many(events)
+
+            except (asyncio.CancelledError, GeneratorExit):
+                # the server stops sending when the client disconnects
+                channel.disconnected = True
+                raise
             except Exception as e:  # pylint: disable=broad-exception-caught
                 yield encoder.encode(
                     RunErrorEvent(
                         type=EventType.RUN_ERROR,
-                        thread_id=input_data.thread_id,
-                        run_id=input_data.run_id,
-                        error=str(e),
+                        message=str(e),
                     )
                 )
             finally:
-                await delete_queue(flow_copy)
+                channel_context.reset(channel_token)
                 flow_context.reset(token)
+                if finished or kickoff.done():
+                    channel.close()
+                else:
+                    # stops the flow and its LLM stream; the channel is closed
+                    # when the flow has handled the cancellation, so that the
+                    # metrics include the work it stopped
+                    channel.cancel()
+                    kickoff.cancel()
+                    kickoff.add_done_callback(lambda _: channel.close())
+
+            trailer = encoder.finish()
+            if trailer:
+                yield trailer
+
+        headers = {"Vary": "Accept-Encoding"}
+        if encoder.get_content_encoding() is not None:
+            headers["Content-Encoding"] = encoder.get_content_encoding()
+
+        return StreamingResponse(
+            event_generator(),
+            media_type=encoder.get_content_type(),
+            headers=headers,
+        )
 
-        return StreamingResponse(event_generator(), media_type=encoder.get_content_type())
-
-def add_crewai_crew_fastapi_endpoint(app: FastAPI, crew: Crew, path: str = "/"):
-    """Adds a CrewAI crew endpoint to the FastAPI app."""
-    add_crewai_flow_fastapi_endpoint(app, ChatWithCrewFlow(crew=crew), path)
+def add_crewai_crew_fastapi_endpoint(app: FastAPI, crew: Crew, path: str = "/", **options):
+    """
+    Adds a CrewAI crew endpoint to the FastAPI app. `options` are passed to
+    `add_crewai_flow_fastapi_endpoint`.
+    """
+    # building a crew flow deep-copies the crew, so flows are built off the request path
+    add_crewai_flow_fastapi_endpoint(app, FlowPool(lambda: ChatWithCrewFlow(crew=crew)), path, **options)
 
 
 def crewai_prepare_inputs(  # pylint: disable=unused-argument, too-many-arguments
@@ -3,7 +3,7 @@ A simple agentic chat flow.
 """
 
 from crewai.flow.flow import Flow, start
-from litellm import completion
+from litellm import acompletion
 from ..sdk import copilotkit_stream, CopilotKitState
 
 class AgenticChatFlow(Flow[CopilotKitState]):
@@ -13,10 +13,10 @@ class AgenticChatFlow(Flow[CopilotKitState]):
         system_prompt = "You are a helpful assistant."
 
         # 1. Run the model and stream the response
-        #    Note: In order to stream the response, wrap the completion call in
+        #    Note: In order to stream the response, wrap the acompletion call in
         #    copilotkit_stream and set stream=True.
         response = await copilotkit_stream(
-            completion(
+            acompletion(
 
                 # 1.1 Specify the model to use
                 model="openai/gpt-4o",
@@ -5,7 +5,7 @@ A demo of shared state between the agent and CopilotKit.
 import json
 from enum import Enum
 from typing import List, Optional
-from litellm import completion
+from litellm import acompletion
 from pydantic import BaseModel, Field
 from crewai.flow.flow import Flow, start, router, listen
 from ..sdk import (
@@ -157,10 +157,10 @@ class SharedStateFlow(Flow[AgentState]):
         })
 
         # 2. Run the model and stream the response
-        #    Note: In order to stream the response, wrap the completion call in
+        #    Note: In order to stream the response, wrap the acompletion call in
         #    copilotkit_stream and set stream=True.
         response = await copilotkit_stream(
-            completion(
+            acompletion(
 
                 # 2.1 Specify the model to use
                 model="openai/gpt-4o",
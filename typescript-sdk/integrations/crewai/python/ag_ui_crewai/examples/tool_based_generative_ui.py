@@ -3,7 +3,7 @@ An example demonstrating tool-based generative UI.
 """
 
 from crewai.flow.flow import Flow, start
-from litellm import completion
+from litellm import acompletion
 from ..sdk import copilotkit_stream, CopilotKitState
 
 
@@ -59,10 +59,10 @@ class ToolBasedGenerativeUIFlow(Flow[CopilotKitState]):
 
 
         # 1. Run the model and stream the response
-        #    Note: In order to stream the response, wrap the completion call in
+        #    Note: In order to stream the response, wrap the acompletion call in
         #    copilotkit_stream and set stream=True.
         response = await copilotkit_stream(
-            completion(
+            acompletion(
 
                 # 1.1 Specify the model to use
                 model="openai/gpt-4o",
@@ -0,0 +1,75 @@
+"""
+Runs the blocking work of flows, such as crew kickoffs and reads of sync LLM
+streams, on a bounded executor instead of the event loop.
+
+Flow methods run on the server's event loop, so a crew kickoff called from a
+method stalls every other stream of the worker until the crew finishes.
+`copilotkit_run_blocking` runs a function on the blocking executor and awaits
+its result. With a thread pool, the function runs in a copy of the caller's
+context, so events it emits reach the channel of its run, which hands them to
+the event loop thread-safely.
+
+The default executor is a thread pool of `DEFAULT_MAX_WORKERS` threads. It can
+be replaced with any `concurrent.futures.Executor`:
+
+    set_blocking_executor(ThreadPoolExecutor(max_workers=32))
+
+The integration runs crews and reads sync LLM streams through it, which
+cannot be pickled, so it should be a thread pool. A `ProcessPoolExecutor` only
+works when all the work submitted can be pickled, and context variables do not
+reach other processes, so work running there cannot emit events.
+"""
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 8
+
+_EXECUTOR: Optional[Executor] = None
+
+
+def set_blocking_executor(executor: Executor) -> None:
+    """
+    Sets the executor that runs the blocking work of flows. The previous
+    executor is not shut down.
+    """
+    global _EXECUTOR  # pylint: disable=global-statement
+    _EXECUTOR = executor
+
+
+def get_blocking_executor() -> Executor:
+    """
+    Returns the executor that runs the blocking work of flows, creating the
+    default thread pool on first use.
+    """
+    global _EXECUTOR  # pylint: disable=global-statement
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="ag-ui-crewai")
+    return _EXECUTOR
+
+
+async def copilotkit_run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Runs a blocking function on the blocking executor and returns its result.
+
+    ```python
+    from ag_ui_crewai import copilotkit_run_blocking
+
+    @start()
+    async def run_crew(self):
+        result = await copilotkit_run_blocking(self.crew.kickoff, inputs=self.state.inputs)
+    ```
+
+    Cancelling the caller, e.g. when the client disconnects, does not stop a
+    function that is already running; its result is discarded.
+    """
+    executor = get_blocking_executor()
+    loop = asyncio.get_running_loop()
+    if isinstance(executor, ProcessPoolExecutor):
+        return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(executor, functools.partial(context.run, func, *args, **kwargs))
@@ -0,0 +1,77 @@
+"""
+A pool of flow instances that are built before the runs that use them.
+
+A flow keeps the state of its run, so every request needs a flow of its own.
+Deep-copying a template flow per request copies everything it references,
+including crews, agents and LLM clients, on the event loop before the first
+event is sent. A `FlowPool` builds flows with a factory in a worker thread and
+keeps up to `size` of them ready, so a request only takes one from the pool.
+
+Flows are not reused: crewai keeps method outputs, completed methods and
+listener bookkeeping on the flow across runs, so a used flow is dropped and a
+fresh one is built in its place.
+"""
+import asyncio
+import logging
+from collections import deque
+from typing import Callable, Deque, Optional
+
+from crewai.flow.flow import Flow
+
+logger = logging.getLogger(__name__)
+
+FlowFactory = Callable[[], Flow]
+
+
+class FlowPool:
+    """
+    A bounded pool of flows, refilled in the background.
+
+    ```python
+    add_crewai_flow_fastapi_endpoint(
+        app=app,
+        flow=FlowPool(AgenticChatFlow, size=8),
+        path="/agentic_chat",
+    )
+    ```
+
+    No flow is built when the pool is created; await `fill()` at startup to
+    prewarm it. When the pool is empty, `acquire` builds a flow on demand in
+    a worker thread, so the number of concurrent runs is not limited by
+    `size`, and the event loop never builds a flow.
+    """
+
+    def __init__(self, factory: FlowFactory, size: int = 4):
+        if size < 1:
+            raise ValueError("FlowPool size must be at least 1")
+        self.factory = factory
+        self.size = size
+        self._ready: Deque[Flow] = deque()
+        self._refill: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._ready)
+
+    async def acquire(self) -> Flow:
+        """
+        Returns a flow for a single run and schedules a replacement.
+        """
+        if self._refill is None or self._refill.done():
+            self._refill = asyncio.create_task(self.fill())
+        if self._ready:
+            return self._ready.popleft()
+        return await asyncio.to_thread(self.factory)
+
+    async def fill(self) -> None:
+        """
+        Builds flows in a worker thread until the pool is full. Awaiting it at
+        startup prewarms the pool.
+        """
+        while len(self._ready) < self.size:
+            try:
+                flow = await asyncio.to_thread(self.factory)
+            except Exception:  # pylint: disable=broad-exception-caught
+                # acquire builds on demand and raises in the request instead
+                logger.exception("Failed to build a flow for the pool")
+                return
+            self._ready.append(flow)
@@ -2,8 +2,10 @@
 This is a placeholder for the copilotkit_stream function.
 """
 
+import asyncio
+import inspect
 import uuid
-from typing import List, Any, Optional, Mapping, Dict, Literal, TypedDict
+from typing import List, Any, AsyncIterator, Optional, Mapping, Dict, Literal, TypedDict
 from litellm.types.utils import (
   ModelResponse,
   Choices,
@@ -16,7 +18,7 @@ from crewai.flow.flow import FlowState
 from crewai.utilities.events import crewai_event_bus
 from pydantic import BaseModel, Field, TypeAdapter
 from ag_ui.core import EventType, Message
-from .context import flow_context
+from .context import flow_context, channel_context
 from .events import (
   BridgedTextMessageChunkEvent,
   BridgedToolCallChunkEvent,
@@ -24,6 +26,9 @@ from .events import (
   BridgedStateSnapshotEvent
 )
 from .utils import yield_control
+from .executor import copilotkit_run_blocking
+
+_END_OF_STREAM = object()
 
 class CopilotKitProperties(BaseModel):
     """CopilotKit properties"""
@@ -147,7 +152,7 @@ async def copilotkit_stream(response):
 
     ```python
     response = await copilotkit_stream(
-        completion(
+        acompletion(
             model="openai/gpt-4o",
             messages=messages,
             tools=tools,
@@ -155,7 +160,13 @@ async def copilotkit_stream(response):
         )
     )
     ```
+
+    Pass the `acompletion` call, or the stream it returns, so that waiting for
+    tokens never blocks the event loop. The stream returned by the sync
+    `completion` also works: its chunks are read on the blocking executor.
     """
+    if inspect.isawaitable(response):
+        response = await response
     if isinstance(response, ModelResponse):
         return _copilotkit_stream_response(response)
     if isinstance(response, CustomStreamWrapper):
@@ -175,66 +186,75 @@ async def _copilotkit_stream_custom_stream_wrapper(response: CustomStreamWrapper
     finish_reason=None
     all_tool_calls = []
 
-    async for chunk in response:
-        if message_id is None:
-            message_id = chunk["id"]
-
-        text_content = chunk["choices"][0]["delta"]["content"] or None
-
-        # Stream text messages
-        if text_content is not None:
-            # add to the current text message
-            content += text_content
-            crewai_event_bus.emit(
-                flow,
-                BridgedTextMessageChunkEvent(
-                    type=EventType.TEXT_MESSAGE_CHUNK,
-                    message_id=message_id,
-                    role="assistant",
-                    delta=text_content,
+    try:
+        async for chunk in _stream_chunks(response):
+            if message_id is None:
+                message_id = chunk["id"]
+
+            text_content = chunk["choices"][0]["delta"]["content"] or None
+
+            # Stream text messages
+            if text_content is not None:
+                # add to the current text message
+                content += text_content
+                crewai_event_bus.emit(
+                    flow,
+                    BridgedTextMessageChunkEvent(
+                        type=EventType.TEXT_MESSAGE_CHUNK,
+                        message_id=message_id,
+                        role="assistant",
+                        delta=text_content,
+                    )
                 )
-            )
-            # yield control to the event loop
-            await yield_control()
-
-        # Stream tool calls
-        tool_calls = chunk["choices"][0]["delta"]["tool_calls"] or None
-        tool_call_id = tool_calls[0].id if tool_calls is not None else None
-        tool_call_arguments = tool_calls[0].function["arguments"] if tool_calls is not None else None
-        tool_call_name = tool_calls[0].function["name"] if tool_calls is not None else None
-
-        if tool_call_id is not None:
-            all_tool_calls.append(
-                {
-                    "id": tool_call_id,
-                    "name": tool_call_name,
-                    "arguments": "",
-                }
-            )
-
-        if tool_call_arguments is not None:
-            # add to the current tool call
-            all_tool_calls[-1]["arguments"] += tool_call_arguments
-            crewai_event_bus.emit(
-                flow,
-                BridgedToolCallChunkEvent(
-                    type=EventType.TOOL_CALL_CHUNK,
-                    tool_call_id=tool_call_id,
-                    tool_call_name=tool_call_name,
-                    delta=tool_call_arguments,
+                # yield control to the event loop
+                await yield_control()
+
+            # Stream tool calls
+            tool_calls = chunk["choices"][0]["delta"]["tool_calls"] or None
+            tool_call_id = tool_calls[0].id if tool_calls is not None else None
+            tool_call_arguments = tool_calls[0].function["arguments"] if tool_calls is not None else None
+            tool_call_name = tool_calls[0].function["name"] if tool_calls is not None else None
+
+            if tool_call_id is not None:
+                all_tool_calls.append(
+                    {
+                        "id": tool_call_id,
+                        "name": tool_call_name,
+                        "arguments": "",
+                    }
                 )
-            )
-            # yield control to the event loop
-            await yield_control()
 
-        # Stream finish reason
-        finish_reason = chunk["choices"][0]["finish_reason"]
-        created = chunk["created"]
-        model = chunk["model"]
-        system_fingerprint = chunk["system_fingerprint"]
-
-        if finish_reason is not None:
-            break
+            if tool_call_arguments is not None:
+                # add to the current tool call
+                all_tool_calls[-1]["arguments"] += tool_call_arguments
+                crewai_event_bus.emit(
+                    flow,
+                    BridgedToolCallChunkEvent(
+                        type=EventType.TOOL_CALL_CHUNK,
+                        tool_call_id=tool_call_id,
+                        tool_call_name=tool_call_name,
+                        delta=tool_call_arguments,
+                    )
+                )
+                # yield control to the event loop
+                await yield_control()
+
+            # Stream finish reason
+            finish_reason = chunk["choices"][0]["finish_reason"]
+            created = chunk["created"]
+            model = chunk["model"]
+            system_fingerprint = chunk["system_fingerprint"]
+
+            if finish_reason is not None:
+                break
+    except asyncio.CancelledError:
+        # the run was cancelled, e.g. because its client disconnected:
+        # stop generating tokens nobody will read
+        await _close_stream(response)
+        channel = channel_context.get(None)
+        if channel is not None:
+            channel.cancelled_streams += 1
+        raise
 
     tool_calls = [
         ChatCompletionMessageToolCall(
@@ -267,6 +287,39 @@ async def _copilotkit_stream_custom_stream_wrapper(response: CustomStreamWrapper
         ]
     )
 
+async def _stream_chunks(response: CustomStreamWrapper) -> AsyncIterator[Any]:
+    """
+    Yields the chunks of a litellm stream. The chunks of a sync stream, as
+    returned by `completion`, are read on the blocking executor, so waiting
+    for a token does not block the event loop.
+    """
+    if hasattr(getattr(response, "completion_stream", None), "__aiter__"):
+        async for chunk in response:
+            yield chunk
+        return
+    iterator = iter(response)
+    while True:
+        chunk = await copilotkit_run_blocking(next, iterator, _END_OF_STREAM)
+        if chunk is _END_OF_STREAM:
+            return
+        yield chunk
+
+async def _close_stream(response: CustomStreamWrapper) -> None:
+    """
+    Closes the provider stream of a litellm response, which closes its HTTP
+    connection.
+    """
+    stream = getattr(response, "completion_stream", None)
+    close = getattr(stream, "aclose", None) or getattr(stream, "close", None)
+    if close is None:
+        return
+    try:
+        result = close()
+        if inspect.isawaitable(result):
+            await result
+    except Exception:  # pylint: disable=broad-exception-caught
+        pass
+
 def _copilotkit_stream_response(response: ModelResponse):
     return response
 
@@ -300,6 +353,49 @@ def litellm_messages_to_ag_ui_messages(messages: List[LiteLLMMessage]) -> List[M
     return ag_ui_messages
 
 
+def _litellm_message_id(message: LiteLLMMessage) -> Optional[str]:
+    """
+    Returns the id of a LiteLLM message, or None if it has none.
+    """
+    if isinstance(message, Mapping):
+        return message.get("id")
+    return getattr(message, "id", None)
+
+
+class LiteLLMMessagesConverter:
+    """
+    Converts the LiteLLM messages of a flow to ag_ui messages step after step,
+    converting only the messages that were appended or replaced since the last
+    call. Messages are matched by identity, so the ids generated for messages
+    without one stay the same. A message edited in place is only converted
+    again if it is the last of the messages matched, which is where a step
+    appends to the content or tool calls of a message; edit earlier messages by
+    replacing them.
+    """
+    def __init__(self):
+        self._sources: List[Any] = []
+        self._messages: List[Message] = []
+
+    def convert(self, messages: List[LiteLLMMessage]) -> List[Message]:
+        """
+        Converts a list of LiteLLM messages to a list of ag_ui messages.
+        """
+        reused = 0
+        for message, source in zip(messages, self._sources):
+            if message is not source:
+                break
+            reused += 1
+        converted = litellm_messages_to_ag_ui_messages(messages[max(reused - 1, 0):])
+        if reused:
+            # the last matched message is converted again in case it was edited
+            reused -= 1
+            if _litellm_message_id(messages[reused]) is None:
+                converted[0] = converted[0].model_copy(update={"id": self._messages[reused].id})
+        self._messages = self._messages[:reused] + converted
+        self._sources = list(messages)
+        return self._messages
+
+
 async def copilotkit_exit() -> Literal[True]:
     """
     Exits the current agent after the run completes. Calling copilotkit_exit() will
@@ -1,10 +1,16 @@
 import asyncio
 
+from .context import channel_context
+
 async def yield_control():
     """
-    Yield control to the event loop.
+    Yield control to the event loop, then wait while the event channel of the
+    run is full and blocks its producers.
     """
     loop = asyncio.get_running_loop()
     future = loop.create_future()
     loop.call_soon(future.set_result, None)
     await future
+    channel = channel_context.get(None)
+    if channel is not None:
+        await channel.wait_writable()
@@ -0,0 +1,117 @@
+"""
+Measures the setup of the flow of a request: deep-copying a template flow,
+building it with a factory, and taking it from a FlowPool. Reports the setup
+latency of a single request, and the setup latency and peak RSS of 500
+concurrent runs that each hold their flow for the length of a run.
+
+Each strategy runs in a subprocess of its own, since the peak RSS of a process
+only grows.
+
+    python benchmarks/bench_flow_setup.py
+"""
+
+import asyncio
+import copy
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+from ag_ui_crewai.examples.agentic_chat import AgenticChatFlow
+from ag_ui_crewai.endpoint import flow_provider
+from ag_ui_crewai.pool import FlowPool
+
+RUNS = 500
+RUN_SECONDS = 0.5
+POOL_SIZE = 16
+STRATEGIES = ("deepcopy", "factory", "pool")
+
+
+def measure(function, repeat=5, number=50):
+    """Returns the best time of a call of function in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best * 1e6
+
+
+def single_request():
+    """Prints the setup latency of a single request of each strategy."""
+    template = AgenticChatFlow()
+    print(f"  deepcopy: {measure(lambda: copy.deepcopy(template)):9.1f} µs")
+    print(f"  factory:  {measure(AgenticChatFlow):9.1f} µs")
+
+    async def acquire_all():
+        pool = FlowPool(AgenticChatFlow, size=POOL_SIZE)
+        await pool.fill()
+        latencies = []
+        for _ in range(POOL_SIZE):
+            start = time.perf_counter()
+            await pool.acquire()
+            latencies.append(time.perf_counter() - start)
+            # let the pool refill before the next request
+            await pool.fill()
+        return min(latencies) * 1e6
+
+    print(f"  pool:     {asyncio.run(acquire_all()):9.1f} µs")
+
+
+async def concurrent_runs(strategy):
+    """Starts RUNS runs at once, each holding its flow while it runs."""
+    if strategy == "deepcopy":
+        new_flow = flow_provider(AgenticChatFlow())
+    elif strategy == "factory":
+        new_flow = flow_provider(AgenticChatFlow)
+    else:
+        pool = FlowPool(AgenticChatFlow, size=POOL_SIZE)
+        await pool.fill()
+        new_flow = flow_provider(pool)
+
+    latencies = []
+
+    async def run():
+        start = time.perf_counter()
+        flow = await new_flow()
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(RUN_SECONDS)
+        return flow
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run() for _ in range(RUNS)))
+    elapsed = time.perf_counter() - start
+    return latencies, elapsed
+
+
+def child(strategy):
+    """Runs the concurrent runs of a strategy and prints a result line."""
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    latencies, elapsed = asyncio.run(concurrent_runs(strategy))
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    latencies = sorted(latency * 1e3 for latency in latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"  {strategy + ':':9} setup median {statistics.median(latencies):7.2f} ms,"
+        f" p99 {p99:7.2f} ms, all runs {elapsed:5.2f} s,"
+        f" peak RSS {peak / 1024:6.1f} MB (+{(peak - baseline) / 1024:.1f} MB)"
+    )
+
+
+def main():
+    """Runs the benchmark."""
+    print("setup latency of a single request")
+    single_request()
+
+    print(f"\n{RUNS} concurrent runs of {RUN_SECONDS}s")
+    for strategy in STRATEGIES:
+        subprocess.run([sys.executable, __file__, strategy], check=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        child(sys.argv[1])
+    else:
+        main()
@@ -0,0 +1,175 @@
+"""
+Measures concurrent LLM streams through copilotkit_stream against a local fake
+OpenAI-compatible server, which streams TOKENS chunks per completion with
+TOKEN_DELAY seconds between chunks.
+
+Three ways of streaming are compared, each with 1 to 200 concurrent streams:
+
+- completion on the loop: the sync `completion` stream read on the event loop,
+  as copilotkit_stream did before it read sync streams on the executor
+- completion: the sync `completion` stream, read on the blocking executor
+- acompletion: the `acompletion` stream, read on the event loop
+
+For each, the benchmark reports the wall time of all streams, the tokens per
+second, and the worst lag of a ticker on the event loop, which is how long
+every other stream of the worker was stalled.
+
+    python benchmarks/bench_stream.py
+"""
+
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+
+TOKENS = 50
+TOKEN_DELAY = 0.01
+CONCURRENCY = (1, 10, 50, 200)
+TICK = 0.005
+
+
+def serve(port):
+    """Runs the fake OpenAI-compatible streaming server."""
+    import uvicorn  # pylint: disable=import-outside-toplevel
+    from starlette.applications import Starlette  # pylint: disable=import-outside-toplevel
+    from starlette.responses import StreamingResponse  # pylint: disable=import-outside-toplevel
+    from starlette.routing import Route  # pylint: disable=import-outside-toplevel
+
+    async def chat_completions(request):
+        await request.body()
+
+        async def chunks():
+            for i in range(TOKENS):
+                await asyncio.sleep(TOKEN_DELAY)
+                yield "data: " + json.dumps({
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion.chunk",
+                    "created": 0,
+                    "model": "fake",
+                    "system_fingerprint": None,
+                    "choices": [{
+                        "index": 0,
+                        "delta": {"role": "assistant", "content": f"token{i} "},
+                        "finish_reason": None,
+                    }],
+                }) + "\n\n"
+            yield "data: " + json.dumps({
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "fake",
+                "system_fingerprint": None,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            }) + "\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    app = Starlette(routes=[Route("/v1/chat/completions", chat_completions, methods=["POST"])])
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", backlog=4096)
+
+
+def free_port():
+    """Returns a free TCP port on localhost."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(port, timeout=10.0):
+    """Waits until the fake server accepts connections."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("fake server did not start")
+
+
+async def main_async(port):
+    """Runs the benchmark against the fake server."""
+    # pylint: disable=import-outside-toplevel
+    from litellm import acompletion, completion
+    from ag_ui_crewai.sdk import copilotkit_stream
+
+    request = {
+        "model": "openai/fake",
+        "api_base": f"http://127.0.0.1:{port}/v1",
+        "api_key": "fake",
+        "messages": [{"role": "user", "content": "Hello"}],
+        "stream": True,
+    }
+
+    async def completion_on_loop():
+        # the sync client blocks the loop while it waits for every token
+        tokens = 0
+        async for chunk in completion(**request):
+            if chunk["choices"][0]["delta"]["content"]:
+                tokens += 1
+        return tokens
+
+    async def completion_on_executor():
+        from ag_ui_crewai.executor import copilotkit_run_blocking
+        response = await copilotkit_stream(await copilotkit_run_blocking(completion, **request))
+        return len(response.choices[0].message.content.split())
+
+    async def acompletion_stream():
+        response = await copilotkit_stream(acompletion(**request))
+        return len(response.choices[0].message.content.split())
+
+    strategies = (
+        ("completion on the loop", completion_on_loop),
+        ("completion", completion_on_executor),
+        ("acompletion", acompletion_stream),
+    )
+
+    # warms up the connection pools and imports of both clients
+    await completion_on_executor()
+    await acompletion_stream()
+
+    print(f"{TOKENS} tokens per stream, {TOKEN_DELAY * 1000:.0f} ms between tokens")
+    for concurrency in CONCURRENCY:
+        print(f"\n{concurrency} concurrent streams")
+        for name, stream in strategies:
+            lag = [0.0]
+            done = asyncio.Event()
+
+            async def ticker():
+                while not done.is_set():
+                    start = time.perf_counter()
+                    await asyncio.sleep(TICK)
+                    lag[0] = max(lag[0], time.perf_counter() - start - TICK)
+
+            ticking = asyncio.create_task(ticker())
+            start = time.perf_counter()
+            tokens = sum(await asyncio.gather(*(stream() for _ in range(concurrency))))
+            elapsed = time.perf_counter() - start
+            done.set()
+            await ticking
+            print(
+                f"  {name + ':':24} {elapsed:6.2f} s, {tokens / elapsed:8.0f} tokens/s,"
+                f" worst loop lag {lag[0] * 1000:7.1f} ms"
+            )
+
+
+def main():
+    """Starts the fake server and runs the benchmark."""
+    port = free_port()
+    server = subprocess.Popen([sys.executable, __file__, "--serve", str(port)])
+    try:
+        wait_for_server(port)
+        asyncio.run(main_async(port))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--serve":
+        serve(int(sys.argv[2]))
+    else:
+        main()
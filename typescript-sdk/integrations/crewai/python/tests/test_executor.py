@@ -0,0 +1,96 @@
+import asyncio
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from ag_ui.core import EventType, TextMessageChunkEvent
+from ag_ui_crewai.channel import EventChannel
+from ag_ui_crewai.context import channel_context
+from ag_ui_crewai.executor import copilotkit_run_blocking, get_blocking_executor, set_blocking_executor
+
+
+def chunk(delta):
+    """Create a text chunk of an assistant message"""
+    return TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, message_id="m1", delta=delta)
+
+
+class TestBlockingExecutor(unittest.IsolatedAsyncioTestCase):
+    """Test suite for copilotkit_run_blocking"""
+
+    def setUp(self):
+        self.previous = get_blocking_executor()
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        set_blocking_executor(self.executor)
+
+    def tearDown(self):
+        set_blocking_executor(self.previous)
+        self.executor.shutdown(wait=True)
+
+    async def test_streaming_continues_while_crew_runs(self):
+        """Test that tokens of another run keep streaming while a crew runs"""
+        def crew():
+            time.sleep(0.5)
+            return "crew result"
+
+        async def stream_tokens():
+            channel = EventChannel(object(), metrics=None)
+            gaps = []
+            last = time.perf_counter()
+            for i in range(20):
+                await asyncio.sleep(0.01)
+                channel.put(chunk(str(i)))
+                await channel.get_all()
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+            return gaps
+
+        start = time.perf_counter()
+        result, gaps = await asyncio.gather(copilotkit_run_blocking(crew), stream_tokens())
+        self.assertEqual(result, "crew result")
+        self.assertGreaterEqual(time.perf_counter() - start, 0.5)
+        # a crew on the event loop would hold one token back for 0.5s
+        self.assertLess(max(gaps), 0.2)
+
+    async def test_events_from_worker_reach_channel(self):
+        """Test that events put from a worker thread are queued on the loop"""
+        channel = EventChannel(object(), metrics=None)
+        token = channel_context.set(channel)
+        try:
+            def crew():
+                for delta in ("a", "b"):
+                    channel_context.get().put(chunk(delta))
+                return "done"
+
+            self.assertEqual(await copilotkit_run_blocking(crew), "done")
+            items = await asyncio.wait_for(channel.get_all(), 1)
+            while len(items) < 2:
+                items += await asyncio.wait_for(channel.get_all(), 1)
+        finally:
+            channel_context.reset(token)
+        self.assertEqual([item.delta for item in items], ["a", "b"])
+        self.assertEqual(channel.events, 2)
+
+    async def test_executor_is_bounded(self):
+        """Test that no more functions run at once than the executor has workers"""
+        running = []
+        peak = []
+
+        def work():
+            running.append(1)
+            peak.append(len(running))
+            time.sleep(0.05)
+            running.pop()
+
+        await asyncio.gather(*(copilotkit_run_blocking(work) for _ in range(6)))
+        self.assertLessEqual(max(peak), 2)
+
+    async def test_arguments_and_errors(self):
+        """Test that arguments are passed and exceptions are raised in the caller"""
+        self.assertEqual(await copilotkit_run_blocking(lambda a, b: a - b, 7, b=2), 5)
+        with self.assertRaises(ZeroDivisionError):
+            await copilotkit_run_blocking(lambda: 1 / 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,12 +5,14 @@ Example server for the AG-UI protocol.
 import os
 import uvicorn
 from fastapi import FastAPI
+from ag_ui.encoder import metrics_app
 from .agentic_chat import agentic_chat_endpoint
 from .human_in_the_loop import human_in_the_loop_endpoint
 from .agentic_generative_ui import agentic_generative_ui_endpoint
 from .tool_based_generative_ui import tool_based_generative_ui_endpoint
 from .shared_state import shared_state_endpoint
 from .predictive_state_updates import predictive_state_updates_endpoint
+from .metrics import encoder_metrics
 
 app = FastAPI(title="AG-UI Endpoint")
 
@@ -32,6 +34,9 @@ app.post("/shared_state")(shared_state_endpoint)
 # Register the predictive state updates endpoint
 app.post("/predictive_state_updates")(predictive_state_updates_endpoint)
 
+# Serve the encoder metrics in the Prometheus text format
+app.mount("/metrics", metrics_app(encoder_metrics))
+
 
 def main():
     """Run the uvicorn server."""
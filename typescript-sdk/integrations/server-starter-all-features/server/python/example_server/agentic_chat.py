@@ -24,7 +24,8 @@ from ag_ui.core import (
     AssistantMessage
 )
 from ag_ui.core.events import TextMessageChunkEvent
-from ag_ui.encoder import EventEncoder
+from ag_ui.encoder import EventEncoder, batch_events
+from .metrics import encoder_metrics
 
 async def agentic_chat_endpoint(input_data: RunAgentInput, request: Request):
     """Agentic chat endpoint"""
@@ -32,7 +33,7 @@ async def agentic_chat_endpoint(input_data: RunAgentInput, request: Request):
     accept_header = request.headers.get("accept")
 
     # Create an event encoder to properly format SSE events
-    encoder = EventEncoder(accept=accept_header)
+    encoder = EventEncoder(accept=accept_header, metrics=encoder_metrics)
 
     async def event_generator():
         # Get the last message content for conditional logic
@@ -54,17 +55,17 @@ async def agentic_chat_endpoint(input_data: RunAgentInput, request: Request):
 
         # Conditional logic based on last message
         if last_message_role == "tool":
-            async for event in send_tool_result_message_events():
-                yield encoder.encode(event)
+            async for events in batch_events(send_tool_result_message_events()):
+                yield encoder.encode_many(events)
         elif last_message_content == "tool":
-            async for event in send_tool_call_events():
-                yield encoder.encode(event)
+            async for events in batch_events(send_tool_call_events()):
+                yield encoder.encode_many(events)
         elif last_message_content == "backend_tool":
-            async for event in send_backend_tool_call_events(input_data.messages):
-                yield encoder.encode(event)
+            async for events in batch_events(send_backend_tool_call_events(input_data.messages)):
+                yield encoder.encode_many(events)
         else:
-            async for event in send_text_message_events():
-                yield encoder.encode(event)
+            async for events in batch_events(send_text_message_events()):
+                yield encoder.encode_many(events)
 
         # Send run finished event
         yield encoder.encode(
@@ -3,8 +3,6 @@ Agentic generative UI endpoint for the AG-UI protocol.
 """
 
 import asyncio
-import copy
-import jsonpatch
 from fastapi import Request
 from fastapi.responses import StreamingResponse
 from ag_ui.core import (
@@ -12,10 +10,10 @@ from ag_ui.core import (
     EventType,
     RunStartedEvent,
     RunFinishedEvent,
-    StateSnapshotEvent,
-    StateDeltaEvent
 )
-from ag_ui.encoder import EventEncoder
+from ag_ui.encoder import EventEncoder, batch_events
+from ag_ui.patch import StateTracker, emit_state
+from .metrics import encoder_metrics
 
 async def agentic_generative_ui_endpoint(input_data: RunAgentInput, request: Request):
     """Agentic generative UI endpoint"""
@@ -23,7 +21,7 @@ async def agentic_generative_ui_endpoint(input_data: RunAgentInput, request: Req
     accept_header = request.headers.get("accept")
 
     # Create an event encoder to properly format SSE events
-    encoder = EventEncoder(accept=accept_header)
+    encoder = EventEncoder(accept=accept_header, metrics=encoder_metrics)
 
     async def event_generator():
         # Send run started event
@@ -35,9 +33,9 @@ async def agentic_generative_ui_endpoint(input_data: RunAgentInput, request: Req
             ),
         )
 
-        # Send state events
-        async for event in send_state_events():
-            yield encoder.encode(event)
+        # Send state events, dropping snapshots the client already has
+        async for events in batch_events(emit_state(send_state_events())):
+            yield encoder.encode_many(events)
 
         # Send run finished event
         yield encoder.encode(
@@ -56,8 +54,8 @@ async def agentic_generative_ui_endpoint(input_data: RunAgentInput, request: Req
 
 async def send_state_events():
     """Send state events with snapshots and deltas"""
-    # Initialize state
-    state = {
+    # Initialize state, tracking its changes for JSON patches
+    tracker = StateTracker({
         "steps": [
             {
                 "description": f"Step {i + 1}",
@@ -65,41 +63,23 @@ async def send_state_events():
             }
             for i in range(10)
         ]
-    }
+    })
 
     # Send initial state snapshot
-    yield StateSnapshotEvent(
-        type=EventType.STATE_SNAPSHOT,
-        snapshot=state
-    )
+    yield tracker.snapshot_event()
     
     # Sleep for 1 second
     await asyncio.sleep(1.0)
 
-    # Create a copy to track changes for JSON patches
-    previous_state = copy.deepcopy(state)
-
     # Update each step and send deltas
-    for i, step in enumerate(state["steps"]):
+    for step in tracker.state["steps"]:
         step["status"] = "completed"
         
-        # Generate JSON patch from previous state to current state
-        patch = jsonpatch.make_patch(previous_state, state)
-        
-        # Send state delta event
-        yield StateDeltaEvent(
-            type=EventType.STATE_DELTA,
-            delta=patch.patch
-        )
-        
-        # Update previous state for next iteration
-        previous_state = copy.deepcopy(state)
+        # Send the recorded changes as a state delta event
+        yield tracker.delta_event()
         
         # Sleep for 1 second
         await asyncio.sleep(1.0)
 
     # Optionally send a final snapshot to the client
-    yield StateSnapshotEvent(
-        type=EventType.STATE_SNAPSHOT,
-        snapshot=state
-    )
+    yield tracker.snapshot_event()
@@ -19,7 +19,8 @@ from ag_ui.core import (
     ToolCallArgsEvent,
     ToolCallEndEvent
 )
-from ag_ui.encoder import EventEncoder
+from ag_ui.encoder import EventEncoder, batch_events
+from .metrics import encoder_metrics
 
 async def human_in_the_loop_endpoint(input_data: RunAgentInput, request: Request):
     """Human in the loop endpoint"""
@@ -27,7 +28,7 @@ async def human_in_the_loop_endpoint(input_data: RunAgentInput, request: Request
     accept_header = request.headers.get("accept")
 
     # Create an event encoder to properly format SSE events
-    encoder = EventEncoder(accept=accept_header)
+    encoder = EventEncoder(accept=accept_header, metrics=encoder_metrics)
 
     async def event_generator():
         # Get the last message for conditional logic
@@ -46,11 +47,11 @@ async def human_in_the_loop_endpoint(input_data: RunAgentInput, request: Request
 
         # Conditional logic based on last message role
         if last_message and getattr(last_message, 'role', None) == "tool":
-            async for event in send_text_message_events():
-                yield encoder.encode(event)
+            async for events in batch_events(send_text_message_events()):
+                yield encoder.encode_many(events)
         else:
-            async for event in send_tool_call_events():
-                yield encoder.encode(event)
+            async for events in batch_events(send_tool_call_events()):
+                yield encoder.encode_many(events)
 
         # Send run finished event
         yield encoder.encode(
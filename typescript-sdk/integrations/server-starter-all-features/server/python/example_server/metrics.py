@@ -0,0 +1,7 @@
+"""
+Encoder metrics shared by the endpoints, served at /metrics.
+"""
+
+from ag_ui.encoder import EncoderMetrics
+
+encoder_metrics = EncoderMetrics()
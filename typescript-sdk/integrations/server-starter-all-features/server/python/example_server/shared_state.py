@@ -11,7 +11,8 @@ from ag_ui.core import (
     RunFinishedEvent,
     StateSnapshotEvent
 )
-from ag_ui.encoder import EventEncoder
+from ag_ui.encoder import EventEncoder, batch_events
+from .metrics import encoder_metrics
 
 async def shared_state_endpoint(input_data: RunAgentInput, request: Request):
     """Shared state endpoint"""
@@ -19,7 +20,7 @@ async def shared_state_endpoint(input_data: RunAgentInput, request: Request):
     accept_header = request.headers.get("accept")
 
     # Create an event encoder to properly format SSE events
-    encoder = EventEncoder(accept=accept_header)
+    encoder = EventEncoder(accept=accept_header, metrics=encoder_metrics)
 
     async def event_generator():
         # Send run started event
@@ -32,8 +33,8 @@ async def shared_state_endpoint(input_data: RunAgentInput, request: Request):
         )
 
         # Send state events
-        async for event in send_state_events():
-            yield encoder.encode(event)
+        async for events in batch_events(send_state_events()):
+            yield encoder.encode_many(events)
 
         # Send run finished event
         yield encoder.encode(
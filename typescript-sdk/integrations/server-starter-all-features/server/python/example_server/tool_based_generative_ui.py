@@ -14,6 +14,7 @@ from ag_ui.core import (
     MessagesSnapshotEvent
 )
 from ag_ui.encoder import EventEncoder
+from .metrics import encoder_metrics
 
 async def tool_based_generative_ui_endpoint(input_data: RunAgentInput, request: Request):
     """Tool-based generative UI endpoint"""
@@ -21,7 +22,7 @@ async def tool_based_generative_ui_endpoint(input_data: RunAgentInput, request:
     accept_header = request.headers.get("accept")
 
     # Create an event encoder to properly format SSE events
-    encoder = EventEncoder(accept=accept_header)
+    encoder = EventEncoder(accept=accept_header, metrics=encoder_metrics)
 
     async def event_generator():
         # Send run started event